@@ -37,9 +37,11 @@ from utils.ai_services import GeminiService, FactCheckService
 from utils.news_services import NewsAggregator
 from utils.security import SecurityService
 from utils.database import FirebaseService
+from utils.metrics import start_metrics_server
+from utils.news_store import start_news_ingestion
 
 # Import page interfaces (RENAMED/UPDATED)
-from pages.home import show_home
+from pages.home import show_home, save_finished_jobs
 from pages.archive import show_archive
 from pages.learn import show_learn
 from pages.authority import show_authority
@@ -54,6 +56,13 @@ news_aggregator = NewsAggregator()
 security_service = SecurityService()
 firebase_service = FirebaseService()
 
+# Prometheus scrape endpoint for external call metrics (started once per process, one port per instance)
+start_metrics_server(Config.METRICS_PORT + Config.INSTANCE_INDEX)
+
+# Headlines are polled into the local store in the background; pages only read the store
+if Config.NEWS_INGESTION_ENABLED:
+    start_news_ingestion(news_aggregator)
+
 
 st.set_page_config(layout="wide", initial_sidebar_state="collapsed")
 
@@ -114,6 +123,9 @@ def main():
     #     display_status_badges()
     #     st.markdown('</div>', unsafe_allow_html=True)
 
+    # Results of analyses left running on the Home page are stored before any page reads the database
+    save_finished_jobs()
+
     # --- Routing ---
     page = st.session_state.page
     if page == "Home":
@@ -0,0 +1,78 @@
+import random
+
+# Corpus sizes in bytes, from a short post up to a 1 MB dump
+CORPUS_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+
+HOOKS = [
+    "BREAKING", "SHOCKING", "URGENT", "UNBELIEVABLE", "You won't believe this",
+    "Doctors are FURIOUS", "Mainstream media lies about this"
+]
+CLAIMS = [
+    "the vaccine contains tracking chips",
+    "the election results were secretly changed overnight",
+    "drinking hot water cures the virus",
+    "5G towers are making people sick",
+    "the moon landing footage was filmed in a studio",
+    "banks will freeze all accounts next week"
+]
+TACTICS = [
+    "They don't want you to know the hidden truth!!!",
+    "Share before it gets deleted!!",
+    "Act now, before it's too late",
+    "Experts are wrong and the cover-up goes all the way to the top",
+    "This is outrageous and terrifying",
+    "Going viral right now - forward to everyone you know",
+    "Don't trust the official story"
+]
+NEUTRAL = [
+    "According to a peer-reviewed study published last year, the results were inconclusive.",
+    "Officials said the source of the report is still being verified.",
+    "Researchers noted that more data is needed before drawing conclusions.",
+    "The city council meeting is scheduled for Tuesday at 6 pm."
+]
+LINKS = [
+    "https://bit.ly/3xYz", "http://suspicious-news.com/story", "https://example.org/report",
+    "https://tinyurl.com/abc123", "https://www.reuters.com/world"
+]
+MARKUP = ["<b>", "</b>", "<a href=\"#\">", "</a>", "<br/>"]
+
+
+def viral_post(rng):
+    """One synthetic viral post mixing hooks, claims, manipulation tactics, links and noise"""
+    parts = [f"{rng.choice(HOOKS)}: {rng.choice(CLAIMS)}{'!' * rng.randint(1, 4)}"]
+    for _ in range(rng.randint(1, 4)):
+        roll = rng.random()
+        if roll < 0.4:
+            parts.append(rng.choice(TACTICS))
+        elif roll < 0.7:
+            parts.append(rng.choice(NEUTRAL))
+        elif roll < 0.85:
+            parts.append(rng.choice(LINKS))
+        else:
+            parts.append(f"{rng.choice(MARKUP)}{rng.choice(CLAIMS).upper()}{rng.choice(MARKUP)}")
+    return "  ".join(parts)
+
+
+def build_corpus(size, seed=0):
+    """Concatenate viral posts into a text of exactly `size` characters"""
+    rng = random.Random(seed)
+    posts = []
+    length = 0
+    while length < size:
+        post = viral_post(rng)
+        posts.append(post)
+        length += len(post) + 1
+    return "\n".join(posts)[:size]
+
+
+# Inputs (at the 10k character input cap) that made the old input regexes
+# backtrack quadratically; validate/sanitize must stay linear on all of them
+ADVERSARIAL_INPUTS = {
+    'open_brackets': '<' * 10_000,
+    'open_brackets_closed': '<' * 9_999 + '>',
+    'repeated_on': 'on' * 5_000,
+    'on_equals': 'on==' * 2_500,
+    'script_opens': '<script' * 1_428,
+    'script_unclosed_tags': '<script>' + '<a' * 4_996,
+    'whitespace_runs': ' \t\n' * 3_333
+}
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the local analysis hot paths.
+
+Runs each SecurityService scan, input validation/sanitization and the risk
+heuristics over synthetic viral-post corpora from 100 B to 1 MB, reporting
+ops/s and per-call allocations (tracemalloc). Results can be saved as a
+baseline and later runs checked against it:
+
+    python benchmarks/hot_paths.py --save baseline.json
+    python benchmarks/hot_paths.py --compare baseline.json --tolerance 0.2
+
+--adversarial times input validation/sanitization on pathological inputs
+instead, failing if any call exceeds --max-latency-ms.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.corpus import ADVERSARIAL_INPUTS, CORPUS_SIZES, build_corpus
+from utils.security import SecurityService
+from utils.forensics import calculate_risk_score, detect_manipulation_tactics
+
+
+def hot_paths():
+    """Benchmark name -> callable taking the corpus text"""
+    security_service = SecurityService()
+    return {
+        'detect_manipulation_patterns': security_service.detect_manipulation_patterns,
+        'check_content_safety': security_service.check_content_safety,
+        'analyze_text_structure': security_service.analyze_text_structure,
+        # The corpus split into lines, as a bulk job would submit them
+        'analyze_text_structure_batch': lambda text: security_service.analyze_text_structure_batch(text.split('\n')),
+        'sanitize_input': security_service.sanitize_input,
+        # Lift the length cap so large corpora exercise the pattern checks, not the early return
+        'validate_input': lambda text: security_service.validate_input(text, max_length=len(text) + 1),
+        'calculate_risk_score': calculate_risk_score,
+        'detect_manipulation_tactics': detect_manipulation_tactics
+    }
+
+
+def measure(func, text, min_time=0.2, repeats=5):
+    """Best-of-`repeats` ops/s, with the loop count calibrated to run at least `min_time` seconds"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(text)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)))
+
+    best = elapsed
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(text)
+        best = min(best, time.perf_counter() - start)
+
+    return loops / best
+
+
+def measure_allocations(func, text):
+    """Peak bytes allocated (tracemalloc) during one call, beyond what was live before it"""
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        func(text)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak - baseline
+
+
+def run(names=None, sizes=None, min_time=0.2):
+    """Run the selected benchmarks; returns a list of result rows"""
+    paths = hot_paths()
+    results = []
+
+    for size in sizes or CORPUS_SIZES:
+        text = build_corpus(size)
+        for name, func in paths.items():
+            if names and name not in names:
+                continue
+            ops = measure(func, text, min_time=min_time)
+            peak = measure_allocations(func, text)
+            results.append({
+                'benchmark': name,
+                'size': size,
+                'ops_per_sec': ops,
+                'mb_per_sec': ops * size / 1e6,
+                'peak_bytes': peak,
+                'peak_per_input_byte': peak / size
+            })
+            print(f"{name:<30} {size:>9} B {ops:>14,.1f} ops/s {ops * size / 1e6:>9.2f} MB/s "
+                  f"{peak / 1024:>10.1f} KiB peak ({peak / size:.1f}x input)")
+
+    return results
+
+
+def run_adversarial(max_latency_ms, repeats=5):
+    """Worst-of-`repeats` latency of input validation/sanitization on ADVERSARIAL_INPUTS; returns rows over the bound"""
+    security_service = SecurityService()
+    paths = {
+        'validate_input': security_service.validate_input,
+        'sanitize_input': security_service.sanitize_input,
+        'scan_input': security_service.scan_input
+    }
+    slow = []
+
+    for input_name, text in ADVERSARIAL_INPUTS.items():
+        for name, func in paths.items():
+            worst = 0.0
+            for _ in range(repeats):
+                start = time.perf_counter()
+                func(text)
+                worst = max(worst, time.perf_counter() - start)
+            worst_ms = worst * 1000
+            flag = "  SLOW" if worst_ms > max_latency_ms else ""
+            print(f"{name:<16} {input_name:<24} {len(text):>6} chars {worst_ms:>9.3f} ms worst{flag}")
+            if worst_ms > max_latency_ms:
+                slow.append((name, input_name, worst_ms))
+
+    return slow
+
+
+def compare(results, baseline, tolerance):
+    """Rows whose ops/s dropped more than `tolerance` (fraction) below the baseline"""
+    expected = {(row['benchmark'], row['size']): row['ops_per_sec'] for row in baseline}
+    regressions = []
+
+    for row in results:
+        reference = expected.get((row['benchmark'], row['size']))
+        if reference and row['ops_per_sec'] < reference * (1 - tolerance):
+            regressions.append((row, reference))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local analysis hot paths")
+    parser.add_argument('--benchmark', action='append', help="Only run this benchmark (repeatable)")
+    parser.add_argument('--size', type=int, action='append', help="Only use this corpus size in bytes (repeatable)")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Minimum seconds per timing run")
+    parser.add_argument('--save', help="Write results to this JSON file")
+    parser.add_argument('--compare', help="Baseline JSON file to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed ops/s slowdown versus the baseline (fraction)")
+    parser.add_argument('--adversarial', action='store_true',
+                        help="Time validation/sanitization on pathological inputs instead")
+    parser.add_argument('--max-latency-ms', type=float, default=10.0,
+                        help="Worst-case bound per adversarial call (milliseconds)")
+    args = parser.parse_args()
+
+    if args.adversarial:
+        slow = run_adversarial(args.max_latency_ms)
+        if slow:
+            print(f"{len(slow)} adversarial calls exceeded {args.max_latency_ms} ms")
+            sys.exit(1)
+        print(f"All adversarial calls within {args.max_latency_ms} ms")
+        return
+
+    results = run(args.benchmark, args.size, args.min_time)
+
+    if args.save:
+        with open(args.save, 'w') as output:
+            json.dump(results, output, indent=2)
+        print(f"Saved {len(results)} results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+
+        for row, reference in regressions:
+            print(f"REGRESSION {row['benchmark']} @ {row['size']} B: "
+                  f"{row['ops_per_sec']:,.1f} ops/s vs baseline {reference:,.1f}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} of baseline")
+
+
+if __name__ == "__main__":
+    main()
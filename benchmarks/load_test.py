@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Offline load test for the forensic analysis pipeline.
+
+Starts the stub API server (unless --no-stub is given and the *_BASE_URL
+settings already point somewhere), then runs N concurrent simulated users
+through ForensicAnalyzer.analyze (or analyze_batch with --mode batch) and
+reports latency percentiles, throughput and per-API call metrics.
+
+With --instances, each run starts that many app instances as separate
+processes, each serving --users users and --requests requests and saving
+every analysis to one shared store (STORE_BACKEND=sqlite), and reports the
+combined throughput against the single-instance run.
+
+    python benchmarks/load_test.py --users 20 --requests 200
+    python benchmarks/load_test.py --users 5 --mode batch --batch-size 10 --latency-scale 0.1
+    python benchmarks/load_test.py --instances 1,2,4 --users 4 --requests 100 --latency-scale 0.05
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.corpus import viral_post
+from benchmarks.stub_server import StubServer
+from config import Config
+
+
+def percentile(sorted_values, quantile):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(quantile * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def build_analyzer():
+    """ForensicAnalyzer over fresh services that read the current Config base URLs"""
+    from utils.ai_services import GeminiService, FactCheckService
+    from utils.security import SecurityService
+    from utils.forensics import ForensicAnalyzer
+
+    return ForensicAnalyzer(GeminiService(), FactCheckService(), SecurityService())
+
+
+def run_load(analyzer, users, total_requests, mode='single', batch_size=10, level="Quick Scan", seed=0, store=None):
+    """Drive `total_requests` requests from `users` concurrent workers; returns (latencies, failures, elapsed).
+
+    Results are saved to `store` (a FirebaseService), if given, as the Home page does.
+    """
+    latencies = []
+    failures = []
+    lock = threading.Lock()
+
+    def user_request(request_number):
+        rng = random.Random(seed + request_number)
+        start = time.perf_counter()
+        try:
+            if mode == 'batch':
+                texts = [viral_post(rng) for _ in range(batch_size)]
+                results = analyzer.analyze_batch(texts, level=level, origin=level == "Deep Analysis")
+            else:
+                texts = [viral_post(rng)]
+                results = [analyzer.analyze(texts[0], "en", level, True, level == "Deep Analysis", True)]
+            if store is not None:
+                for text, result in zip(texts, results):
+                    if store.save_analysis(text, result) is None:
+                        raise RuntimeError("Saving the analysis failed")
+        except Exception as e:
+            with lock:
+                failures.append(str(e))
+            return
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        list(pool.map(user_request, range(total_requests)))
+    return latencies, failures, time.perf_counter() - start
+
+
+def report(latencies, failures, elapsed, mode, batch_size):
+    """Summary of one load run"""
+    ordered = sorted(latencies)
+    items = len(ordered) * (batch_size if mode == 'batch' else 1)
+    return {
+        'requests': len(ordered) + len(failures),
+        'failures': len(failures),
+        'elapsed_s': elapsed,
+        'throughput_rps': len(ordered) / elapsed if elapsed else 0.0,
+        'analyses_per_sec': items / elapsed if elapsed else 0.0,
+        'mean_s': statistics.fmean(ordered) if ordered else 0.0,
+        'p50_s': percentile(ordered, 0.50),
+        'p95_s': percentile(ordered, 0.95),
+        'p99_s': percentile(ordered, 0.99),
+        'max_s': ordered[-1] if ordered else 0.0
+    }
+
+
+def run_instance(index, settings, users, total_requests, mode, batch_size, level, seed, barrier, results):
+    """One app instance process: analyze and save, starting with the other instances; reports through `results`"""
+    logging.getLogger('streamlit').setLevel(logging.CRITICAL)
+    for name, value in settings.items():
+        setattr(Config, name, value)
+
+    from utils.database import FirebaseService
+
+    analyzer = build_analyzer()
+    store = FirebaseService()
+    barrier.wait()
+    latencies, failures, elapsed = run_load(analyzer, users, total_requests, mode, batch_size, level,
+                                            seed + index * total_requests, store)
+    # Once every instance has finished, each one should see every saved analysis
+    barrier.wait()
+    results.put((index, latencies, failures, elapsed, store.count_analyses()))
+
+
+def run_instances(instances, settings, users, total_requests, mode='single', batch_size=10, level="Quick Scan",
+                  seed=0):
+    """Run `instances` app instance processes over one shared analysis store; returns a report per instance"""
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(instances)
+    results = context.Queue()
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings = dict(settings, STORE_BACKEND='sqlite', ANALYSIS_DB_PATH=os.path.join(directory, 'analyses.db'))
+        processes = [
+            context.Process(target=run_instance, args=(index, settings, users, total_requests, mode, batch_size,
+                                                       level, seed, barrier, results))
+            for index in range(instances)
+        ]
+        for process in processes:
+            process.start()
+        reports = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    return sorted(reports)
+
+
+def scaling_report(runs, mode, batch_size):
+    """Combined throughput per instance count, with efficiency against linear scaling of the first run"""
+    rows = []
+    for instances, reports in runs:
+        latencies = [latency for report in reports for latency in report[1]]
+        failures = [failure for report in reports for failure in report[2]]
+        # Instances start together, so the run lasts as long as the slowest one
+        summary = report(latencies, failures, max(report[3] for report in reports), mode, batch_size)
+        summary['instances'] = instances
+        summary['stored_analyses'] = [report[4] for report in reports]
+        rows.append(summary)
+
+    base = rows[0]['analyses_per_sec'] / rows[0]['instances'] if rows and rows[0]['analyses_per_sec'] else 0.0
+    for row in rows:
+        row['efficiency'] = row['analyses_per_sec'] / (base * row['instances']) if base else 0.0
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test for the forensic analysis pipeline")
+    parser.add_argument('--users', type=int, default=10, help="Concurrent simulated users")
+    parser.add_argument('--requests', type=int, default=100, help="Total requests across all users")
+    parser.add_argument('--mode', choices=['single', 'batch'], default='single')
+    parser.add_argument('--batch-size', type=int, default=10)
+    parser.add_argument('--level', choices=['Quick Scan', 'Deep Analysis'], default='Quick Scan')
+    parser.add_argument('--latency-scale', type=float, default=1.0, help="Stub latency multiplier")
+    parser.add_argument('--error-rate', type=float, help="Override the stub error rate of every API")
+    parser.add_argument('--profile', help="JSON file of per-API stub overrides")
+    parser.add_argument('--no-stub', action='store_true', help="Use the configured base URLs as-is")
+    parser.add_argument('--json', help="Write the report to this JSON file")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--instances', help="Comma-separated instance counts to compare, e.g. 1,2,4 "
+                                            "(--users and --requests are then per instance)")
+    args = parser.parse_args()
+
+    # Service errors surface through st.error/st.warning, which only log outside a Streamlit session
+    logging.getLogger('streamlit').setLevel(logging.CRITICAL)
+
+    stub = None
+    if not args.no_stub:
+        profiles = {}
+        if args.profile:
+            with open(args.profile) as profile_file:
+                profiles = json.load(profile_file)
+        if args.error_rate is not None:
+            for api in ('gemini', 'factcheck', 'newsapi', 'newsdata', 'vision'):
+                profiles.setdefault(api, {})['error_rate'] = args.error_rate
+
+        stub = StubServer(0, profiles, args.latency_scale, args.seed).start()
+        for name, url in stub.base_urls.items():
+            setattr(Config, name, url)
+        print(f"Stub APIs on http://127.0.0.1:{stub.port}")
+
+    if args.instances:
+        settings = {name: getattr(Config, name) for name in stub.base_urls} if stub else {}
+        runs = []
+        for instances in [int(count) for count in args.instances.split(',')]:
+            print(f"Running {args.requests} {args.mode} requests with {args.users} concurrent users "
+                  f"on each of {instances} instances...")
+            runs.append((instances, run_instances(instances, settings, args.users, args.requests, args.mode,
+                                                  args.batch_size, args.level, args.seed)))
+        rows = scaling_report(runs, args.mode, args.batch_size)
+
+        print(f"\n{'Instances':>9} {'Analyses/s':>11} {'Efficiency':>11} {'p50 s':>7} {'p95 s':>7} {'Failed':>7}  Stored (per instance)")
+        for row in rows:
+            print(f"{row['instances']:>9} {row['analyses_per_sec']:>11.2f} {row['efficiency']:>10.0%} "
+                  f"{row['p50_s']:>7.3f} {row['p95_s']:>7.3f} {row['failures']:>7}  {row['stored_analyses']}")
+
+        if args.json:
+            with open(args.json, 'w') as output:
+                json.dump(rows, output, indent=2, default=str)
+        if stub:
+            stub.stop()
+        return
+
+    from utils.metrics import registry as metrics
+    metrics.reset()
+
+    analyzer = build_analyzer()
+    print(f"Running {args.requests} {args.mode} requests with {args.users} concurrent users...")
+    latencies, failures, elapsed = run_load(
+        analyzer, args.users, args.requests, args.mode, args.batch_size, args.level, args.seed
+    )
+    summary = report(latencies, failures, elapsed, args.mode, args.batch_size)
+
+    print(f"\nRequests: {summary['requests']} ({summary['failures']} failed) in {summary['elapsed_s']:.2f}s")
+    print(f"Throughput: {summary['throughput_rps']:.2f} req/s, {summary['analyses_per_sec']:.2f} analyses/s")
+    print(f"Latency: mean {summary['mean_s']:.3f}s  p50 {summary['p50_s']:.3f}s  "
+          f"p95 {summary['p95_s']:.3f}s  p99 {summary['p99_s']:.3f}s  max {summary['max_s']:.3f}s")
+
+    calls = [row for row in metrics.summary() if row['calls']]
+    if calls:
+        print("\nExternal calls:")
+        for row in calls:
+            print(f"  {row['service']}:{row['operation']:<22} {row['calls']:>6} calls  "
+                  f"{row['error_rate']:>5.1f}% errors  p50 {row['p50']:.3f}s  p95 {row['p95']:.3f}s  p99 {row['p99']:.3f}s")
+    summary['external_calls'] = calls
+
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump(summary, output, indent=2, default=str)
+
+    if stub:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the Gemini, Fact Check, NewsAPI, NewsData and Vision APIs.
+
+Serves canned responses on the same paths as the real APIs, with per-API
+latency (log-normal around a median) and error-rate profiles. Point the
+app at it with the *_BASE_URL settings in config.py, e.g.
+
+    python benchmarks/stub_server.py --port 8090
+    GEMINI_BASE_URL=http://127.0.0.1:8090/v1beta/models \
+    FACTCHECK_BASE_URL=http://127.0.0.1:8090/v1alpha1 \
+    NEWSAPI_BASE_URL=http://127.0.0.1:8090/v2 \
+    NEWSDATA_BASE_URL=http://127.0.0.1:8090/api/1 \
+    VISION_BASE_URL=http://127.0.0.1:8090/v1/images:annotate \
+    streamlit run app.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Median latency (ms), log-normal sigma, error rate and the status returned on error
+DEFAULT_PROFILES = {
+    'gemini': {'latency_ms': 800, 'sigma': 0.4, 'error_rate': 0.01, 'error_status': 503},
+    'factcheck': {'latency_ms': 250, 'sigma': 0.3, 'error_rate': 0.01, 'error_status': 500},
+    'newsapi': {'latency_ms': 200, 'sigma': 0.3, 'error_rate': 0.02, 'error_status': 429},
+    'newsdata': {'latency_ms': 250, 'sigma': 0.3, 'error_rate': 0.02, 'error_status': 500},
+    'vision': {'latency_ms': 600, 'sigma': 0.4, 'error_rate': 0.01, 'error_status': 503}
+}
+
+VERDICTS = ["FALSE INFORMATION", "MISLEADING", "TRUE", "UNVERIFIED"]
+
+
+def gemini_response(rng, request):
+    """generateContent body with a forensic-style answer and token usage"""
+    prompt = request.get('contents', [{}])[0].get('parts', [{}])[0].get('text', '')
+    verdict = rng.choice(VERDICTS)
+    text = (
+        f"🔍 VERACITY ASSESSMENT:\n{verdict} - stubbed assessment of the submitted content.\n\n"
+        "🧬 MANIPULATION TACTICS:\nUrgency and emotional framing.\n\n"
+        "📊 EVIDENCE EVALUATION:\nNo primary sources are cited.\n\n"
+        "🔗 SOURCE LINKS & ARTICLES:\n"
+        "- Snopes Fact Check: Reviews similar claims - https://www.snopes.com/fact-check/\n"
+        "- Reuters Fact Check: Background reporting - https://www.reuters.com/fact-check/\n\n"
+        "📧 REPORTING INFORMATION:\n"
+        "- Report to Snopes: tips@snopes.com\n"
+    )
+    return {
+        'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'}, 'finishReason': 'STOP'}],
+        'usageMetadata': {
+            'promptTokenCount': len(prompt) // 4,
+            'candidatesTokenCount': len(text) // 4,
+            'totalTokenCount': (len(prompt) + len(text)) // 4
+        }
+    }
+
+
+def factcheck_response(rng, query):
+    """claims:search body with a few reviews"""
+    return {
+        'claims': [
+            {
+                'text': query.get('query', [''])[0],
+                'claimReview': [{
+                    'publisher': {'name': publisher},
+                    'url': f"https://factcheck.example/{index}",
+                    'title': f"Stub review {index}",
+                    'textualRating': rng.choice(['False', 'Misleading', 'True']),
+                    'reviewDate': '2025-01-01T00:00:00Z'
+                }]
+            }
+            for index, publisher in enumerate(['Snopes', 'PolitiFact', 'Reuters'][:rng.randint(0, 3)])
+        ]
+    }
+
+
+def newsapi_response(rng, query):
+    """top-headlines / everything body"""
+    size = int(query.get('pageSize', ['10'])[0])
+    return {
+        'status': 'ok',
+        'totalResults': size,
+        'articles': [
+            {
+                'source': {'id': None, 'name': f"Stub Source {index % 5}"},
+                'title': f"Stub headline {index} about {rng.choice(['election', 'vaccine', 'climate', 'market'])}",
+                'description': "Stubbed article description.",
+                'url': f"https://news.example/articles/{index}",
+                'publishedAt': '2025-01-01T00:00:00Z'
+            }
+            for index in range(size)
+        ]
+    }
+
+
+def newsdata_response(rng, query):
+    """news endpoint body"""
+    return {
+        'status': 'success',
+        'totalResults': 10,
+        'results': [
+            {
+                'title': f"Stub NewsData headline {index}",
+                'link': f"https://newsdata.example/{index}",
+                'source_id': f"source{index % 4}",
+                'description': "Stubbed article description.",
+                'pubDate': '2025-01-01 00:00:00'
+            }
+            for index in range(10)
+        ]
+    }
+
+
+# images:annotate response field for each Vision feature type
+VISION_ANNOTATIONS = {
+    'LABEL_DETECTION': ('labelAnnotations', [{'description': 'Text', 'score': 0.9}]),
+    'TEXT_DETECTION': ('textAnnotations', [{'description': 'STUB TEXT'}]),
+    'SAFE_SEARCH_DETECTION': ('safeSearchAnnotation', {'adult': 'VERY_UNLIKELY', 'spoof': 'UNLIKELY',
+                                                       'violence': 'UNLIKELY'}),
+    'WEB_DETECTION': ('webDetection', {'webEntities': [], 'fullMatchingImages': [],
+                                       'pagesWithMatchingImages': [{'url': 'https://example.com/stub-image-page'}]})
+}
+VISION_MAX_IMAGES = 16
+
+
+def vision_response(rng, request):
+    """images:annotate body with one response per requested image, holding the requested features only"""
+    return {
+        'responses': [
+            dict(
+                VISION_ANNOTATIONS[feature['type']]
+                for feature in image_request.get('features', [])
+                if feature.get('type') in VISION_ANNOTATIONS
+            )
+            for image_request in request.get('requests', [])
+        ]
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Routes requests by path to the matching API stub"""
+
+    def do_GET(self):
+        self._dispatch()
+
+    def do_POST(self):
+        self._dispatch()
+
+    def _dispatch(self):
+        parsed = urlparse(self.path)
+        path = parsed.path
+        query = parse_qs(parsed.query)
+
+        body = {}
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+            except ValueError:
+                body = {}
+
+        if ':generateContent' in path:
+            api, build = 'gemini', lambda rng: gemini_response(rng, body)
+        elif path.endswith('claims:search'):
+            api, build = 'factcheck', lambda rng: factcheck_response(rng, query)
+        elif path.endswith(('/top-headlines', '/everything')):
+            api, build = 'newsapi', lambda rng: newsapi_response(rng, query)
+        elif path.endswith('/news') or path.endswith('/latest'):
+            api, build = 'newsdata', lambda rng: newsdata_response(rng, query)
+        elif path.endswith('images:annotate'):
+            if len(body.get('requests', [])) > VISION_MAX_IMAGES:
+                self.send_error(400, f"At most {VISION_MAX_IMAGES} images per request")
+                return
+            api, build = 'vision', lambda rng: vision_response(rng, body)
+        else:
+            self.send_error(404)
+            return
+
+        self.server.stub.respond(self, api, build)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer:
+    """Threaded stub API server with configurable latency and errors"""
+
+    def __init__(self, port=8090, profiles=None, latency_scale=1.0, seed=None):
+        self.port = port
+        self.profiles = {api: dict(profile) for api, profile in DEFAULT_PROFILES.items()}
+        for api, overrides in (profiles or {}).items():
+            self.profiles.setdefault(api, {}).update(overrides)
+        self.latency_scale = latency_scale
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()  # handler threads are short-lived, so share one generator
+        self._httpd = None
+
+    @property
+    def base_urls(self):
+        """Config overrides that point every API at this server"""
+        root = f"http://127.0.0.1:{self.port}"
+        return {
+            'GEMINI_BASE_URL': f"{root}/v1beta/models",
+            'FACTCHECK_BASE_URL': f"{root}/v1alpha1",
+            'NEWSAPI_BASE_URL': f"{root}/v2",
+            'NEWSDATA_BASE_URL': f"{root}/api/1",
+            'VISION_BASE_URL': f"{root}/v1/images:annotate"
+        }
+
+    def respond(self, handler, api, build):
+        """Sleep for a sampled latency, then send either an error or the stub body"""
+        profile = self.profiles[api]
+        with self._rng_lock:
+            latency = profile['latency_ms'] * self._rng.lognormvariate(0, profile['sigma']) * self.latency_scale
+            failed = self._rng.random() < profile['error_rate']
+            rng = random.Random(self._rng.getrandbits(64))
+
+        time.sleep(latency / 1000)
+
+        if failed:
+            status = profile['error_status']
+            payload = {'error': {'code': status, 'message': 'stubbed failure'}}
+        else:
+            status = 200
+            payload = build(rng)
+
+        data = json.dumps(payload).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json; charset=utf-8')
+        handler.send_header('Content-Length', str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def start(self):
+        """Serve in a background thread; returns self"""
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", self.port), StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stub for the external APIs")
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--profile', help="JSON file of per-API overrides, e.g. {\"gemini\": {\"latency_ms\": 1500}}")
+    parser.add_argument('--latency-scale', type=float, default=1.0, help="Multiply every latency by this factor")
+    parser.add_argument('--error-rate', type=float, help="Override the error rate of every API")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    profiles = {}
+    if args.profile:
+        with open(args.profile) as profile_file:
+            profiles = json.load(profile_file)
+    if args.error_rate is not None:
+        for api in DEFAULT_PROFILES:
+            profiles.setdefault(api, {})['error_rate'] = args.error_rate
+
+    server = StubServer(args.port, profiles, args.latency_scale, args.seed).start()
+    print(f"Stub APIs running on http://127.0.0.1:{server.port}")
+    for name, url in server.base_urls.items():
+        print(f"  {name}={url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\nStopping stub server...")
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,100 @@ class Config:
     # Google Cloud
     GOOGLE_CLOUD_PROJECT = os.getenv("GOOGLE_CLOUD_PROJECT", "misinformation-detector-2025")
     
+    # API base URLs (override to point at the offline stub server for load tests)
+    GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/models")
+    FACTCHECK_BASE_URL = os.getenv("FACTCHECK_BASE_URL", "https://factchecktools.googleapis.com/v1alpha1")
+    NEWSAPI_BASE_URL = os.getenv("NEWSAPI_BASE_URL", "https://newsapi.org/v2")
+    NEWSDATA_BASE_URL = os.getenv("NEWSDATA_BASE_URL", "https://newsdata.io/api/1")
+    VISION_BASE_URL = os.getenv("VISION_BASE_URL", "https://vision.googleapis.com/v1/images:annotate")
+    
+    # Gemini request hedging: resend a request still running past the recent latency percentile
+    GEMINI_HEDGE_ENABLED = os.getenv("GEMINI_HEDGE_ENABLED", "False").lower() == "true"
+    GEMINI_HEDGE_PERCENTILE = float(os.getenv("GEMINI_HEDGE_PERCENTILE", "0.95"))
+    GEMINI_HEDGE_BUDGET = float(os.getenv("GEMINI_HEDGE_BUDGET", "0.05"))  # max fraction of requests hedged
+    GEMINI_HEDGE_MIN_DELAY = float(os.getenv("GEMINI_HEDGE_MIN_DELAY", "2"))  # seconds
+    
+    # Circuit breakers around upstream APIs: open after consecutive failures, probe again after a pause
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+    BREAKER_RECOVERY_SECONDS = float(os.getenv("BREAKER_RECOVERY_SECONDS", "30"))
+    BREAKER_HALF_OPEN_PROBES = int(os.getenv("BREAKER_HALF_OPEN_PROBES", "1"))
+    
+    # Domain reputation list (allow/suspicious/block), re-read when it changes
+    DOMAIN_REPUTATION_FILE = os.getenv(
+        "DOMAIN_REPUTATION_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "domain_reputation.txt")
+    )
+    DOMAIN_REPUTATION_RELOAD_SECONDS = float(os.getenv("DOMAIN_REPUTATION_RELOAD_SECONDS", "5"))
+    
+    # URL investigation: page fetch limits and the shared page cache
+    URL_FETCH_TIMEOUT = float(os.getenv("URL_FETCH_TIMEOUT", "10"))  # seconds per page, redirects included
+    URL_FETCH_MAX_BYTES = int(os.getenv("URL_FETCH_MAX_BYTES", "2000000"))
+    URL_FETCH_WORKERS = int(os.getenv("URL_FETCH_WORKERS", "4"))
+    URL_CACHE_SIZE = int(os.getenv("URL_CACHE_SIZE", "256"))
+    URL_CACHE_TTL = float(os.getenv("URL_CACHE_TTL", "600"))  # seconds before a cached page is revalidated
+    URL_FETCH_ALLOW_PRIVATE = os.getenv("URL_FETCH_ALLOW_PRIVATE", "False").lower() == "true"
+    
+    # Google Cloud Vision: images are packed into as few annotate calls as the API allows, sent concurrently
+    VISION_BATCH_WORKERS = int(os.getenv("VISION_BATCH_WORKERS", "4"))
+    
+    # Image Analysis uploads: several files or ZIP archives, local forensics on a pool of worker processes
+    IMAGE_FORENSICS_PROCESSES = int(os.getenv("IMAGE_FORENSICS_PROCESSES", str(min(4, os.cpu_count() or 1))))
+    IMAGE_UPLOAD_MAX_FILES = int(os.getenv("IMAGE_UPLOAD_MAX_FILES", "200"))  # images per analysis, ZIP members included
+    IMAGE_MAX_BYTES = int(os.getenv("IMAGE_MAX_BYTES", str(10 * 1024 * 1024)))
+    
+    # News providers: NewsAPI and NewsData are queried together (fan-out) or hedged
+    NEWS_REQUEST_TIMEOUT = float(os.getenv("NEWS_REQUEST_TIMEOUT", "15"))
+    NEWS_HEDGE_DELAY = float(os.getenv("NEWS_HEDGE_DELAY", "0.6"))  # seconds before asking the next provider
+    NEWS_FANOUT_GRACE = float(os.getenv("NEWS_FANOUT_GRACE", "0.3"))  # wait for slower providers after the first answer
+    NEWS_SEARCH_MODE = os.getenv("NEWS_SEARCH_MODE", "fanout")  # fanout or hedged
+    
+    # Background news ingestion into the local headline store
+    NEWS_DB_PATH = os.getenv(
+        "NEWS_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "headlines.db")
+    )
+    NEWS_POLL_INTERVAL = float(os.getenv("NEWS_POLL_INTERVAL", "300"))  # seconds
+    NEWS_COUNTRY = os.getenv("NEWS_COUNTRY", "us")
+    NEWS_CATEGORIES = [category or None for category in os.getenv("NEWS_CATEGORIES", ",health,science,technology").split(",")]
+    NEWS_RETENTION_DAYS = int(os.getenv("NEWS_RETENTION_DAYS", "7"))
+    NEWS_INGESTION_ENABLED = os.getenv("NEWS_INGESTION_ENABLED", "True").lower() == "true"
+    
+    # Trending topics: counts over a sliding window, growth against the window before it
+    TREND_WINDOW_HOURS = float(os.getenv("TREND_WINDOW_HOURS", "24"))
+    TREND_BUCKETS = int(os.getenv("TREND_BUCKETS", "24"))  # window resolution
+    NEWS_TREND_WINDOW_HOURS = float(os.getenv("NEWS_TREND_WINDOW_HOURS", "6"))
+    
+    # Background analysis jobs (Home page analyses run off the script thread)
+    ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "4"))
+    JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", "3600"))  # keep finished jobs this long
+    JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+    # "thread" runs jobs inside each Streamlit process; "sqlite" queues them for job_worker.py processes
+    JOB_BACKEND = os.getenv("JOB_BACKEND", "thread")
+    JOB_DB_PATH = os.getenv(
+        "JOB_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "jobs.db")
+    )
+    JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "120"))  # a job is handed out again if its worker goes quiet
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_WORKER_PROCESSES = int(os.getenv("JOB_WORKER_PROCESSES", str(os.cpu_count() or 1)))
+    JOB_WORKER_THREADS = int(os.getenv("JOB_WORKER_THREADS", "4"))  # concurrent jobs per worker process
+    
+    # Multi-instance deployment: several Streamlit processes behind a sticky-session proxy.
+    # "session" keeps analyses per browser session; "sqlite" keeps them in a file shared by every instance
+    STORE_BACKEND = os.getenv("STORE_BACKEND", "session")
+    ANALYSIS_DB_PATH = os.getenv(
+        "ANALYSIS_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "analyses.db")
+    )
+    # "memory" keeps fetched pages per process; "sqlite" shares them between instances and job workers
+    URL_CACHE_BACKEND = os.getenv("URL_CACHE_BACKEND", "memory")
+    URL_CACHE_DB_PATH = os.getenv(
+        "URL_CACHE_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "pages.db")
+    )
+    # Set per process by PM2 (instance_var); offsets ports that every instance would otherwise share
+    INSTANCE_INDEX = int(os.getenv("INSTANCE_INDEX", "0"))
+    
+    # Observability
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+    TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none")  # none, console or file
+    TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+    
     # App Settings
     APP_NAME = "TruthLens"
     VERSION = "2.0.0"
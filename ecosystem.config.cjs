@@ -3,21 +3,55 @@ module.exports = {
     {
       name: 'truthlens-streamlit',
       script: 'python',
-      args: '-m streamlit run app_simple.py --server.port 3001 --server.address 0.0.0.0 --server.headless true',
+      // The port comes from STREAMLIT_SERVER_PORT: 3001 for the first instance, 3002 for the next, ...
+      args: '-m streamlit run app.py --server.address 0.0.0.0 --server.headless true',
       cwd: '/home/user/React-on-Streamlit',
       env: {
         NODE_ENV: 'production',
         PORT: 3001,
-        STREAMLIT_BROWSER_GATHER_USAGE_STATS: 'false'
+        STREAMLIT_SERVER_PORT: 3001,
+        STREAMLIT_BROWSER_GATHER_USAGE_STATS: 'false',
+        // Analyses are queued for the worker pool below instead of running in this process
+        JOB_BACKEND: 'sqlite',
+        // Analyses and fetched pages live in files under data/ shared by every instance, so any
+        // instance serves the same data; sessions still need the sticky proxy in deploy/nginx.conf
+        STORE_BACKEND: 'sqlite',
+        URL_CACHE_BACKEND: 'sqlite'
       },
       watch: false,
-      instances: 1,
+      // Scale with TRUTHLENS_INSTANCES=<n> pm2 start ecosystem.config.cjs (and list the ports in nginx)
+      instances: Number(process.env.TRUTHLENS_INSTANCES || 2),
       exec_mode: 'fork',
+      increment_var: 'STREAMLIT_SERVER_PORT',
+      instance_var: 'INSTANCE_INDEX',
       max_restarts: 3,
       restart_delay: 5000,
       log_file: 'streamlit.log',
       out_file: 'streamlit_out.log',
       error_file: 'streamlit_error.log'
+    },
+    {
+      name: 'truthlens-worker',
+      script: 'python',
+      args: 'job_worker.py',
+      cwd: '/home/user/React-on-Streamlit',
+      env: {
+        JOB_BACKEND: 'sqlite',
+        // Workers store finished analyses in the same shared log the Streamlit instances read
+        STORE_BACKEND: 'sqlite',
+        URL_CACHE_BACKEND: 'sqlite',
+        JOB_WORKER_PROCESSES: 2,
+        JOB_WORKER_THREADS: 4
+      },
+      watch: false,
+      instances: 1,
+      exec_mode: 'fork',
+      kill_timeout: 30000,
+      max_restarts: 3,
+      restart_delay: 5000,
+      log_file: 'worker.log',
+      out_file: 'worker_out.log',
+      error_file: 'worker_error.log'
     }
   ]
 }
\ No newline at end of file
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Analysis worker pool for the SQLite job queue.
+
+Streamlit processes started with JOB_BACKEND=sqlite only enqueue analysis
+jobs; this script drains the queue with a number of worker processes, each
+running several jobs concurrently on threads (the jobs mostly wait on
+remote APIs). Every process claims jobs from the same queue file, so UI
+replicas and workers can be added independently.
+
+    python job_worker.py --processes 4 --threads 4
+    JOB_DB_PATH=/shared/jobs.db python job_worker.py
+"""
+
+import argparse
+import itertools
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent))
+
+from config import Config
+from utils.job_queue import SQLiteJobQueue
+
+
+def run_job(queue, lease, job_id, kind, payload):
+    """Run one job claimed under `lease`, recording progress and the outcome in the queue"""
+    from utils.job_handlers import JOB_HANDLERS
+
+    handler = JOB_HANDLERS.get(kind)
+    if handler is None:
+        queue.fail(job_id, lease, f"Unknown job kind: {kind}")
+        return
+
+    try:
+        result = handler(on_progress=lambda stage, fraction: queue.report(job_id, lease, stage, fraction), **payload)
+    except Exception as e:
+        recorded = queue.fail(job_id, lease, str(e))
+    else:
+        recorded = queue.complete(job_id, lease, result)
+    if not recorded:
+        print(f"{lease}: lease on job {job_id} expired before it finished; outcome discarded")
+
+
+def work(name, db_path, threads, poll_interval):
+    """Worker process: claim jobs while a thread is free, until SIGTERM/SIGINT; then finish running jobs"""
+    # Service errors surface through st.error/st.warning, which only log outside a Streamlit session
+    logging.getLogger('streamlit').setLevel(logging.CRITICAL)
+
+    stop = threading.Event()
+    for signal_number in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signal_number, lambda *_: stop.set())
+
+    queue = SQLiteJobQueue(db_path, Config.JOB_LEASE_SECONDS, Config.JOB_MAX_ATTEMPTS)
+    free_threads = threading.Semaphore(threads)
+    # Every claim gets its own lease name, so a job handed out again - even to this process - has a new holder
+    claims = itertools.count(1)
+
+    def run(lease, job_id, kind, payload):
+        try:
+            run_job(queue, lease, job_id, kind, payload)
+        finally:
+            free_threads.release()
+
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix=name) as pool:
+        while not stop.is_set():
+            if not free_threads.acquire(timeout=poll_interval):
+                continue
+            lease = f"{name}#{next(claims)}"
+            try:
+                claimed = queue.claim(lease)
+            except Exception as e:
+                print(f"{name}: claiming a job failed: {e}")
+                claimed = None
+            if claimed is None:
+                free_threads.release()
+                stop.wait(poll_interval)
+                continue
+            pool.submit(run, lease, *claimed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=Config.JOB_WORKER_PROCESSES)
+    parser.add_argument('--threads', type=int, default=Config.JOB_WORKER_THREADS, help="Concurrent jobs per process")
+    parser.add_argument('--db', default=Config.JOB_DB_PATH, help="Job queue file")
+    parser.add_argument('--poll-interval', type=float, default=0.2, help="Seconds between polls of an empty queue")
+    args = parser.parse_args()
+
+    # Create the schema once before the workers race to open the file
+    SQLiteJobQueue(args.db)
+
+    context = multiprocessing.get_context('spawn')
+    host = socket.gethostname()
+    workers = [
+        context.Process(target=work, name=f"worker-{index}",
+                        args=(f"{host}:{os.getpid()}:{index}", args.db, args.threads, args.poll_interval))
+        for index in range(args.processes)
+    ]
+    for worker in workers:
+        worker.start()
+    print(f"{len(workers)} worker processes x {args.threads} threads draining {args.db}")
+
+    def shutdown(*_):
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == '__main__':
+    main()
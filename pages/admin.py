@@ -9,6 +9,11 @@ import os
 from utils.database import FirebaseService
 from utils.security import SecurityService
 from utils.email_service import EmailService
+from utils.metrics import registry as metrics
+from utils.news_providers import get_news_client
+from utils.circuit_breaker import breaker_states
+from utils import charts
+from config import Config
 
 # Admin credentials (you can change these)
 ADMIN_USERNAME = "admin"
@@ -281,14 +286,80 @@ def ai_responses_monitoring():
     st.markdown("### 🤖 AI Responses Monitoring")
     
     # AI performance metrics
-    col1, col2, col3 = st.columns(3)
+    totals = metrics.totals()
+    
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.metric("🎯 Accuracy Rate", "94.2%", "+1.2%")
     with col2:
-        st.metric("⚡ Avg Response Time", "2.3s", "-0.5s")
+        st.metric("⚡ Median Response Time", f"{totals['p50']:.2f}s")
     with col3:
-        st.metric("🔄 Total Analyses", "2,156", "+45")
+        st.metric("🐢 p95 Response Time", f"{totals['p95']:.2f}s")
+    with col4:
+        st.metric("🔄 External Calls", totals['calls'], f"{totals['error_rate']:.1f}% errors", delta_color="off")
+    
+    # Per-service latency and reliability
+    st.markdown("### ⏱️ External Call Latency")
+    if Config.STORE_BACKEND == 'sqlite':
+        st.caption(f"Figures for app instance {Config.INSTANCE_INDEX} only; scrape every instance's metrics port "
+                   f"({Config.METRICS_PORT} + instance index) for the whole deployment")
+    
+    rows = [row for row in metrics.summary() if row['calls']]
+    if rows:
+        st.plotly_chart(charts.latency_percentiles_figure(rows), use_container_width=True)
+        
+        st.dataframe(pd.DataFrame([
+            {
+                'Service': row['service'],
+                'Operation': row['operation'],
+                'Calls': row['calls'],
+                'Error Rate %': round(row['error_rate'], 1),
+                'p50 (s)': round(row['p50'], 3),
+                'p95 (s)': round(row['p95'], 3),
+                'p99 (s)': round(row['p99'], 3),
+                'Retries': row['retries'],
+                'Hedges (won)': f"{row['hedges']} ({row['hedge_wins']})",
+                'Tokens': row['prompt_tokens'] + row['completion_tokens'],
+                'Status Codes': ', '.join(f"{status}: {count}" for status, count in sorted(row['status_codes'].items()))
+            }
+            for row in rows
+        ]), use_container_width=True)
+    else:
+        st.info("No external API calls recorded in this process yet")
+    
+    # News provider failover state
+    st.markdown("### 📰 News Providers")
+    st.dataframe(pd.DataFrame([
+        {
+            'Provider': health['provider'],
+            'Status': health['status'],
+            'Latency (ms)': health['latency_ms'],
+            'Successes': health['successes'],
+            'Failures': health['failures'],
+            'Last Status': health['last_status'],
+            'Cool-down (s)': health['cooldown_s']
+        }
+        for health in get_news_client().health()
+    ]), use_container_width=True)
+    
+    # Upstream circuit breakers
+    st.markdown("### 🔌 Circuit Breakers")
+    breakers = breaker_states()
+    if breakers:
+        st.dataframe(pd.DataFrame([
+            {
+                'Service': breaker['service'],
+                'State': breaker['state'],
+                'Consecutive Failures': breaker['consecutive_failures'],
+                'Times Opened': breaker['times_opened'],
+                'Rejected Calls': breaker['rejected_calls'],
+                'Retry In (s)': breaker['retry_in_s']
+            }
+            for breaker in breakers
+        ]), use_container_width=True)
+    else:
+        st.info("No upstream service has been called in this process yet")
     
     # Recent AI responses
     st.markdown("### 📊 Recent AI Responses")
@@ -2,11 +2,15 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from utils.database import FirebaseService
+from utils.database import FirebaseService, date_range_start
 from utils.security import SecurityService
+from utils.news_services import NewsAggregator
+from utils.export_service import ExportService, SECURITY_LOG_COLUMNS, EXPORT_FORMATS
+from utils import charts
+from config import Config
+from utils.charts import cached_figure, STATIC
 
 
 def show_authority():
@@ -19,6 +23,7 @@ def show_authority():
     # Get services
     firebase_service = FirebaseService()
     security_service = SecurityService()
+    news_aggregator = NewsAggregator()
     
     # Header with user info
     username = st.session_state.get('authority_username', 'Unknown')
@@ -31,32 +36,21 @@ def show_authority():
     **Clearance:** {user_info['clearance']}
     """)
     
-    # Main dashboard tabs
-    tabs = st.tabs([
-        "📊 Live Dashboard",
-        "🚨 Alert System", 
-        "📈 Analytics Center",
-        "🔍 Investigation Tools",
-        "📋 Reports & Logs"
-    ])
-    
-    with tabs[0]:
-        live_dashboard(firebase_service, security_service)
-    
-    with tabs[1]:
-        alert_system(firebase_service, security_service)
-    
-    with tabs[2]:
-        analytics_center(firebase_service)
-    
-    with tabs[3]:
-        investigation_tools(firebase_service, security_service)
+    # Main dashboard sections - unlike st.tabs, only the selected section's charts are built
+    sections = {
+        "📊 Live Dashboard": lambda: live_dashboard(firebase_service, security_service, news_aggregator),
+        "🚨 Alert System": lambda: alert_system(firebase_service, security_service),
+        "📈 Analytics Center": lambda: analytics_center(firebase_service),
+        "🔍 Investigation Tools": lambda: investigation_tools(firebase_service, security_service),
+        "📋 Reports & Logs": lambda: reports_and_logs(firebase_service, security_service)
+    }
     
-    with tabs[4]:
-        reports_and_logs(firebase_service, security_service)
+    section = st.radio("Section", list(sections), horizontal=True,
+                       label_visibility="collapsed", key="authority_section")
+    sections[section]()
 
 
-def live_dashboard(firebase_service, security_service):
+def live_dashboard(firebase_service, security_service, news_aggregator):
     """Real-time threat monitoring dashboard"""
     st.subheader("🔴 Live Threat Monitoring")
     
@@ -113,41 +107,44 @@ def live_dashboard(firebase_service, security_service):
         current_threat_level = "MEDIUM"  # This would be calculated from real data
         threat_colors = {"LOW": "green", "MEDIUM": "orange", "HIGH": "red", "CRITICAL": "darkred"}
         
-        fig_gauge = go.Figure(go.Indicator(
-            mode = "gauge+number+delta",
-            value = 65,  # Current threat level (0-100)
-            domain = {'x': [0, 1], 'y': [0, 1]},
-            title = {'text': "Overall Threat Level"},
-            delta = {'reference': 60},
-            gauge = {
-                'axis': {'range': [None, 100]},
-                'bar': {'color': "darkblue"},
-                'steps': [
-                    {'range': [0, 25], 'color': "lightgray"},
-                    {'range': [25, 50], 'color': "yellow"},
-                    {'range': [50, 75], 'color': "orange"},
-                    {'range': [75, 100], 'color': "red"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 90
-                }
-            }
+        fig_gauge = cached_figure(('threat_gauge',), STATIC, lambda: charts.gauge_figure(
+            65,  # Current threat level (0-100)
+            "Overall Threat Level", "darkblue", height=300, reference=60,
+            steps=((0, 25, "lightgray"), (25, 50, "yellow"), (50, 75, "orange"), (75, 100, "red"))
         ))
-        
-        fig_gauge.update_layout(height=300)
         st.plotly_chart(fig_gauge, use_container_width=True)
     
     with col2:
         st.markdown("**🔥 Trending Threats:**")
-        trending = firebase_service.get_trending_threats()
+        trending = firebase_service.get_trending_threats(limit=5)
+        
+        if not trending:
+            st.info(f"No trending threats in the last {Config.TREND_WINDOW_HOURS:g} hours")
         
-        for threat in trending[:5]:
+        for threat in trending:
             risk_icon = "🔴" if threat['risk'] == 'HIGH' else "🟡" if threat['risk'] == 'MEDIUM' else "🟢"
             st.write(f"{risk_icon} **{threat['topic']}**")
             st.write(f"   📊 {threat['count']} mentions ({threat['growth']})")
-            st.progress(min(threat['count'] / 200, 1.0))
+            st.progress(threat['count'] / trending[0]['count'])
+    
+    # Latest headlines from the background ingestion worker's store
+    st.subheader("📰 Latest Headlines")
+    headlines = news_aggregator.get_breaking_news(Config.NEWS_COUNTRY, limit=8)
+    last_ingested = news_aggregator.store.last_ingested_at()
+    
+    if headlines:
+        news_topics = news_aggregator.get_trending_topics()
+        if news_topics:
+            st.write("**Trending in the news:** " + " · ".join(
+                f"{topic['topic']} ({topic['count']}, {topic['growth']})" for topic in news_topics
+            ))
+        for article in headlines:
+            source = article['source']['name'] or article['provider']
+            st.write(f"• [{article['title']}]({article['url']}) — {source}")
+        st.caption(f"Last ingested {last_ingested.strftime('%Y-%m-%d %H:%M')}")
+    else:
+        st.info("No headlines ingested yet - the background worker polls the news APIs every "
+                f"{Config.NEWS_POLL_INTERVAL / 60:.0f} minutes")
     
     # Live activity feed
     st.subheader("📺 Live Content Feed")
@@ -297,37 +294,46 @@ def analytics_center(firebase_service):
     with col2:
         st.markdown("**📊 Advanced analytics for threat intelligence and pattern recognition**")
     
+    data_version = firebase_service.get_data_version()
+    
     # Charts row 1
     col1, col2 = st.columns(2)
     
     with col1:
         # Risk distribution pie chart
-        fig_pie = px.pie(
-            values=list(analytics_data['risk_distribution'].values()),
-            names=list(analytics_data['risk_distribution'].keys()),
-            title="🎯 Threat Level Distribution",
-            color_discrete_map={'High': '#ff4444', 'Medium': '#ff8800', 'Low': '#44ff44'}
-        )
-        fig_pie.update_layout(height=400)
+        def build_risk_pie():
+            fig = charts.pie_figure(
+                analytics_data['risk_distribution'],
+                "🎯 Threat Level Distribution",
+                color_map={'High': '#ff4444', 'Medium': '#ff8800', 'Low': '#44ff44'}
+            )
+            fig.update_layout(height=400)
+            return fig
+        
+        fig_pie = cached_figure(('authority_risk_distribution',), data_version, build_risk_pie)
         st.plotly_chart(fig_pie, use_container_width=True)
     
     with col2:
         # Daily activity chart
-        fig_line = go.Figure()
-        fig_line.add_trace(go.Scatter(
-            x=list(range(7)),
-            y=analytics_data['daily_counts'],
-            mode='lines+markers',
-            name='Daily Analyses',
-            line=dict(color='#667eea', width=3),
-            marker=dict(size=8)
-        ))
-        fig_line.update_layout(
-            title="📊 7-Day Activity Trend", 
-            xaxis_title="Days Ago", 
-            yaxis_title="Number of Analyses",
-            height=400
-        )
+        def build_daily_activity():
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(
+                x=list(range(7)),
+                y=analytics_data['daily_counts'],
+                mode='lines+markers',
+                name='Daily Analyses',
+                line=dict(color='#667eea', width=3),
+                marker=dict(size=8)
+            ))
+            fig.update_layout(
+                title="📊 7-Day Activity Trend", 
+                xaxis_title="Days Ago", 
+                yaxis_title="Number of Analyses",
+                height=400
+            )
+            return fig
+        
+        fig_line = cached_figure(('authority_daily_activity',), data_version, build_daily_activity)
         st.plotly_chart(fig_line, use_container_width=True)
     
     # Charts row 2
@@ -335,30 +341,18 @@ def analytics_center(firebase_service):
     
     with col1:
         # Threat sources
-        fig_bar = px.bar(
-            x=list(analytics_data['threat_sources'].keys()),
-            y=list(analytics_data['threat_sources'].values()),
-            title="🌐 Threat Sources Distribution",
-            color=list(analytics_data['threat_sources'].values()),
-            color_continuous_scale='Reds'
-        )
-        fig_bar.update_layout(height=400)
+        def build_threat_sources():
+            fig = charts.bar_figure(analytics_data['threat_sources'], "🌐 Threat Sources Distribution", 'Reds')
+            fig.update_layout(height=400)
+            return fig
+        
+        fig_bar = cached_figure(('authority_threat_sources',), data_version, build_threat_sources)
         st.plotly_chart(fig_bar, use_container_width=True)
     
     with col2:
         # Hourly activity heatmap
-        fig_heatmap = go.Figure(data=go.Heatmap(
-            z=[analytics_data['hourly_activity']],
-            x=list(range(24)),
-            y=['Activity'],
-            colorscale='Reds',
-            showscale=True
-        ))
-        fig_heatmap.update_layout(
-            title="🕒 24-Hour Activity Heatmap",
-            xaxis_title="Hour of Day",
-            height=200
-        )
+        fig_heatmap = cached_figure(('authority_hourly_heatmap',), data_version,
+                                    lambda: charts.hourly_heatmap_figure(analytics_data['hourly_activity']))
         st.plotly_chart(fig_heatmap, use_container_width=True)
     
     # Analysis breakdown
@@ -366,21 +360,24 @@ def analytics_center(firebase_service):
     
     with col1:
         st.markdown("**🧠 Top Manipulation Tactics Detected**")
+        tactic_counts = analytics_data['tactic_counts']
+        max_count = max(tactic_counts.values(), default=1)
         for i, tactic in enumerate(analytics_data['top_tactics'], 1):
-            progress_value = 0.9 - (i * 0.15)
-            st.write(f"{i}. {tactic}")
-            st.progress(progress_value)
+            st.write(f"{i}. {tactic} ({tactic_counts[tactic]})")
+            st.progress(tactic_counts[tactic] / max_count)
+        if not analytics_data['top_tactics']:
+            st.info("No manipulation tactics detected yet")
     
     with col2:
         st.markdown("**👥 User Type Distribution**")
         user_types = analytics_data['user_types']
-        fig_donut = px.pie(
-            values=list(user_types.values()),
-            names=list(user_types.keys()),
-            hole=0.4,
-            color_discrete_map={'Public': '#36a2eb', 'Authority': '#ff6384'}
-        )
-        fig_donut.update_layout(height=300, showlegend=True)
+        def build_user_types():
+            fig = charts.pie_figure(user_types, hole=0.4,
+                                    color_map={'Public': '#36a2eb', 'Authority': '#ff6384'})
+            fig.update_layout(height=300, showlegend=True)
+            return fig
+        
+        fig_donut = cached_figure(('authority_user_types',), data_version, build_user_types)
         st.plotly_chart(fig_donut, use_container_width=True)
 
 
@@ -407,14 +404,25 @@ def investigation_tools(firebase_service, security_service):
         
         if st.button("🔍 Search Database", type="primary") and search_query:
             with st.spinner("🔍 Searching database..."):
-                # Get recent analyses for demo
-                analyses = firebase_service.get_recent_analyses(limit=20)
+                # Only the day partitions inside the selected date range are scanned
+                analyses = firebase_service.query_analyses(start=date_range_start(date_filter))
+                
+                # Filter based on search query and type
+                query = search_query.lower()
+                search_fields = {
+                    "Content": 'content_preview',
+                    "Analysis ID": 'id',
+                    "User Type": 'user_type',
+                    "Threat Level": 'threat_level'
+                }
+                field = search_fields[search_type]
                 
-                # Filter based on search query (simplified)
                 filtered_results = []
                 for analysis in analyses:
-                    if search_query.lower() in analysis['content_preview'].lower():
+                    if query in str(analysis.get(field, '')).lower():
                         filtered_results.append(analysis)
+                        if len(filtered_results) >= 20:
+                            break
                 
                 st.success(f"🔍 Found {len(filtered_results)} results for '{search_query}'")
                 
@@ -481,6 +489,27 @@ def investigation_tools(firebase_service, security_service):
         st.write(f"**Created:** {selected_row['Created']}")
     
     st.dataframe(df, use_container_width=True)
+    
+    # Investigation export
+    export_service = ExportService()
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        export_format = st.selectbox("Export Format", export_service.available_formats(), key="investigation_export_format")
+    with col2:
+        # Built only when asked for, not on every render of the page
+        if st.button("📦 Prepare Investigations Export"):
+            st.session_state.investigation_export = (export_format, export_service.export_to_bytes(
+                export_service.record_chunks(df), export_format, list(df.columns)
+            ))
+        
+        if st.session_state.get('investigation_export'):
+            prepared_format, export_data = st.session_state.investigation_export
+            st.download_button(
+                f"⬇️ Export Investigations ({prepared_format})",
+                export_data,
+                file_name=f"investigations.{EXPORT_FORMATS[prepared_format]['extension']}",
+                mime=EXPORT_FORMATS[prepared_format]['mime']
+            )
 
 
 def reports_and_logs(firebase_service, security_service):
@@ -523,7 +552,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 Report ID: {report_id}
 
 EXECUTIVE SUMMARY:
-- Total Analyses: {firebase_service.get_statistics()['analyzed_today']}
+- Total Analyses: {firebase_service.get_statistics()['total_analyses']}
 - High-Risk Content: {firebase_service.get_statistics()['flagged_content']}
 - System Accuracy: {firebase_service.get_statistics()['accuracy_rate']}%
 
@@ -580,6 +609,24 @@ Generated by TruthLens Authority System v2.0.0
                 
                 with col4:
                     st.write(str(log['details'])[:50] + "..." if len(str(log['details'])) > 50 else str(log['details']))
+            
+            # Full security log export, written chunk by chunk
+            export_service = ExportService()
+            log_format = st.selectbox("Export Format", export_service.available_formats(), key="security_log_export_format")
+            
+            if st.button("📦 Prepare Security Log Export"):
+                st.session_state.security_log_export = (log_format, export_service.export_to_bytes(
+                    export_service.security_log_chunks(security_service), log_format, SECURITY_LOG_COLUMNS
+                ))
+            
+            if st.session_state.get('security_log_export'):
+                prepared_format, export_data = st.session_state.security_log_export
+                st.download_button(
+                    f"⬇️ Download Security Logs ({prepared_format})",
+                    export_data,
+                    file_name=f"security_logs.{EXPORT_FORMATS[prepared_format]['extension']}",
+                    mime=EXPORT_FORMATS[prepared_format]['mime']
+                )
         else:
             st.info("No security logs available")
     
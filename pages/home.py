@@ -1,19 +1,25 @@
 # pages/home.py
 from tl_frontend import render_landing
 
+import pandas as pd
 import streamlit as st
-from utils.ai_services import GeminiService, FactCheckService
-from utils.news_services import NewsAggregator
 from utils.security import SecurityService
 from utils.database import FirebaseService
+from utils.google_cloud_services import GoogleCloudVisionService, vision_features
+from utils.image_forensics import expand_uploads, start_image_triage
+from utils.job_handlers import services
+from utils.jobs import analysis_jobs, DONE, FAILED
+from utils import charts
+from config import Config
 
 
 # Initialize services
-gemini_service = GeminiService()
-fact_check_service = FactCheckService()
-news_aggregator = NewsAggregator()
 security_service = SecurityService()
 firebase_service = FirebaseService()
+vision_service = GoogleCloudVisionService()
+# Analysis services shared with the background jobs
+forensic_analyzer = services()['forensic_analyzer']
+
 
 def show_home():
     """Main Home Page – Hero Section with Input Tabs"""
@@ -53,80 +59,66 @@ def show_home():
         
         if st.button("🚀 Analyze Text", type="primary", use_container_width=True):
             if user_text.strip():
-                # Validate input
-                is_valid, validation_msg = security_service.validate_input(user_text)
+                # Validate and sanitize input
+                is_valid, validation_msg, sanitized_text = security_service.scan_input(user_text)
                 if not is_valid:
                     st.error(f"❌ {validation_msg}")
                     return
                 
-                # Sanitize input
-                sanitized_text = security_service.sanitize_input(user_text)
-                
-                with st.spinner("🔍 AI is analyzing your text..."):
-                    # Conduct real analysis
-                    results = conduct_forensic_analysis(
-                        sanitized_text, language, analysis_level, True, 
-                        analysis_level == "Deep Analysis", safety_check
-                    )
-                    
-                    # Display results
-                    display_forensic_results(results)
-                    
-                    # Save to database
-                    analysis_id = firebase_service.save_analysis(sanitized_text, results)
-                    if analysis_id:
-                        st.success(f"✅ Analysis completed and saved (ID: {analysis_id})")
+                # Runs in the background; the job panel below polls its progress
+                job_id = analysis_jobs.submit(
+                    'text_analysis', text=sanitized_text, language=language, level=analysis_level,
+                    context=True, origin=analysis_level == "Deep Analysis", safety=safety_check,
+                    user_type=st.session_state.get('user_type', 'public')
+                )
+                track_job('text', job_id, sanitized_text)
             else:
                 st.warning("⚠️ Please enter some text to analyze")
+        
+        show_job('text', display_forensic_results, save_text_analysis)
     
     # --- URL INVESTIGATION TAB ---
     with tab2:
         st.subheader("🔗 URL Investigation")
         url_input = st.text_input("🌐 Enter URL to investigate:",
                                   placeholder="https://example.com/article")
+        url_level = st.selectbox("🔍 Analysis Level", ["Quick Scan", "Deep Analysis"], key="url_analysis_level")
         
         if st.button("🔍 Investigate URL", type="primary", use_container_width=True):
             if url_input.strip():
-                with st.spinner(f"🔍 Investigating URL: {url_input}"):
-                    # Basic URL validation
-                    if not url_input.startswith(('http://', 'https://')):
-                        st.error("❌ Please enter a valid URL starting with http:// or https://")
-                        return
-                    
-                    # Use news aggregator to verify article
-                    verification_result = news_aggregator.verify_article(url_input)
-                    
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Credibility Score", f"{verification_result['credibility_score']}/100")
-                    with col2:
-                        st.metric("Source Reputation", verification_result['source_reputation'])
-                    with col3:
-                        st.metric("Cross References", verification_result['cross_references'])
-                    
-                    if verification_result['warning_flags']:
-                        st.warning("⚠️ Warning flags detected:")
-                        for flag in verification_result['warning_flags']:
-                            st.write(f"• {flag}")
-                    else:
-                        st.success("✅ No warning flags detected")
+                # Basic URL validation
+                if not url_input.startswith(('http://', 'https://')):
+                    st.error("❌ Please enter a valid URL starting with http:// or https://")
+                    return
+                
+                # Fetch the page, analyze its text and look for coverage elsewhere, in the background
+                job_id = analysis_jobs.submit('url_investigation', url=url_input.strip(), level=url_level,
+                                              user_type=st.session_state.get('user_type', 'public'))
+                track_job('url', job_id, url_input.strip())
             else:
                 st.warning("⚠️ Please enter a URL")
+        
+        show_job('url', display_url_investigation, save_url_investigation)
     
     # --- IMAGE FORENSICS TAB ---
     with tab3:
         st.subheader("🖼️ Image Analysis")
-        uploaded_file = st.file_uploader(
-            "📸 Upload Image for Analysis",
-            type=['png', 'jpg', 'jpeg', 'webp', 'gif', 'bmp'],
-            help="Supported formats: PNG, JPG, JPEG, WebP, GIF, BMP (Max 10MB)"
+        uploaded_files = st.file_uploader(
+            "📸 Upload Images for Analysis",
+            type=['png', 'jpg', 'jpeg', 'webp', 'gif', 'bmp', 'zip'],
+            accept_multiple_files=True,
+            help="Supported formats: PNG, JPG, JPEG, WebP, GIF, BMP (Max 10MB each), or ZIP archives of them"
         )
         
-        if uploaded_file:
+        if uploaded_files:
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                st.image(uploaded_file, caption="📸 Uploaded Image", use_column_width=True)
+                if len(uploaded_files) == 1 and not uploaded_files[0].name.lower().endswith('.zip'):
+                    st.image(uploaded_files[0], caption="📸 Uploaded Image", use_column_width=True)
+                else:
+                    st.markdown(f"**📁 {len(uploaded_files)} files uploaded**")
+                    st.caption(", ".join(uploaded_file.name for uploaded_file in uploaded_files))
             
             with col2:
                 st.markdown("**⚙️ Analysis Options**")
@@ -141,237 +133,91 @@ def show_home():
                     index=1
                 )
             
-            if st.button("🚀 Analyze Image", type="primary", use_container_width=True):
-                with st.spinner("🔍 Performing image forensics..."):
-                    # Use the comprehensive image analysis
-                    results = analyze_image_comprehensive(
-                        uploaded_file, check_manipulation, extract_metadata, 
-                        reverse_search, text_extraction, analysis_depth
-                    )
-                    
-                    # Display results
-                    display_image_results(results)
-                    
-                    # Save to database
-                    analysis_id = firebase_service.save_image_analysis(uploaded_file.name, results)
-                    if analysis_id:
-                        st.success(f"✅ Image analysis completed and saved (ID: {analysis_id})")
+            if st.button("🚀 Analyze Images", type="primary", use_container_width=True):
+                images, skipped = expand_uploads(uploaded_files, Config.IMAGE_UPLOAD_MAX_FILES, Config.IMAGE_MAX_BYTES)
+                for name, reason in skipped:
+                    st.warning(f"⚠️ Skipped {name}: {reason}")
+                
+                if images:
+                    # Local forensics run on worker processes, Vision (ticked options only) on a background thread
+                    features = vision_features(check_manipulation, reverse_search, text_extraction)
+                    triage = start_image_triage(images, analysis_depth, features, vision_service)
+                    st.session_state.image_triage = {
+                        'triage': triage, 'extract_metadata': extract_metadata, 'analysis_ids': None
+                    }
+                else:
+                    st.warning("⚠️ No images to analyze")
+        
+        show_image_triage()
 
-def conduct_forensic_analysis(text, language, level, context, origin, safety):
+def conduct_forensic_analysis(text, language, level, context, origin, safety, on_progress=None):
     """Comprehensive forensic analysis using real backend services"""
-    results = {
-        'risk_score': 0,
-        'credibility_score': 0,
-        'manipulation_tactics': [],
-        'fact_checks': [],
-        'ai_analysis': None,
-        'origin_analysis': None,
-        'context_analysis': None,
-        'safety_analysis': None,
-        'structure_analysis': None,
-        'recommendations': [],
-        'source_links': [],
-        'reporting_emails': []
-    }
-    
-    # Basic risk calculation
-    results['risk_score'] = calculate_risk_score(text)
-    
-    # Security analysis
-    if safety:
-        results['safety_analysis'] = security_service.check_content_safety(text)
-        results['structure_analysis'] = security_service.analyze_text_structure(text)
-        manipulation_results = security_service.detect_manipulation_patterns(text)
-        results['manipulation_tactics'] = list(manipulation_results['patterns'].keys())
-        
-        # Adjust risk score based on security analysis
-        results['risk_score'] = max(results['risk_score'], 
-                                  manipulation_results['manipulation_score'])
-    
-    # Basic manipulation detection fallback
-    if not results['manipulation_tactics']:
-        results['manipulation_tactics'] = detect_manipulation_tactics(text)
-    
-    # Fact checking
-    results['fact_checks'] = fact_check_service.search_claims(text)
-    
-    # AI analysis with Gemini
-    try:
-        results['ai_analysis'] = gemini_service.forensic_analysis(text, language)
-        # Update risk score based on AI analysis
-        ai_risk_adjustment = analyze_ai_response_for_risk(results['ai_analysis'])
-        results['risk_score'] = max(results['risk_score'], ai_risk_adjustment)
-        
-        # Extract sources and reporting information
-        sources_and_reporting = gemini_service.extract_sources_and_reporting(results['ai_analysis'])
-        results['source_links'] = sources_and_reporting['sources']
-        results['reporting_emails'] = sources_and_reporting['reporting_emails']
-    except Exception as e:
-        results['ai_analysis'] = f"AI analysis temporarily unavailable: {str(e)}"
-        results['source_links'] = []
-        results['reporting_emails'] = []
-    
-    # Origin tracking for deep analysis
-    if origin and level == "Deep Analysis":
-        try:
-            results['origin_analysis'] = gemini_service.trace_origin(text)
-        except Exception as e:
-            results['origin_analysis'] = f"Origin tracking unavailable: {str(e)}"
-    
-    # Context analysis
-    if context:
-        try:
-            results['context_analysis'] = gemini_service.analyze_context(text)
-        except Exception as e:
-            results['context_analysis'] = f"Context analysis unavailable: {str(e)}"
-    
-    # Calculate credibility score
-    results['credibility_score'] = calculate_credibility(results)
-    
-    # Generate recommendations
-    results['recommendations'] = generate_recommendations(results)
-    
-    return results
+    return forensic_analyzer.analyze(text, language, level, context, origin, safety, on_progress=on_progress)
 
-def calculate_risk_score(text):
-    """Enhanced risk score calculation"""
-    score = 0
-    text_lower = text.lower()
-    
-    # Check for sensational language
-    sensational_words = ['shocking', 'unbelievable', 'incredible', 'amazing', 'breaking', 'urgent']
-    for word in sensational_words:
-        if word in text_lower:
-            score += 10
-    
-    # Check for conspiracy indicators
-    conspiracy_words = ['conspiracy', 'cover-up', 'hidden truth', 'they don\'t want']
-    for word in conspiracy_words:
-        if word in text_lower:
-            score += 15
-    
-    # Check for lack of sources
-    if 'source' not in text_lower and 'study' not in text_lower and 'research' not in text_lower:
-        score += 20
-    
-    # Check for excessive punctuation
-    if text.count('!') > 3 or text.count('?') > 3:
-        score += 10
-    
-    # Check for call to action
-    action_words = ['share', 'forward', 'spread', 'tell everyone']
-    for word in action_words:
-        if word in text_lower:
-            score += 10
-    
-    return min(100, score)
+def track_job(slot, job_id, content):
+    """Remember the session's latest job for a Home tab, replacing the previous one"""
+    st.session_state.setdefault('home_jobs', {})[slot] = {'id': job_id, 'content': content, 'analysis_id': None}
 
-def detect_manipulation_tactics(text):
-    """Detect manipulation tactics in text"""
-    tactics = []
-    text_lower = text.lower()
-    
-    # Check for emotional manipulation
-    emotional_words = ['outrageous', 'disgusting', 'terrifying', 'heartbreaking', 'infuriating']
-    if any(word in text_lower for word in emotional_words):
-        tactics.append("Emotional Manipulation")
-    
-    # Check for urgency tactics
-    urgency_words = ['urgent', 'quickly', 'immediately', 'before it\'s too late', 'act now']
-    if any(word in text_lower for word in urgency_words):
-        tactics.append("Urgency Tactics")
-    
-    # Check for authority undermining
-    authority_words = ['mainstream media lies', 'experts are wrong', 'don\'t trust']
-    if any(word in text_lower for word in authority_words):
-        tactics.append("Authority Undermining")
-    
-    # Check for conspiracy language
-    conspiracy_words = ['they don\'t want you to know', 'hidden truth', 'cover-up']
-    if any(word in text_lower for word in conspiracy_words):
-        tactics.append("Conspiracy Language")
-    
-    return tactics if tactics else ["None Detected"]
+def show_job(slot, display, save):
+    """Progress of a Home tab's job while it runs; its results once finished (saved to the database once)"""
+    entry = st.session_state.get('home_jobs', {}).get(slot)
+    if entry is None:
+        return
+    
+    job = analysis_jobs.get(entry['id'])
+    if job is None:
+        del st.session_state.home_jobs[slot]
+        st.info("ℹ️ The previous analysis has expired. Please run it again.")
+        return
+    
+    if not job.finished:
+        poll_job(job.id)
+        return
+    
+    if job.status == FAILED:
+        st.error(f"❌ Analysis failed: {job.error}")
+        return
+    
+    display(job.result)
+    if entry['analysis_id'] is None:
+        entry['analysis_id'] = job.result.get('analysis_id') or save(entry['content'], job.result) or ''
+    if entry['analysis_id']:
+        st.success(f"✅ Analysis completed and saved (ID: {entry['analysis_id']})")
 
-def analyze_ai_response_for_risk(ai_response):
-    """Analyze AI response to determine risk level"""
-    if not ai_response or "AI analysis temporarily unavailable" in str(ai_response):
-        return 0
-    
-    response_lower = str(ai_response).lower()
-    
-    # Check for explicit veracity assessment from AI
-    if 'false information' in response_lower:
-        return 90
-    elif 'misleading' in response_lower:
-        return 80
-    elif 'unverified' in response_lower:
-        return 60
-    elif 'true' in response_lower and 'veracity assessment' in response_lower:
-        return 10
-    
-    # Fallback to keyword analysis
-    high_risk_indicators = [
-        'false', 'misinformation', 'disinformation', 'fake', 'untrue', 
-        'deceptive', 'manipulative', 'harmful', 'dangerous',
-        'conspiracy', 'hoax', 'scam', 'fraud', 'deceit'
-    ]
-    
-    medium_risk_indicators = [
-        'questionable', 'suspicious', 'unreliable', 
-        'biased', 'exaggerated', 'incomplete', 'outdated'
-    ]
-    
-    # Check for risk indicators
-    high_risk_count = sum(1 for indicator in high_risk_indicators if indicator in response_lower)
-    medium_risk_count = sum(1 for indicator in medium_risk_indicators if indicator in response_lower)
-    
-    if high_risk_count > 0:
-        return 75
-    elif medium_risk_count > 0:
-        return 50
-    else:
-        return 0
+def job_progress(job_id):
+    """Progress bar of a running job; reruns the page once the job has finished"""
+    job = analysis_jobs.get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+    
+    st.progress(job.progress, text=f"🔍 {job.stage}...")
+    st.caption(f"Job {job.id} · running in the background, you can leave this page and come back")
 
-def calculate_credibility(results):
-    """Calculate credibility score"""
-    base_credibility = 80
-    
-    # Reduce credibility based on risk score
-    credibility = base_credibility - (results['risk_score'] * 0.8)
-    
-    # Factor in safety analysis
-    if results.get('safety_analysis'):
-        safety_score = results['safety_analysis']['safety_score']
-        credibility = (credibility + safety_score) / 2
-    
-    # Factor in manipulation tactics
-    manipulation_count = len([t for t in results['manipulation_tactics'] if t != "None Detected"])
-    credibility -= manipulation_count * 10
-    
-    # Factor in fact checks
-    if results['fact_checks']:
-        credibility += 10
-    
-    return max(0, min(100, round(credibility)))
+# Reruns only the progress panel while the job runs, so the rest of the page stays responsive
+poll_job = st.fragment(run_every=Config.JOB_POLL_SECONDS)(job_progress)
 
-def generate_recommendations(results):
-    """Generate recommendations based on analysis"""
-    recommendations = []
-    
-    if results['risk_score'] > 70:
-        recommendations.append("🚨 HIGH RISK: Do not share this content")
-        recommendations.append("🔍 Verify information from multiple credible sources")
-        recommendations.append("📧 Report this content to relevant authorities")
-    elif results['risk_score'] > 40:
-        recommendations.append("⚠️ MEDIUM RISK: Be cautious about sharing")
-        recommendations.append("🔍 Cross-check with fact-checking websites")
-        recommendations.append("📚 Look for additional context and sources")
-    else:
-        recommendations.append("✅ LOW RISK: Content appears credible")
-        recommendations.append("🔍 Still verify with additional sources if important")
-    
-    return recommendations
+def save_finished_jobs():
+    """Store the results of the session's finished Home jobs not stored yet; app.py calls this on every page.
+    
+    Jobs store their own results in the shared store; analyses kept per
+    session are stored here, on the session's next run after the job
+    finished, even if the Home page is not open.
+    """
+    for slot, save in (('text', save_text_analysis), ('url', save_url_investigation)):
+        entry = st.session_state.get('home_jobs', {}).get(slot)
+        if entry is None or entry['analysis_id'] is not None:
+            continue
+        job = analysis_jobs.get(entry['id'])
+        if job is not None and job.status == DONE:
+            entry['analysis_id'] = job.result.get('analysis_id') or save(entry['content'], job.result) or ''
+
+def save_text_analysis(content, results):
+    return firebase_service.save_analysis(content, results)
+
+def save_url_investigation(url, investigation):
+    if investigation.get('analysis'):
+        return firebase_service.save_analysis(investigation['text'], investigation['analysis'])
+    return None
 
 def display_forensic_results(results):
     """Display comprehensive forensic results"""
@@ -379,6 +225,10 @@ def display_forensic_results(results):
     # Executive summary
     st.subheader("📋 Analysis Results")
     
+    if results.get('degraded_services'):
+        st.warning(f"⚠️ {' and '.join(results['degraded_services'])} unavailable - "
+                   "showing local analysis only. Full analysis resumes automatically once the service recovers.")
+    
     col1, col2, col3 = st.columns(3)
     with col1:
         risk_score = results['risk_score']
@@ -418,17 +268,18 @@ def display_forensic_results(results):
         "🧠 AI Analysis", 
         "🔗 Sources & Links",
         "📊 Details",
-        "💡 Recommendations"
+        "💡 Recommendations",
+        "⏱️ Timings"
     ])
     
-    with forensic_tabs:  # AI Analysis tab
+    with forensic_tabs[0]:  # AI Analysis tab
         if results['ai_analysis']:
             st.write("**🧠 AI Analysis:**")
             st.info(results['ai_analysis'])
         else:
             st.info("AI analysis not available.")
     
-    with forensic_tabs[17]:  # Sources & Links tab
+    with forensic_tabs[1]:  # Sources & Links tab
         st.write("**🔗 Source Links & Articles**")
         if results.get('source_links') and len(results['source_links']) > 0:
             for i, source in enumerate(results['source_links'], 1):
@@ -439,7 +290,7 @@ def display_forensic_results(results):
         else:
             st.info("No source links found in AI analysis.")
     
-    with forensic_tabs[18]:  # Details tab
+    with forensic_tabs[2]:  # Details tab
         st.write("**📊 Detailed Analysis**")
         
         if results.get('manipulation_tactics'):
@@ -455,45 +306,156 @@ def display_forensic_results(results):
             for check in results['fact_checks'][:3]:
                 st.info(f"• {check}")
     
-    with forensic_tabs:  # Recommendations tab
+    with forensic_tabs[3]:  # Recommendations tab
         st.write("**💡 Recommendations:**")
         for rec in results['recommendations']:
             st.write(f"• {rec}")
+    
+    with forensic_tabs[4]:  # Timings tab
+        if results.get('trace'):
+            display_trace(results['trace'])
+        else:
+            st.info("No timing data recorded for this analysis.")
 
-def analyze_image_comprehensive(image_file, check_manipulation, extract_metadata, reverse_search, text_extraction, depth):
-    """Comprehensive image analysis (simulated for now)"""
-    import random
-    
-    results = {
-        'manipulation_score': random.randint(15, 85),
-        'authenticity_score': random.randint(60, 95),
-        'metadata': {},
-        'text_content': "",
-        'reverse_search_results': [],
-        'technical_analysis': {}
-    }
-    
-    if extract_metadata:
-        results['metadata'] = {
-            'device': random.choice(['iPhone 12 Pro', 'Samsung Galaxy S21', 'Canon EOS R5', 'Unknown Device']),
-            'date_taken': f'2024-01-{random.randint(10, 20)} {random.randint(10, 18)}:{random.randint(10, 59)}:45',
-            'location': random.choice(['GPS coordinates available', 'Location data stripped', 'Unknown location']),
-            'software': random.choice(['Adobe Photoshop 2023 (Modified)', 'No editing software detected', 'GIMP (Modified)']),
-            'file_size': f'{random.uniform(1.0, 5.0):.1f} MB',
-            'dimensions': f'{random.randint(1000, 4000)} x {random.randint(1000, 3000)}',
-            'modifications_detected': random.choice([True, False])
-        }
+def display_url_investigation(result):
+    """Display URL investigation results"""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Credibility Score", f"{result.get('credibility_score', 0)}/100")
+    with col2:
+        st.metric("Source Reputation", result.get('source_reputation', 'Unknown'))
+    with col3:
+        st.metric("Cross References", result.get('cross_references', 0))
     
-    if text_extraction:
-        sample_texts = [
-            "Sample extracted text: 'Breaking News: Scientists discover...' [Confidence: 92%]",
-            "Text found: 'URGENT ALERT' [Confidence: 87%]",
-            "No readable text detected in image",
-            "Multiple text regions detected: Headlines, captions, watermarks"
-        ]
-        results['text_content'] = random.choice(sample_texts)
+    if result.get('matched_domain'):
+        st.caption(f"Host {result['host']} matched reputation entry {result['matched_domain']}")
+    
+    if result.get('warning_flags'):
+        st.warning("⚠️ Warning flags detected:")
+        for flag in result['warning_flags']:
+            st.write(f"• {flag}")
+    else:
+        st.success("✅ No warning flags detected")
+    
+    if 'error' in result:
+        st.error(f"❌ {result['error']}")
+        return
+    
+    st.markdown(f"### 📰 {result['title'] or result['final_url']}")
+    cache_notes = {'fresh': "served from cache", 'revalidated': "unchanged since last fetch (ETag)"}
+    st.caption(" · ".join(filter(None, [
+        result['final_url'],
+        cache_notes.get(result['cache']),
+        "text truncated for analysis" if result['truncated'] else None
+    ])))
+    
+    if result['cross_reference_articles']:
+        with st.expander(f"🔗 Coverage elsewhere ({result['cross_references']})"):
+            for article in result['cross_reference_articles'][:10]:
+                source = article.get('source', {}).get('name', 'Unknown')
+                st.write(f"• [{article.get('title', article['url'])}]({article['url']}) — {source}")
+    
+    display_forensic_results(result['analysis'])
+
+
+def display_trace(trace):
+    """Per-stage timing breakdown of a forensic analysis trace"""
+    st.write(f"**⏱️ Total time:** {trace['duration_ms'] / 1000:.2f}s")
+    st.plotly_chart(charts.trace_waterfall_figure(trace), use_container_width=True)
+
+def show_image_triage():
+    """Per-image progress of the session's image analysis while it runs; combined results once finished"""
+    entry = st.session_state.get('image_triage')
+    if entry is None:
+        return
+    
+    triage = entry['triage']
+    if not triage.finished:
+        poll_image_triage(triage)
+        return
+    
+    if triage.vision_error:
+        st.warning(f"⚠️ Google Cloud Vision unavailable ({triage.vision_error}) - showing local forensics only")
+    
+    analyzed = [result for result in triage.results if 'error' not in result]
+    for result in triage.results:
+        if 'error' in result:
+            st.error(f"❌ {result['name']}: {result['error']}")
+    if not analyzed:
+        return
+    
+    if entry['analysis_ids'] is None:
+        if not entry['extract_metadata']:
+            for result in analyzed:
+                result['metadata'] = {}
+        # Every image of the upload is saved in one write
+        entry['analysis_ids'] = firebase_service.save_image_analyses(
+            [(result['name'], result) for result in analyzed]
+        ) or []
+    
+    if len(analyzed) == 1:
+        display_image_results(analyzed[0])
+    else:
+        display_image_table(analyzed, entry['analysis_ids'])
+        selected = st.selectbox(
+            "🔎 Show details for", range(len(analyzed)), format_func=lambda index: analyzed[index]['name']
+        )
+        display_image_results(analyzed[selected])
     
-    return results
+    if entry['analysis_ids']:
+        st.success(f"✅ {len(entry['analysis_ids'])} image analyses completed and saved "
+                   f"in {triage.finished_at - triage.submitted_at:.1f}s")
+
+def image_triage_progress(triage):
+    """Overall progress bar and per-image status table of a running image analysis; reruns the page once it has finished"""
+    if triage.finished:
+        st.rerun()
+    
+    statuses = triage.statuses()
+    done = sum(status in ('Done', 'Failed') for status in statuses)
+    st.progress(triage.progress, text=f"🔍 Analyzed {done} of {len(statuses)} images...")
+    st.dataframe(
+        pd.DataFrame({'Image': triage.names, 'Status': statuses}),
+        hide_index=True, use_container_width=True
+    )
+    st.caption(f"Analysis {triage.id} · running in the background, you can leave this page and come back")
+
+poll_image_triage = st.fragment(run_every=Config.JOB_POLL_SECONDS)(image_triage_progress)
+
+def image_verdict(results):
+    return "AUTHENTIC" if results['authenticity_score'] > 70 else "SUSPICIOUS" if results['authenticity_score'] > 40 else "LIKELY_FAKE"
+
+def display_image_table(results, analysis_ids):
+    """Combined results of several images, riskiest first, with a CSV download"""
+    table = pd.DataFrame([
+        {
+            'Image': result['name'],
+            'Verdict': image_verdict(result),
+            'Manipulation Risk': result['manipulation_score'],
+            'Authenticity': result['authenticity_score'],
+            'Dimensions': result['metadata'].get('dimensions', ''),
+            'Editing Software': result['metadata'].get('software', '') if result['metadata'].get('modifications_detected') else '',
+            'ELA Ratio': result['technical_analysis'].get('ela_ratio'),
+            'Matching Pages': len(result['reverse_search_results']),
+            'Text': result['text_content'][:80],
+            'Duplicate Of': result.get('duplicate_of', ''),
+            'Analysis ID': analysis_id
+        }
+        for result, analysis_id in zip(results, analysis_ids or [''] * len(results))
+    ]).sort_values('Manipulation Risk', ascending=False)
+    
+    st.subheader(f"📋 Results for {len(results)} Images")
+    st.dataframe(
+        table, hide_index=True, use_container_width=True,
+        column_config={
+            'Manipulation Risk': st.column_config.ProgressColumn(min_value=0, max_value=100, format="%d"),
+            'Authenticity': st.column_config.ProgressColumn(min_value=0, max_value=100, format="%d")
+        }
+    )
+    st.download_button(
+        "📥 Download Results (CSV)", table.to_csv(index=False),
+        file_name="image_analysis.csv", mime="text/csv"
+    )
 
 def display_image_results(results):
     """Display comprehensive image analysis results"""
@@ -525,7 +487,7 @@ def display_image_results(results):
         """, unsafe_allow_html=True)
     
     with col3:
-        verdict = "AUTHENTIC" if results['authenticity_score'] > 70 else "SUSPICIOUS" if results['authenticity_score'] > 40 else "LIKELY_FAKE"
+        verdict = image_verdict(results)
         color = "#44ff44" if verdict == "AUTHENTIC" else "#ff8800" if verdict == "SUSPICIOUS" else "#ff4444"
         
         st.markdown(f"""
@@ -535,11 +497,32 @@ def display_image_results(results):
         </div>
         """, unsafe_allow_html=True)
     
+    if results.get('duplicate_of'):
+        st.info(f"ℹ️ Same picture as {results['duplicate_of']} in this upload")
+    
     # Show metadata if available
     if results['metadata']:
         st.subheader("📊 Image Metadata")
         for key, value in results['metadata'].items():
             st.write(f"**{key.replace('_', ' ').title()}:** {value}")
+    
+    if results['text_content']:
+        st.subheader("📝 Extracted Text")
+        st.text(results['text_content'])
+    
+    findings = results['technical_analysis'].get('findings')
+    if findings:
+        st.subheader("🔬 Forensic Findings")
+        for finding in findings:
+            st.write(f"• {finding}")
+    
+    if results['technical_analysis'].get('labels'):
+        st.write(f"**🏷️ Detected Content:** {', '.join(results['technical_analysis']['labels'])}")
+    
+    if results['reverse_search_results']:
+        st.subheader("🔄 Pages Using This Image")
+        for url in results['reverse_search_results']:
+            st.markdown(f"- [{url}]({url})")
 
 # This ensures Streamlit can call it directly
 if __name__ == "__main__":
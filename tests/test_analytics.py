@@ -0,0 +1,54 @@
+from streamlit.testing.v1 import AppTest
+
+from utils.aggregates import AnalysisAggregates
+
+
+def render_user_behavior():
+    # Runs as its own script, so it imports what it needs
+    from pages.analytics import user_behavior_analysis
+    from utils.database import FirebaseService
+
+    user_behavior_analysis(FirebaseService())
+
+
+def test_rollups_of_empty_store_count_every_user_type():
+    rollups = AnalysisAggregates().rollups()
+
+    assert rollups['total'] == 0
+    assert rollups['user_types'] == {
+        'public': {'count': 0, 'mean_risk': 0.0},
+        'authority': {'count': 0, 'mean_risk': 0.0}
+    }
+
+
+def test_rollups_count_user_types_not_seen_yet():
+    aggregates = AnalysisAggregates()
+    aggregates.add({'timestamp': '2025-01-06T10:00:00', 'risk_score': 80, 'threat_level': 'HIGH',
+                    'user_type': 'public'})
+
+    user_types = aggregates.rollups()['user_types']
+    assert user_types['public'] == {'count': 1, 'mean_risk': 80.0}
+    assert user_types['authority'] == {'count': 0, 'mean_risk': 0.0}
+
+
+def test_user_behavior_renders_for_empty_store():
+    at = AppTest.from_function(render_user_behavior, default_timeout=30)
+    at.run()
+
+    assert not at.exception
+    assert [metric.value for metric in at.metric] == ['0', '0', '0.0']
+
+
+def render_performance():
+    from pages.analytics import performance_metrics
+    from utils.database import FirebaseService
+
+    performance_metrics(FirebaseService())
+
+
+def test_performance_metrics_show_only_stored_figures():
+    at = AppTest.from_function(render_performance, default_timeout=30)
+    at.run()
+
+    assert not at.exception
+    assert [metric.label for metric in at.metric] == ["📥 Analyses Processed", "📅 Active Days", "🚨 High-Risk Rate"]
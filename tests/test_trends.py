@@ -0,0 +1,19 @@
+from utils.trends import TrendEngine, as_topics
+
+
+def test_terms_absent_from_previous_window_are_new():
+    engine = TrendEngine(window_seconds=3600, window_buckets=4)
+    for _ in range(2):
+        engine.add("vaccine microchip", 100.0)
+    for _ in range(61):
+        engine.add("election fraud", 3700.0)
+    for _ in range(2):
+        engine.add("vaccine microchip", 3700.0)
+
+    trends = {trend['term']: trend for trend in engine.top(now=3700.0)}
+    assert trends['election fraud']['growth'] is None
+    assert trends['vaccine microchip']['growth'] == 0
+
+    topics = {topic['topic']: topic['growth'] for topic in as_topics(engine.top(now=3700.0))}
+    assert topics['Election Fraud'] == "new"
+    assert topics['Vaccine Microchip'] == "+0%"
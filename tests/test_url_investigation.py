@@ -0,0 +1,67 @@
+from utils.url_investigation import CachedPage, PageCache, URLInvestigator
+
+PAGE_TEXT = "Officials hide vaccine scandal data from public health agencies. " * 5
+
+
+class StubNews:
+    def __init__(self):
+        self.down = False
+
+    def verify_article(self, url):
+        return {'url': url, 'credibility_score': 60}
+
+    def search_news(self, query, language='en', strict=False):
+        if self.down:
+            raise RuntimeError("No news provider answered")
+        return [{'url': f"https://other.example/{abs(hash(query))}", 'title': query}]
+
+
+class StubAnalyzer:
+    def __init__(self):
+        self.degraded_services = []
+        self.calls = 0
+
+    def analyze(self, text, *args, **kwargs):
+        self.calls += 1
+        return {'risk_score': 20, 'credibility_score': 80, 'manipulation_tactics': [],
+                'degraded_services': list(self.degraded_services)}
+
+
+class StubFetcher:
+    timeout = 1
+
+    def __init__(self):
+        self.cache = PageCache(8)
+        self.page = CachedPage('https://news.example/story', 'https://news.example/story', None, None,
+                               "Vaccine scandal revealed", PAGE_TEXT, False)
+
+    def fetch(self, url):
+        return self.page, 'fresh'
+
+
+def test_failed_searches_are_not_cached():
+    news, fetcher = StubNews(), StubFetcher()
+    investigator = URLInvestigator(news, StubAnalyzer(), fetcher)
+
+    news.down = True
+    assert investigator.investigate(fetcher.page.url)['cross_references'] == 0
+    assert fetcher.page.cross_references is None
+
+    news.down = False
+    result = investigator.investigate(fetcher.page.url)
+    assert result['cross_references'] > 0
+    assert fetcher.page.cross_references == result['cross_reference_articles']
+
+
+def test_degraded_analyses_are_not_cached():
+    analyzer, fetcher = StubAnalyzer(), StubFetcher()
+    investigator = URLInvestigator(StubNews(), analyzer, fetcher)
+
+    analyzer.degraded_services = ['Gemini']
+    assert investigator.investigate(fetcher.page.url)['analysis']['degraded_services'] == ['Gemini']
+    assert fetcher.page.analyses == {}
+
+    analyzer.degraded_services = []
+    assert investigator.investigate(fetcher.page.url)['analysis']['degraded_services'] == []
+    assert investigator.investigate(fetcher.page.url)['analysis']['degraded_services'] == []
+    assert analyzer.calls == 2
@@ -0,0 +1,108 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from utils.records import BASE_USER_TYPES, THREAT_LEVELS, RECORD_TYPES
+
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+RISK_BIN_LABELS = [f"{low}-{low + 9}" for low in range(0, 90, 10)] + ["90-100"]
+
+
+class AnalysisAggregates:
+    """Rollups over stored analyses, updated incrementally on every write"""
+
+    RISK_BINS = 10  # 0-9, 10-19, ... 90-100
+
+    def __init__(self):
+        self.total = 0
+        self.risk_sum = 0.0
+        self.threat_levels = Counter()
+        self.risk_histogram = [0] * self.RISK_BINS
+        self.daily_counts = Counter()
+        self.daily_high_risk = Counter()
+        self.hourly_counts = [0] * 24
+        self.weekday_hour = [[0] * 24 for _ in WEEKDAYS]
+        self.tactic_counts = Counter()
+        self.user_types = Counter()
+        self.user_type_risk = Counter()
+        self.content_types = Counter()
+        self.content_type_risk = Counter()
+        self.content_type_threats = Counter()  # (content type, threat level) pairs
+        self.verified_claims = 0
+
+    def add(self, record):
+        """Fold a single analysis record into the rollups"""
+        timestamp = datetime.fromisoformat(record['timestamp'])
+        day = record['timestamp'][:10]
+        risk_score = record.get('risk_score', 0)
+        threat_level = record.get('threat_level', 'LOW')
+
+        user_type = record.get('user_type', 'public')
+        content_type = record.get('type', 'text')
+
+        self.total += 1
+        self.risk_sum += risk_score
+        self.threat_levels[threat_level] += 1
+        self.risk_histogram[min(int(risk_score) // 10, self.RISK_BINS - 1)] += 1
+        self.daily_counts[day] += 1
+        if threat_level == 'HIGH':
+            self.daily_high_risk[day] += 1
+        self.hourly_counts[timestamp.hour] += 1
+        self.weekday_hour[timestamp.weekday()][timestamp.hour] += 1
+        self.user_types[user_type] += 1
+        self.user_type_risk[user_type] += risk_score
+        self.content_types[content_type] += 1
+        self.content_type_risk[content_type] += risk_score
+        self.content_type_threats[content_type, threat_level] += 1
+
+        for tactic in record.get('manipulation_tactics', []):
+            if tactic != 'None Detected':
+                self.tactic_counts[tactic] += 1
+
+        if record.get('credibility_score', 0) >= 70:
+            self.verified_claims += 1
+
+    def daily_series(self, days, now=None):
+        """Per-day counts for the last `days` days, oldest first"""
+        today = (now or datetime.now()).date()
+        dates = [today - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+        return [(date, self.daily_counts.get(date.isoformat(), 0)) for date in dates]
+
+    def first_day(self):
+        """Earliest day with any analyses"""
+        if not self.daily_counts:
+            return None
+        return datetime.fromisoformat(min(self.daily_counts)).date()
+
+    def rollups(self):
+        """Dashboard rollups in the Analytics page shape, read off the running counts"""
+        total = self.total
+        content_types = list(RECORD_TYPES) + [kind for kind in self.content_types if kind not in RECORD_TYPES]
+        user_types = list(BASE_USER_TYPES) + [user_type for user_type in self.user_types if user_type not in BASE_USER_TYPES]
+
+        return {
+            'total': total,
+            'mean_risk': self.risk_sum / total if total else 0.0,
+            'high_risk_rate': self.threat_levels['HIGH'] / total * 100 if total else 0.0,
+            'risk_histogram': dict(zip(RISK_BIN_LABELS, self.risk_histogram)),
+            'weekday_hour': np.array(self.weekday_hour),
+            'hourly': list(self.hourly_counts),
+            'active_days': len(self.daily_counts),
+            'tactic_frequency': dict(self.tactic_counts.most_common()),
+            'content_types': {
+                kind: {
+                    'count': self.content_types[kind],
+                    'mean_risk': self.content_type_risk[kind] / self.content_types[kind] if self.content_types[kind] else 0.0,
+                    'threat_levels': {level: self.content_type_threats[kind, level] for level in THREAT_LEVELS}
+                }
+                for kind in content_types
+            },
+            'user_types': {
+                user_type: {
+                    'count': self.user_types[user_type],
+                    'mean_risk': self.user_type_risk[user_type] / self.user_types[user_type] if self.user_types[user_type] else 0.0
+                }
+                for user_type in user_types
+            }
+        }
@@ -1,21 +1,36 @@
 import requests
 import streamlit as st
 from config import Config
+from utils.circuit_breaker import CircuitOpenError, get_breaker
+from utils.hedging import RequestHedger
+from utils.metrics import registry as metrics
+
+
+class GeminiAPIError(Exception):
+    """Gemini answered with an error status"""
+    
+    def __init__(self, status):
+        super().__init__(f"Gemini API returned HTTP {status}")
+        self.status = status
+
+
+# Shared by every session in the process, so hedge delays follow process-wide latency
+gemini_hedger = RequestHedger(
+    'gemini', Config.GEMINI_HEDGE_PERCENTILE, Config.GEMINI_HEDGE_BUDGET, Config.GEMINI_HEDGE_MIN_DELAY
+) if Config.GEMINI_HEDGE_ENABLED else None
+
 
 class GeminiService:
     """Enhanced Gemini AI service with specialized prompts"""
     
     def __init__(self):
         self.api_key = Config.GEMINI_API_KEY
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
+        self.base_url = Config.GEMINI_BASE_URL
+        self.breaker = get_breaker('gemini')
     
     def test_connection(self):
-        """Test if Gemini API is working"""
-        try:
-            response = self._make_request("Hello", model="gemini-1.5-flash")
-            return response is not None
-        except:
-            return False
+        """Whether Gemini is usable, from its circuit breaker (no live call)"""
+        return not self.breaker.is_open()
     
     def forensic_analysis(self, text, language="en"):
         """Specialized forensic analysis prompt"""
@@ -185,37 +200,54 @@ class GeminiService:
         return self._make_request(prompt, model="gemini-1.5-flash")
     
     def _make_request(self, prompt, model="gemini-1.5-flash"):
-        """Make request to Gemini API"""
+        """Make request to Gemini API (hedged when enabled)"""
         try:
-            url = f"{self.base_url}/{model}:generateContent"
-            headers = {
-                "Content-Type": "application/json",
-                "x-goog-api-key": self.api_key
-            }
+            if gemini_hedger is not None:
+                return gemini_hedger.call(model, self._generate, prompt, model)
+            return self._generate(prompt, model)
             
-            data = {
-                "contents": [{"parts": [{"text": prompt}]}],
-                "generationConfig": {
-                    "temperature": 0.1,
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": 2048
-                }
+        except CircuitOpenError:
+            return None  # degraded mode: callers fall back to local analysis
+        except GeminiAPIError as e:
+            st.error(f"Gemini API Error: {e.status}")
+            return None
+        except Exception as e:
+            st.error(f"Gemini API Exception: {str(e)}")
+            return None
+    
+    def _generate(self, prompt, model):
+        """One generateContent call; returns the generated text or raises GeminiAPIError"""
+        url = f"{self.base_url}/{model}:generateContent"
+        headers = {
+            "Content-Type": "application/json",
+            "x-goog-api-key": self.api_key
+        }
+        
+        data = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {
+                "temperature": 0.1,
+                "topK": 40,
+                "topP": 0.95,
+                "maxOutputTokens": 2048
             }
-            
+        }
+        
+        with self.breaker.protect() as outcome, metrics.track('gemini', model) as call:
             response = requests.post(url, headers=headers, json=data, timeout=30)
+            call.status = outcome.status = response.status_code
             
             if response.status_code == 200:
                 result = response.json()
-                # Correct path to access the generated text from Gemini API response
-                return result['candidates'][0]['content']['parts'][0]['text']
-            else:
-                st.error(f"Gemini API Error: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            st.error(f"Gemini API Exception: {str(e)}")
-            return None
+                usage = result.get('usageMetadata', {})
+                call.prompt_tokens = usage.get('promptTokenCount', 0)
+                call.completion_tokens = usage.get('candidatesTokenCount', 0)
+        
+        if response.status_code != 200:
+            raise GeminiAPIError(response.status_code)
+        
+        # Correct path to access the generated text from Gemini API response
+        return result['candidates'][0]['content']['parts'][0]['text']
 
 
 class FactCheckService:
@@ -223,15 +255,12 @@ class FactCheckService:
     
     def __init__(self):
         self.api_key = Config.GOOGLE_API_KEY
-        self.base_url = "https://factchecktools.googleapis.com/v1alpha1"
+        self.base_url = Config.FACTCHECK_BASE_URL
+        self.breaker = get_breaker('factcheck')
     
     def test_connection(self):
-        """Test fact check API"""
-        try:
-            result = self.search_claims("test")
-            return True
-        except:
-            return False
+        """Whether the Fact Check API is usable, from its circuit breaker (no live call)"""
+        return not self.breaker.is_open()
     
     def search_claims(self, query):
         """Search for fact-checked claims"""
@@ -243,7 +272,9 @@ class FactCheckService:
                 'languageCode': 'en'
             }
             
-            response = requests.get(url, params=params, timeout=15)
+            with self.breaker.protect() as outcome, metrics.track('factcheck', 'claims_search') as call:
+                response = requests.get(url, params=params, timeout=15)
+                call.status = outcome.status = response.status_code
             
             if response.status_code == 200:
                 data = response.json()
@@ -251,6 +282,8 @@ class FactCheckService:
             else:
                 return []
                 
+        except CircuitOpenError:
+            return []
         except Exception as e:
             st.warning(f"Fact check failed: {str(e)}")
             return []
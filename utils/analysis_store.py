@@ -0,0 +1,92 @@
+import json
+import os
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO store_meta (key, value) VALUES ('generation', 0);
+"""
+
+
+class SQLiteAnalysisStore:
+    """Append-only log of analysis records in a SQLite file shared by every app instance.
+
+    Each record gets an increasing sequence number, so a process keeping
+    its own copy of the analyses only reads the records appended since it
+    last looked. Clearing the store bumps its generation, which tells
+    every copy to start over.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def append(self, record):
+        """Append an analysis record (a JSON-serializable dict); returns its sequence number"""
+        cursor = self._connection().execute(
+            "INSERT INTO analyses (record) VALUES (?)", (json.dumps(record, default=str),)
+        )
+        return cursor.lastrowid
+
+    def append_many(self, records):
+        """Append several records in one transaction; returns the last sequence number"""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            seq = None
+            for record in records:
+                seq = connection.execute(
+                    "INSERT INTO analyses (record) VALUES (?)", (json.dumps(record, default=str),)
+                ).lastrowid
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return seq
+
+    def changes_since(self, seq):
+        """(generation, [(seq, record), ...]) for records appended after `seq`, read in one snapshot"""
+        connection = self._connection()
+        connection.execute("BEGIN")
+        try:
+            generation = connection.execute("SELECT value FROM store_meta WHERE key = 'generation'").fetchone()[0]
+            rows = connection.execute("SELECT seq, record FROM analyses WHERE seq > ? ORDER BY seq", (seq,)).fetchall()
+        finally:
+            connection.execute("COMMIT")
+        return generation, [(row_seq, json.loads(record)) for row_seq, record in rows]
+
+    def clear(self):
+        """Delete every record and start a new generation"""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM analyses")
+            connection.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'generation'")
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
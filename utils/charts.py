@@ -0,0 +1,252 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from utils.metrics import registry as metrics
+
+# Version for charts whose inputs never change during a session
+STATIC = 0
+
+FIGURE_CACHE_SIZE = 64
+
+
+def cached_figure(key, version, build):
+    """Return the figure cached under `key`, rebuilding it only when `version` changed.
+
+    `version` should be the data version of the chart inputs (for example
+    FirebaseService.get_data_version()); `build` is a zero-argument callable
+    that constructs the figure.
+    """
+    cache = st.session_state.setdefault('figure_cache', OrderedDict())
+
+    entry = cache.get(key)
+    if entry is not None and entry[0] == version:
+        metrics.record_cache('charts', 'figure', hit=True)
+        cache.move_to_end(key)
+        return entry[1]
+
+    metrics.record_cache('charts', 'figure', hit=False)
+    figure = build()
+    cache[key] = (version, figure)
+    cache.move_to_end(key)
+
+    # Keep the cache bounded, evicting the least recently used figures
+    while len(cache) > FIGURE_CACHE_SIZE:
+        cache.popitem(last=False)
+
+    return figure
+
+
+# ======================
+# Trend charts
+# ======================
+def volume_trend_figure():
+    """Content analysis volume over the last 30 days"""
+    dates = pd.date_range(start=datetime.now() - timedelta(days=30), end=datetime.now(), freq='D')
+    volume_data = pd.DataFrame({
+        'Date': dates,
+        'Total_Content': [100 + i*2 + (i%7)*10 for i in range(len(dates))],
+        'High_Risk': [20 + i*0.5 + (i%5)*3 for i in range(len(dates))],
+        'Verified': [60 + i*1.2 + (i%6)*5 for i in range(len(dates))]
+    })
+
+    fig = px.line(volume_data, x='Date', y=['Total_Content', 'High_Risk', 'Verified'],
+                 title="Content Analysis Volume Over Time")
+    fig.update_layout(height=400)
+    return fig
+
+
+def risk_pattern_heatmap_figure():
+    """Risk levels by day of week and week"""
+    risk_data = [[20, 35, 45, 25, 15, 30, 40],
+                [25, 40, 55, 30, 20, 35, 45],
+                [30, 45, 60, 35, 25, 40, 50],
+                [35, 50, 65, 40, 30, 45, 55]]
+
+    fig = go.Figure(data=go.Heatmap(
+        z=risk_data,
+        x=['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
+        y=['Week 1', 'Week 2', 'Week 3', 'Week 4'],
+        colorscale='Reds'
+    ))
+    fig.update_layout(title="Risk Levels by Day and Week", height=400)
+    return fig
+
+
+def topic_distribution_figure(trending):
+    """Pie chart of trending topic counts"""
+    topic_data = {topic['topic']: topic['count'] for topic in trending}
+
+    fig = px.pie(
+        values=list(topic_data.values()),
+        names=list(topic_data.keys()),
+        title="Distribution of Misinformation Topics"
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+def daily_volume_figure(daily_counts):
+    """Line chart of (date, count) pairs"""
+    df = pd.DataFrame(daily_counts, columns=['date', 'count'])
+
+    fig = px.line(df, x='date', y='count',
+                 title="Daily Analysis Volume",
+                 labels={'date': 'Date', 'count': 'Number of Analyses'})
+    fig.update_traces(line_color='#667eea', line_width=3)
+    return fig
+
+
+# ======================
+# Distribution charts
+# ======================
+def bar_figure(data, title, color_scale, orientation='v'):
+    """Colored bar chart of a label -> value mapping"""
+    labels = list(data.keys())
+    values = list(data.values())
+
+    if orientation == 'h':
+        return px.bar(x=values, y=labels, orientation='h', title=title,
+                      color=values, color_continuous_scale=color_scale)
+    return px.bar(x=labels, y=values, title=title,
+                  color=values, color_continuous_scale=color_scale)
+
+
+def pie_figure(data, title=None, hole=0, color_map=None):
+    """Pie or donut chart of a label -> value mapping"""
+    return px.pie(
+        values=list(data.values()),
+        names=list(data.keys()),
+        hole=hole,
+        title=title,
+        color_discrete_map=color_map
+    )
+
+
+def risk_histogram_figure(risk_scores):
+    """Histogram of risk scores with a mean marker"""
+    fig = px.histogram(
+        x=risk_scores,
+        nbins=20,
+        title="Distribution of Risk Scores",
+        labels={'x': 'Risk Score', 'y': 'Frequency'}
+    )
+    if len(risk_scores):
+        fig.add_vline(x=np.mean(risk_scores), line_dash="dash", line_color="red",
+                      annotation_text=f"Mean: {np.mean(risk_scores):.1f}")
+    return fig
+
+
+def hourly_heatmap_figure(hourly_activity, title="🕒 24-Hour Activity Heatmap"):
+    """Single-row heatmap of 24 hourly counts"""
+    fig = go.Figure(data=go.Heatmap(
+        z=[hourly_activity],
+        x=list(range(24)),
+        y=['Activity'],
+        colorscale='Reds',
+        showscale=True
+    ))
+    fig.update_layout(title=title, xaxis_title="Hour of Day", height=200)
+    return fig
+
+
+def weekday_hour_heatmap_figure(matrix, weekdays, title="Activity by Weekday and Hour"):
+    """7 x 24 heatmap of counts by weekday and hour of day"""
+    fig = go.Figure(data=go.Heatmap(
+        z=matrix,
+        x=list(range(24)),
+        y=weekdays,
+        colorscale='Reds'
+    ))
+    fig.update_layout(title=title, xaxis_title="Hour of Day", height=350)
+    return fig
+
+
+def binned_histogram_figure(bins, mean=None, title="Distribution of Risk Scores"):
+    """Bar chart of pre-binned counts (label -> count) with an optional mean annotation"""
+    fig = px.bar(x=list(bins.keys()), y=list(bins.values()), title=title,
+                 labels={'x': 'Risk Score', 'y': 'Frequency'})
+    fig.update_traces(marker_color='#667eea')
+    if mean is not None:
+        fig.add_annotation(text=f"Mean: {mean:.1f}", xref="paper", yref="paper",
+                           x=1, y=1, showarrow=False, font=dict(color="red"))
+    return fig
+
+
+def hourly_line_figure(hourly_activity, title="Hourly User Activity Pattern", y_label='Active Users'):
+    """Line chart of 24 hourly counts"""
+    fig = px.line(
+        x=list(range(24)),
+        y=hourly_activity,
+        title=title,
+        labels={'x': 'Hour of Day', 'y': y_label}
+    )
+    fig.update_traces(line_color='#667eea', line_width=3)
+    return fig
+
+
+def latency_percentiles_figure(rows, title="External Call Latency (ms)"):
+    """Grouped p50/p95/p99 bars per service operation from MetricsRegistry.summary() rows"""
+    df = pd.DataFrame([
+        {'Call': f"{row['service']}:{row['operation']}", 'Percentile': percentile,
+         'Latency_ms': row[percentile] * 1000}
+        for row in rows
+        for percentile in ('p50', 'p95', 'p99')
+    ])
+
+    fig = px.bar(df, x='Call', y='Latency_ms', color='Percentile', barmode='group',
+                 title=title, labels={'Latency_ms': 'Latency (ms)'})
+    fig.update_xaxes(tickangle=45)
+    return fig
+
+
+def trace_waterfall_figure(trace, title="Analysis Stage Timings"):
+    """Waterfall of trace spans (Trace.to_dict() shape), nested stages indented"""
+    spans = trace['spans']
+    depths = []
+    for span in spans:
+        depths.append(depths[span['parent']] + 1 if span['parent'] is not None else 0)
+
+    labels = [f"{'  ' * depth}{span['name']}" for span, depth in zip(spans, depths)]
+    fig = go.Figure(go.Bar(
+        y=labels,
+        x=[span['duration_ms'] for span in spans],
+        base=[span['start_ms'] for span in spans],
+        orientation='h',
+        marker_color=['#ff4444' if span['status'] == 'ERROR' else '#667eea' for span in spans],
+        hovertemplate="%{y}: %{x:.1f} ms<extra></extra>"
+    ))
+    fig.update_yaxes(autorange='reversed')
+    fig.update_layout(title=title, xaxis_title="Milliseconds since start",
+                      height=max(250, 30 * len(spans)))
+    return fig
+
+
+def scatter_figure(df, x, y, size, color, hover_name, title, color_scale):
+    """Bubble chart of a DataFrame"""
+    return px.scatter(df, x=x, y=y, size=size, color=color, hover_name=hover_name,
+                      title=title, color_continuous_scale=color_scale)
+
+
+# ======================
+# Gauges
+# ======================
+def gauge_figure(value, title, bar_color, height=250, reference=None,
+                 steps=((0, 50, "lightgray"), (50, 80, "yellow"), (80, 100, "red"))):
+    """0-100 gauge with colored bands and a threshold at 90"""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta" if reference is not None else "gauge+number",
+        value=value,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': title},
+        delta={'reference': reference} if reference is not None else None,
+        gauge={'axis': {'range': [None, 100]},
+               'bar': {'color': bar_color},
+               'steps': [{'range': [low, high], 'color': color} for low, high, color in steps],
+               'threshold': {'line': {'color': "red", 'width': 4},
+                             'thickness': 0.75, 'value': 90}}))
+    fig.update_layout(height=height)
+    return fig
@@ -0,0 +1,140 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from config import Config
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(Exception):
+    """A call was rejected without being sent because the service's circuit is open"""
+
+    def __init__(self, name, retry_in):
+        super().__init__(f"{name} is unavailable (circuit open, retrying in {retry_in:.0f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CallOutcome:
+    """Outcome of a protected call; set `status`, or `failed` directly, inside CircuitBreaker.protect()"""
+
+    __slots__ = ('status', 'failed')
+
+    def __init__(self):
+        self.status = None
+        self.failed = False
+
+
+class CircuitBreaker:
+    """Stops calling an upstream service that keeps failing.
+
+    After `failure_threshold` consecutive failures (exceptions, 5xx or 429
+    responses) the circuit opens and calls are rejected at once with
+    CircuitOpenError instead of waiting for a timeout. After
+    `recovery_timeout` seconds it turns half-open and lets
+    `half_open_probes` calls through: a success closes the circuit, a
+    failure opens it again for another `recovery_timeout`.
+    """
+
+    def __init__(self, name, failure_threshold=5, recovery_timeout=30.0, half_open_probes=1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_probes = half_open_probes
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.rejected = 0
+        self.opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def is_open(self):
+        """Whether calls are currently being rejected (open and not yet due for a probe)"""
+        return self.state == OPEN
+
+    def _acquire(self):
+        with self._lock:
+            if self._state == OPEN:
+                waited = time.monotonic() - self._opened_at
+                if waited < self.recovery_timeout:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, self.recovery_timeout - waited)
+                self._state = HALF_OPEN
+                self._probes = 0
+            if self._state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, 0)
+                self._probes += 1
+
+    def _release(self, failed):
+        with self._lock:
+            if not failed:
+                self._state = CLOSED
+                self._consecutive_failures = 0
+                return
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.opened += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    @contextmanager
+    def protect(self):
+        """Guard the enclosed call; raises CircuitOpenError up front when the circuit is open"""
+        self._acquire()
+        outcome = CallOutcome()
+        try:
+            yield outcome
+        except BaseException:
+            self._release(True)
+            raise
+        failed = outcome.failed or (outcome.status is not None and (outcome.status >= 500 or outcome.status == 429))
+        self._release(failed)
+
+    def to_dict(self):
+        state = self.state
+        with self._lock:
+            retry_in = self.recovery_timeout - (time.monotonic() - self._opened_at) if state == OPEN else 0.0
+            return {
+                'service': self.name,
+                'state': state,
+                'consecutive_failures': self._consecutive_failures,
+                'times_opened': self.opened,
+                'rejected_calls': self.rejected,
+                'retry_in_s': round(max(0.0, retry_in), 1)
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """Process-wide breaker for an upstream service, so every session sees the same circuit state"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(
+                name, Config.BREAKER_FAILURE_THRESHOLD, Config.BREAKER_RECOVERY_SECONDS, Config.BREAKER_HALF_OPEN_PROBES
+            )
+        return breaker
+
+
+def breaker_states():
+    """State row per breaker created so far"""
+    with _breakers_lock:
+        breakers = sorted(_breakers.values(), key=lambda breaker: breaker.name)
+    return [breaker.to_dict() for breaker in breakers]
@@ -1,26 +1,171 @@
 import streamlit as st
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+import threading
 import uuid
 import random
+from utils.aggregates import AnalysisAggregates
+from utils.analysis_store import SQLiteAnalysisStore
+from utils.records import AnalysisRecord, THREAT_CODES, to_micros, day_of
+from utils.trends import TrendEngine, as_topics
+from config import Config
+
+
+# Date range filter labels used by the Archive and Authority pages
+DATE_RANGE_DAYS = {
+    'Today': 0,
+    'Last Week': 7,
+    'Last Month': 30
+}
+
+
+def date_range_start(date_range, now=None):
+    """Translate a Date Range filter label into an inclusive start datetime"""
+    if date_range not in DATE_RANGE_DAYS:
+        return None  # "All Time" or unknown label - no lower bound
+    
+    now = now or datetime.now()
+    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return start - timedelta(days=DATE_RANGE_DAYS[date_range])
+
+def new_analysis_data(trend_width=2048, version=0):
+    """Empty analysis storage"""
+    return {
+        # Analyses partitioned by day number -> {'timestamps': array('q'), 'records': [AnalysisRecord]}
+        # kept sorted by epoch-microsecond timestamp so time-bounded queries are range scans
+        'partitions': {},
+        'partition_keys': [],
+        'users': [],
+        # Counters and rollups maintained on every write
+        'aggregates': AnalysisAggregates(),
+        # Bumped on every write so derived views (charts, rollups) know when to rebuild
+        'version': version,
+        # Topic counts of analysed content, updated on every write
+        'trends': TrendEngine(Config.TREND_WINDOW_HOURS * 3600, Config.TREND_BUCKETS, width=trend_width)
+    }
+
+def add_analysis(data, record):
+    """Compact a record and insert it into its day partition, keeping the partition time-ordered"""
+    compact = AnalysisRecord.from_dict(record)
+    day = day_of(compact.timestamp)
+    
+    partition = data['partitions'].get(day)
+    if partition is None:
+        partition = data['partitions'][day] = {'timestamps': array('q'), 'records': []}
+        insort(data['partition_keys'], day)
+    
+    timestamps = partition['timestamps']
+    if not timestamps or compact.timestamp >= timestamps[-1]:
+        # Common case: new analyses arrive in time order
+        timestamps.append(compact.timestamp)
+        partition['records'].append(compact)
+    else:
+        index = bisect_right(timestamps, compact.timestamp)
+        timestamps.insert(index, compact.timestamp)
+        partition['records'].insert(index, compact)
+    
+    data['aggregates'].add(record)
+    if record.get('type') != 'image':
+        timestamp = record['timestamp']
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        data['trends'].add(record.get('full_content') or record.get('content_preview', ''),
+                           timestamp.timestamp(), record.get('risk_score'))
+    data['version'] += 1
+
+def text_analysis_record(content, results, user_type='public'):
+    """Analysis record of a text analysis's results"""
+    return {
+        'id': str(uuid.uuid4())[:8],
+        'content_preview': content[:100] + "..." if len(content) > 100 else content,
+        'full_content': content,
+        'risk_score': results['risk_score'],
+        'credibility_score': results['credibility_score'],
+        'threat_level': 'HIGH' if results['risk_score'] > 70 else 'MEDIUM' if results['risk_score'] > 40 else 'LOW',
+        'manipulation_tactics': results['manipulation_tactics'],
+        'timestamp': datetime.now().isoformat(),
+        'user_type': user_type,
+        'trace': results.get('trace')
+    }
+
+class SharedAnalyses:
+    """This process's copy of the analyses in a SQLiteAnalysisStore shared by every app instance.
+    
+    Writes go to the store; reads first catch the copy up with the records
+    other instances appended since, so no instance holds analyses the
+    others cannot see. Hold `lock` while reading the copy.
+    """
+    
+    def __init__(self, store):
+        self.store = store
+        self.lock = threading.RLock()
+        self.data = new_analysis_data()
+        self._generation = None
+        self._seq = 0
+    
+    def sync(self):
+        """Apply records appended since the last sync and return the data (call with `lock` held)"""
+        generation, rows = self.store.changes_since(self._seq)
+        if generation != self._generation:
+            if self._generation is not None:
+                # The store was cleared; sequence numbers are never reused, so `rows` is all it holds now
+                self.data = new_analysis_data(version=self.data['version'] + 1)
+            self._generation = generation
+        for seq, record in rows:
+            add_analysis(self.data, record)
+            self._seq = seq
+        return self.data
+
+_shared_analyses = None
+_shared_analyses_lock = threading.Lock()
+
+def shared_analyses():
+    """Process-wide copy of the shared analysis store (STORE_BACKEND=sqlite)"""
+    global _shared_analyses
+    
+    with _shared_analyses_lock:
+        if _shared_analyses is None:
+            _shared_analyses = SharedAnalyses(SQLiteAnalysisStore(Config.ANALYSIS_DB_PATH))
+        return _shared_analyses
+
+def save_job_analysis(content, results, user_type='public'):
+    """Store a background job's analysis as the job finishes; returns its ID.
+    
+    Only the shared store can be written from a job thread or worker
+    process, so this returns None when analyses are kept per session
+    (the page stores those on its next run instead) or the write fails.
+    """
+    if Config.STORE_BACKEND != 'sqlite':
+        return None
+    try:
+        record = text_analysis_record(content, results, user_type)
+        shared_analyses().store.append(record)
+        return record['id']
+    except Exception as e:
+        print(f"Saving job analysis failed: {e}")
+        return None
 
 class FirebaseService:
     """Firebase database service simulation"""
     
     def __init__(self):
+        self.shared = shared_analyses() if Config.STORE_BACKEND == 'sqlite' else None
+        
         # Initialize session state for data storage
-        if 'firebase_data' not in st.session_state:
-            st.session_state.firebase_data = {
-                'analyses': [],
-                'users': [],
-                'statistics': {
-                    'analyzed_today': 1247,
-                    'flagged_content': 156,
-                    'verified_claims': 891,
-                    'accuracy_rate': 94.2
-                },
-                'trending_threats': [],
-                'analytics_data': {}
-            }
+        if self.shared is None and 'firebase_data' not in st.session_state:
+            # A session analyses little content, so a narrow trend sketch keeps counts exact enough
+            st.session_state.firebase_data = new_analysis_data(trend_width=512)
+    
+    @contextmanager
+    def _reading(self):
+        """This session's data, or the shared copy brought up to date and locked while in use"""
+        if self.shared is None:
+            yield st.session_state.firebase_data
+            return
+        with self.shared.lock:
+            yield self.shared.sync()
     
     def test_connection(self):
         """Test database connection"""
@@ -29,28 +174,11 @@ class FirebaseService:
     def save_analysis(self, content, results):
         """Save analysis results to database"""
         try:
-            analysis_id = str(uuid.uuid4())[:8]
-            
-            analysis_record = {
-                'id': analysis_id,
-                'content_preview': content[:100] + "..." if len(content) > 100 else content,
-                'full_content': content,
-                'risk_score': results['risk_score'],
-                'credibility_score': results['credibility_score'],
-                'threat_level': 'HIGH' if results['risk_score'] > 70 else 'MEDIUM' if results['risk_score'] > 40 else 'LOW',
-                'manipulation_tactics': results['manipulation_tactics'],
-                'timestamp': datetime.now().isoformat(),
-                'user_type': st.session_state.get('user_type', 'public')
-            }
-            
-            st.session_state.firebase_data['analyses'].append(analysis_record)
+            analysis_record = text_analysis_record(content, results, st.session_state.get('user_type', 'public'))
             
-            # Update statistics
-            st.session_state.firebase_data['statistics']['analyzed_today'] += 1
-            if results['risk_score'] > 70:
-                st.session_state.firebase_data['statistics']['flagged_content'] += 1
+            self._insert_analysis(analysis_record)
             
-            return analysis_id
+            return analysis_record['id']
             
         except Exception as e:
             st.error(f"Database error: {str(e)}")
@@ -59,87 +187,235 @@ class FirebaseService:
     def save_image_analysis(self, image_name, results):
         """Save image analysis results"""
         try:
-            analysis_id = str(uuid.uuid4())[:8]
+            analysis_record = self._image_record(image_name, results)
+            self._insert_analysis(analysis_record)
+            return analysis_record['id']
             
-            analysis_record = {
-                'id': analysis_id,
-                'content_preview': f"Image: {image_name}",
-                'type': 'image',
-                'risk_score': results['manipulation_score'],
-                'authenticity_score': results['authenticity_score'],
-                'threat_level': 'HIGH' if results['manipulation_score'] > 70 else 'MEDIUM' if results['manipulation_score'] > 40 else 'LOW',
-                'timestamp': datetime.now().isoformat(),
-                'user_type': st.session_state.get('user_type', 'public')
-            }
-            
-            st.session_state.firebase_data['analyses'].append(analysis_record)
-            return analysis_id
+        except Exception as e:
+            return None
+    
+    def save_image_analyses(self, images):
+        """Save the results of several images ((name, results) pairs) at once; returns their IDs in order"""
+        try:
+            records = [self._image_record(image_name, results) for image_name, results in images]
+            self._insert_analyses(records)
+            return [record['id'] for record in records]
             
         except Exception as e:
+            st.error(f"Database error: {str(e)}")
             return None
     
+    def _image_record(self, image_name, results):
+        """Analysis record of an image's results"""
+        return {
+            'id': str(uuid.uuid4())[:8],
+            'content_preview': f"Image: {image_name}",
+            'type': 'image',
+            'risk_score': results['manipulation_score'],
+            'authenticity_score': results['authenticity_score'],
+            'threat_level': 'HIGH' if results['manipulation_score'] > 70 else 'MEDIUM' if results['manipulation_score'] > 40 else 'LOW',
+            'timestamp': datetime.now().isoformat(),
+            'user_type': st.session_state.get('user_type', 'public')
+        }
+    
     def get_statistics(self):
         """Get system statistics"""
-        return st.session_state.firebase_data['statistics']
+        with self._reading() as data:
+            aggregates = data['aggregates']
+            
+            return {
+                'total_analyses': aggregates.total,
+                'analyzed_today': aggregates.daily_counts.get(datetime.now().date().isoformat(), 0),
+                'flagged_content': aggregates.threat_levels['HIGH'],
+                'verified_claims': aggregates.verified_claims,
+                'accuracy_rate': 94.2  # Offline evaluation figure, not derived from stored analyses
+            }
+    
+    def get_daily_counts(self, days=7):
+        """Get per-day analysis counts for the last `days` days, oldest first"""
+        with self._reading() as data:
+            return data['aggregates'].daily_series(days)
+    
+    def get_first_analysis_date(self):
+        """Get the date of the earliest stored analysis"""
+        with self._reading() as data:
+            return data['aggregates'].first_day()
     
     def get_recent_analyses(self, limit=10):
         """Get recent analyses"""
-        analyses = st.session_state.firebase_data['analyses']
-        
-        # Sort by timestamp (most recent first)
-        sorted_analyses = sorted(analyses, key=lambda x: x['timestamp'], reverse=True)
-        
-        return sorted_analyses[:limit]
-    
-    def get_trending_threats(self):
-        """Get trending threat topics"""
-        if not st.session_state.firebase_data['trending_threats']:
-            # Generate sample trending threats
-            st.session_state.firebase_data['trending_threats'] = [
-                {'topic': 'Health Misinformation', 'count': 234, 'growth': '+12%', 'risk': 'HIGH'},
-                {'topic': 'Election Fraud Claims', 'count': 189, 'growth': '+8%', 'risk': 'HIGH'},
-                {'topic': 'Climate Change Denial', 'count': 156, 'growth': '+5%', 'risk': 'MEDIUM'},
-                {'topic': 'Vaccine Misinformation', 'count': 123, 'growth': '+15%', 'risk': 'HIGH'},
-                {'topic': 'Economic Conspiracy', 'count': 98, 'growth': '+3%', 'risk': 'MEDIUM'},
-                {'topic': 'Social Media Rumors', 'count': 87, 'growth': '+7%', 'risk': 'LOW'},
-                {'topic': 'Celebrity Death Hoax', 'count': 65, 'growth': '+2%', 'risk': 'LOW'}
-            ]
+        return self.query_analyses(limit=limit)
+    
+    def query_analyses(self, start=None, end=None, threat_level=None, search=None, limit=None):
+        """Query analyses newest first, scanning only the day partitions inside [start, end]"""
+        results = []
+        
+        with self._reading() as data:
+            for record in self._scan_analyses(data, start, end, threat_level, search):
+                results.append(record.to_dict())
+                if limit and len(results) >= limit:
+                    break
+        
+        return results
+    
+    def page_analyses(self, start=None, end=None, threat_level=None, search=None, cursor=None, page_size=25):
+        """Get one page of analyses newest first.
+        
+        `cursor` is the value returned as `next_cursor` by the previous page
+        (None for the first page); `next_cursor` is None on the last page.
+        """
+        records = []
+        scan_end = end
+        skip_until = None
+        
+        if cursor:
+            cursor_timestamp, skip_until = cursor.split('|', 1)
+            cursor_timestamp = int(cursor_timestamp)
+            scan_end = cursor_timestamp
+            if end and to_micros(end) < scan_end:
+                scan_end = end
+                skip_until = None
+        
+        with self._reading() as data:
+            for record in self._scan_analyses(data, start, scan_end, threat_level, search):
+                if skip_until:
+                    # Records sharing the cursor timestamp may already have been served
+                    if record.timestamp == cursor_timestamp:
+                        if record.id == skip_until:
+                            skip_until = None
+                        continue
+                    skip_until = None
+                
+                if len(records) == page_size:
+                    return [r.to_dict() for r in records], f"{records[-1].timestamp}|{records[-1].id}"
+                records.append(record)
+        
+        return [r.to_dict() for r in records], None
+    
+    def iter_analyses(self, start=None, end=None, threat_level=None, search=None, chunk_size=500):
+        """Iterate over matching analyses in chunks, newest first"""
+        cursor = None
+        while True:
+            records, cursor = self.page_analyses(start, end, threat_level, search, cursor, chunk_size)
+            if records:
+                yield records
+            if cursor is None:
+                return
+    
+    def _scan_analyses(self, data, start=None, end=None, threat_level=None, search=None):
+        """Yield matching compact records newest first, visiting only partitions inside [start, end].
+        
+        `start` and `end` are datetimes or epoch-microsecond ints.
+        """
+        partitions = data['partitions']
+        keys = data['partition_keys']
+        
+        start_ts = to_micros(start) if isinstance(start, datetime) else start
+        end_ts = to_micros(end) if isinstance(end, datetime) else end
+        start_day = day_of(start_ts) if start_ts is not None else None
+        end_day = day_of(end_ts) if end_ts is not None else None
         
-        return st.session_state.firebase_data['trending_threats']
+        # Locate the first and last day partitions that overlap the range
+        lo = bisect_left(keys, start_day) if start_day is not None else 0
+        hi = bisect_right(keys, end_day) if end_day is not None else len(keys)
+        
+        threat = THREAT_CODES[threat_level] if threat_level else None
+        search = search.lower() if search else None
+        
+        for day in reversed(keys[lo:hi]):
+            partition = partitions[day]
+            timestamps = partition['timestamps']
+            
+            # Only the boundary partitions need trimming inside the day
+            first = bisect_left(timestamps, start_ts) if day == start_day else 0
+            last = bisect_right(timestamps, end_ts) if day == end_day else len(timestamps)
+            
+            records = partition['records']
+            for index in range(last - 1, first - 1, -1):
+                record = records[index]
+                if threat is not None and record.threat != threat:
+                    continue
+                if search and search not in record.content_preview.lower() and search not in record.id.lower():
+                    continue
+                
+                yield record
+    
+    def get_rollups(self):
+        """Get dashboard rollups from the aggregates kept up to date on every write"""
+        with self._reading() as data:
+            return data['aggregates'].rollups()
+    
+    def get_data_version(self):
+        """Get a counter that changes whenever stored analyses change"""
+        with self._reading() as data:
+            return data['version']
+    
+    def count_analyses(self, start=None, end=None, threat_level=None, search=None):
+        """Count stored analyses, or those matching the same filters as iter_analyses"""
+        with self._reading() as data:
+            if start is None and end is None and threat_level is None and search is None:
+                return sum(len(p['records']) for p in data['partitions'].values())
+            return sum(1 for _ in self._scan_analyses(data, start, end, threat_level, search))
+    
+    def clear_analyses(self):
+        """Remove all stored analyses"""
+        if self.shared is not None:
+            self.shared.store.clear()
+            return
+        
+        version = st.session_state.firebase_data['version']
+        st.session_state.firebase_data = new_analysis_data(trend_width=512, version=version + 1)
+    
+    def _insert_analysis(self, record):
+        """Store an analysis record; shared copies pick it up on their next read"""
+        if self.shared is not None:
+            self.shared.store.append(record)
+            return
+        
+        add_analysis(st.session_state.firebase_data, record)
+    
+    def _insert_analyses(self, records):
+        """Store several analysis records, in one write to the shared store"""
+        if self.shared is not None:
+            self.shared.store.append_many(records)
+            return
+        
+        for record in records:
+            add_analysis(st.session_state.firebase_data, record)
+    
+    def get_trending_threats(self, limit=7):
+        """Most mentioned topics in analysed content over the trend window, with growth and risk"""
+        # A session analyses few texts, so a single mention already counts there
+        min_count = 1 if self.shared is None else 2
+        with self._reading() as data:
+            trends = data['trends'].top(limit, min_count=min_count)
+        return as_topics(trends, with_risk=True)
     
     def get_analytics_data(self):
-        """Get analytics data for charts"""
-        if not st.session_state.firebase_data['analytics_data']:
-            # Generate sample analytics data
-            st.session_state.firebase_data['analytics_data'] = {
+        """Get analytics data for charts from the precomputed rollups"""
+        with self._reading() as data:
+            aggregates = data['aggregates']
+            
+            return {
                 'risk_distribution': {
-                    'High': 25,
-                    'Medium': 35, 
-                    'Low': 40
+                    'High': aggregates.threat_levels['HIGH'],
+                    'Medium': aggregates.threat_levels['MEDIUM'],
+                    'Low': aggregates.threat_levels['LOW']
                 },
-                'daily_counts': [120, 134, 156, 143, 167, 145, 189],
+                # Index 0 is today, index 6 is six days ago
+                'daily_counts': [count for _, count in reversed(aggregates.daily_series(7))],
                 'threat_sources': {
-                    'Social Media': 45,
-                    'News Sites': 25,
-                    'Messaging Apps': 15,
-                    'Forums': 10,
-                    'Other': 5
+                    'Text Content': aggregates.content_types['text'],
+                    'Images': aggregates.content_types['image']
                 },
-                'hourly_activity': [12, 8, 5, 3, 2, 4, 8, 15, 25, 35, 42, 48, 52, 55, 53, 48, 45, 42, 38, 32, 28, 22, 18, 15],
-                'top_tactics': [
-                    'Emotional Appeal',
-                    'False Urgency', 
-                    'Cherry Picking',
-                    'Appeal to Fear',
-                    'Bandwagon Effect'
-                ],
+                'hourly_activity': list(aggregates.hourly_counts),
+                'risk_histogram': list(aggregates.risk_histogram),
+                'top_tactics': [tactic for tactic, _ in aggregates.tactic_counts.most_common(5)],
+                'tactic_counts': dict(aggregates.tactic_counts.most_common(5)),
                 'user_types': {
-                    'Public': 78,
-                    'Authority': 22
+                    'Public': aggregates.user_types['public'],
+                    'Authority': aggregates.user_types['authority']
                 }
             }
-        
-        return st.session_state.firebase_data['analytics_data']
     
     def get_user_activity(self):
         """Get user activity logs"""
@@ -202,11 +478,8 @@ class FirebaseService:
             ]
             
             # Add demo data to session state
-            st.session_state.firebase_data['analyses'].extend(demo_analyses)
-            
-            # Update statistics
-            st.session_state.firebase_data['statistics']['analyzed_today'] += len(demo_analyses)
-            st.session_state.firebase_data['statistics']['flagged_content'] += 2  # High risk items
+            for record in demo_analyses:
+                self._insert_analysis(record)
             
             return True
             
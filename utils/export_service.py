@@ -0,0 +1,165 @@
+import csv
+import io
+import json
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Columns written when no projection is requested
+ANALYSIS_COLUMNS = [
+    'id', 'content_preview', 'risk_score', 'credibility_score', 'threat_level',
+    'manipulation_tactics', 'timestamp', 'user_type', 'type'
+]
+SECURITY_LOG_COLUMNS = ['timestamp', 'event_type', 'details', 'user_type', 'session_id']
+
+# Stored as float64 in Parquet; everything else is written as strings
+NUMERIC_COLUMNS = {'risk_score', 'credibility_score', 'authenticity_score'}
+
+EXPORT_FORMATS = {
+    'CSV': {'extension': 'csv', 'mime': 'text/csv'},
+    'JSONL': {'extension': 'jsonl', 'mime': 'application/x-ndjson'},
+    'Parquet': {'extension': 'parquet', 'mime': 'application/vnd.apache.parquet'}
+}
+
+
+class ExportService:
+    """Streaming export of analyses, security logs and investigation data.
+
+    Every export consumes an iterable of record chunks (lists of dicts) and
+    writes each chunk before pulling the next, so with export_to_file and
+    stream memory use is bounded by the chunk size rather than the size of
+    the export. export_to_bytes holds the whole export, as st.download_button
+    needs it.
+    """
+
+    def __init__(self, chunk_size=500):
+        self.chunk_size = chunk_size
+
+    def available_formats(self):
+        """Formats usable in this environment"""
+        return [fmt for fmt in EXPORT_FORMATS if fmt != 'Parquet' or PYARROW_AVAILABLE]
+
+    def analysis_chunks(self, firebase_service, **filters):
+        """Chunks of analyses straight from the store (start, end, threat_level, search)"""
+        return firebase_service.iter_analyses(chunk_size=self.chunk_size, **filters)
+
+    def security_log_chunks(self, security_service, event_type=None):
+        """Chunks of security log events, optionally filtered by event type"""
+        return security_service.iter_security_logs(chunk_size=self.chunk_size, event_type=event_type)
+
+    def record_chunks(self, records):
+        """Chunk an in-memory sequence or DataFrame of investigation records"""
+        if hasattr(records, 'to_dict'):
+            records = records.to_dict('records')
+
+        for offset in range(0, len(records), self.chunk_size):
+            yield records[offset:offset + self.chunk_size]
+
+    def export_to_file(self, chunks, fmt, destination, columns, progress_callback=None):
+        """Write chunks to a path or binary file object; returns the number of rows written"""
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+
+        if isinstance(destination, str):
+            with open(destination, 'wb') as output:
+                return self.export_to_file(chunks, fmt, output, columns, progress_callback)
+
+        if fmt == 'Parquet':
+            return self._write_parquet(chunks, destination, columns, progress_callback)
+
+        rows = 0
+        for data in self._encode_text(chunks, fmt, columns):
+            if isinstance(data, int):
+                rows = data
+                if progress_callback:
+                    progress_callback(rows)
+            else:
+                destination.write(data)
+
+        return rows
+
+    def export_to_bytes(self, chunks, fmt, columns, progress_callback=None):
+        """Export into one bytes payload for st.download_button, which keeps the whole file in memory"""
+        buffer = io.BytesIO()
+        self.export_to_file(chunks, fmt, buffer, columns, progress_callback)
+        return buffer.getvalue()
+
+    def stream(self, chunks, fmt, columns):
+        """Generator of encoded bytes for CSV or JSONL exports"""
+        if fmt == 'Parquet':
+            raise ValueError("Parquet exports must be written to a file")
+
+        for data in self._encode_text(chunks, fmt, columns):
+            if not isinstance(data, int):
+                yield data
+
+    def _encode_text(self, chunks, fmt, columns):
+        """Yield encoded bytes per chunk, interleaved with running row counts"""
+        rows = 0
+        buffer = io.StringIO()
+
+        if fmt == 'CSV':
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+        for chunk in chunks:
+            for record in chunk:
+                if fmt == 'CSV':
+                    writer.writerow([self._flatten(record.get(column)) for column in columns])
+                else:
+                    buffer.write(json.dumps({column: record.get(column) for column in columns}, default=str))
+                    buffer.write('\n')
+
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+            rows += len(chunk)
+            yield rows
+
+    def _write_parquet(self, chunks, destination, columns, progress_callback):
+        """Write one Parquet row group per chunk"""
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("Parquet export requires pyarrow")
+
+        schema = pa.schema([
+            (column, pa.float64() if column in NUMERIC_COLUMNS else pa.string())
+            for column in columns
+        ])
+        rows = 0
+
+        with pq.ParquetWriter(destination, schema, compression='zstd') as writer:
+            for chunk in chunks:
+                arrays = []
+                for field in schema:
+                    if field.name in NUMERIC_COLUMNS:
+                        values = [record.get(field.name) for record in chunk]
+                    else:
+                        values = [self._flatten(record.get(field.name)) for record in chunk]
+                    arrays.append(pa.array(values, type=field.type))
+
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+                rows += len(chunk)
+                if progress_callback:
+                    progress_callback(rows)
+
+        return rows
+
+    def _flatten(self, value):
+        """Render a field value as a flat string for tabular formats"""
+        if value is None:
+            return None
+        if isinstance(value, (list, tuple)):
+            return '; '.join(str(item) for item in value)
+        if isinstance(value, dict):
+            return json.dumps(value, default=str)
+        return str(value)
@@ -1,57 +1,201 @@
 import streamlit as st
 import requests
 import json
+import base64
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
+from utils.circuit_breaker import CircuitOpenError, get_breaker
+from utils.metrics import registry as metrics
+
+# images:annotate limits: images per call and size of the JSON request body
+VISION_MAX_IMAGES_PER_REQUEST = 16
+VISION_MAX_REQUEST_BYTES = 10 * 1024 * 1024
+
+# maxResults per Vision feature type
+VISION_FEATURE_RESULTS = {
+    'TEXT_DETECTION': 10,
+    'LABEL_DETECTION': 10,
+    'SAFE_SEARCH_DETECTION': 1,
+    'WEB_DETECTION': 10
+}
+
+# Vision features behind each Image Analysis option (metadata is read locally, not by Vision)
+IMAGE_OPTION_FEATURES = {
+    'check_manipulation': ['SAFE_SEARCH_DETECTION', 'LABEL_DETECTION'],
+    'reverse_search': ['WEB_DETECTION'],
+    'text_extraction': ['TEXT_DETECTION']
+}
+
+# Bytes of image base64-encoded per piece of a streamed request body (a multiple of 3, so pieces concatenate)
+ENCODE_CHUNK_BYTES = 3 * 64 * 1024
+
+def vision_features(check_manipulation=True, reverse_search=True, text_extraction=True):
+    """Vision feature types needed for the ticked Image Analysis options"""
+    ticked = {
+        'check_manipulation': check_manipulation,
+        'reverse_search': reverse_search,
+        'text_extraction': text_extraction
+    }
+    return [feature for option, features in IMAGE_OPTION_FEATURES.items() if ticked[option] for feature in features]
+
+def base64_length(size):
+    """Length of the base64 encoding of `size` bytes"""
+    return 4 * ((size + 2) // 3)
+
+class AnnotateRequestBody:
+    """images:annotate JSON body, produced piece by piece so images are base64-encoded one chunk at a time.
+    
+    Its length is known up front, so requests sends it with a Content-Length
+    instead of chunked encoding.
+    """
+    
+    PREFIX = b'{"requests": ['
+    SUFFIX = b']}'
+    SEPARATOR = b', '
+    IMAGE_START = b'{"image": {"content": "'
+    
+    def __init__(self, images, features):
+        self.images = images
+        self.features = features
+        self.image_end = self._image_end(features)
+    
+    @staticmethod
+    def _image_end(features):
+        return ('"}, "features": ' + json.dumps([
+            {"type": feature, "maxResults": VISION_FEATURE_RESULTS.get(feature, 10)} for feature in features
+        ]) + '}').encode('utf-8')
+    
+    @classmethod
+    def length(cls, image_sizes, features):
+        """Body length for images of the given sizes, without encoding them"""
+        per_image = len(cls.IMAGE_START) + len(cls._image_end(features))
+        return (len(cls.PREFIX) + len(cls.SUFFIX) + len(cls.SEPARATOR) * max(0, len(image_sizes) - 1)
+                + sum(per_image + base64_length(size) for size in image_sizes))
+    
+    def __len__(self):
+        return self.length([len(image) for image in self.images], self.features)
+    
+    def __iter__(self):
+        yield self.PREFIX
+        for index, image in enumerate(self.images):
+            if index:
+                yield self.SEPARATOR
+            yield self.IMAGE_START
+            for start in range(0, len(image), ENCODE_CHUNK_BYTES):
+                yield base64.b64encode(image[start:start + ENCODE_CHUNK_BYTES])
+            yield self.image_end
+        yield self.SUFFIX
+
+def pack_batches(image_sizes, features, max_images=VISION_MAX_IMAGES_PER_REQUEST, max_bytes=VISION_MAX_REQUEST_BYTES):
+    """Split image indexes into as few images:annotate calls as the limits allow, keeping upload order.
+    
+    Returns (batches, oversized): lists of indexes per call, and indexes of
+    images too large to send even on their own.
+    """
+    batches = []
+    oversized = []
+    batch, batch_sizes = [], []
+    
+    for index, size in enumerate(image_sizes):
+        if AnnotateRequestBody.length([size], features) > max_bytes:
+            oversized.append(index)
+            continue
+        if batch and (len(batch) == max_images or AnnotateRequestBody.length(batch_sizes + [size], features) > max_bytes):
+            batches.append(batch)
+            batch, batch_sizes = [], []
+        batch.append(index)
+        batch_sizes.append(size)
+    
+    if batch:
+        batches.append(batch)
+    return batches, oversized
 
 class GoogleCloudVisionService:
     """Google Cloud Vision API service for image analysis"""
     
-    def __init__(self):
+    # Features requested when the caller does not choose
+    DEFAULT_FEATURES = ['TEXT_DETECTION', 'LABEL_DETECTION', 'SAFE_SEARCH_DETECTION', 'WEB_DETECTION']
+    
+    def __init__(self, max_concurrent_batches=None):
         self.api_key = Config.GEMINI_API_KEY  # Using same key for now
-        self.base_url = "https://vision.googleapis.com/v1/images:annotate"
+        self.base_url = Config.VISION_BASE_URL
+        self.breaker = get_breaker('vision')
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrent_batches or Config.VISION_BATCH_WORKERS,
+                                        thread_name_prefix='vision-batch')
     
-    def analyze_image(self, image_data):
+    def analyze_image(self, image_data, features=None):
         """Analyze image using Google Cloud Vision API"""
+        response = self.analyze_images([image_data], features)[0]
+        if response is None or 'error' in response:
+            return None
+        return {'responses': [response]}
+    
+    def analyze_images(self, images, features=None, show_errors=True):
+        """Annotate many images with as few calls as the API limits allow, sending the calls concurrently.
+        
+        `images` are raw image bytes and `features` Vision feature types (see
+        vision_features). Returns one entry per image, in order: the image's
+        annotate response, which carries an 'error' key if Vision rejected
+        that image, or None if its call failed. Failed calls are reported on
+        the page unless `show_errors` is False (callers off the script thread).
+        """
+        features = features or self.DEFAULT_FEATURES
+        results = [None] * len(images)
+        if not images:
+            return results
+        
+        batches, oversized = pack_batches([len(image) for image in images], features)
+        for index in oversized:
+            results[index] = {'error': {'message': "Image too large for a Vision request"}}
+        
+        # Calls run off the script thread, so their errors are collected and shown here
+        if len(batches) == 1:
+            outcomes = [self._annotate([images[index] for index in batches[0]], features)]
+        else:
+            outcomes = list(self._pool.map(
+                lambda batch: self._annotate([images[index] for index in batch], features), batches
+            ))
+        
+        errors = []
+        for batch, (responses, error) in zip(batches, outcomes):
+            if error:
+                errors.append(error)
+                continue
+            for index, response in zip(batch, responses):
+                results[index] = response
+        
+        if errors and show_errors:
+            failed = f" ({len(errors)} of {len(batches)} requests)" if len(batches) > 1 else ""
+            if all(isinstance(error, CircuitOpenError) for error in errors):
+                st.warning(f"Google Cloud Vision skipped: {str(errors[0])}")
+            else:
+                st.error(f"{next(error for error in errors if not isinstance(error, CircuitOpenError))}{failed}")
+        return results
+    
+    def _annotate(self, images, features):
+        """One images:annotate call; returns (per-image responses, None) or (None, error message or CircuitOpenError)"""
         try:
-            import base64
-            
-            # Encode image to base64
-            image_base64 = base64.b64encode(image_data).decode('utf-8')
+            with self.breaker.protect() as outcome, metrics.track('vision', 'annotate') as call:
+                response = requests.post(
+                    f"{self.base_url}?key={self.api_key}",
+                    headers={'Content-Type': 'application/json'},
+                    data=AnnotateRequestBody(images, features),
+                    timeout=30
+                )
+                call.status = outcome.status = response.status_code
             
-            # Prepare request
-            request_data = {
-                "requests": [
-                    {
-                        "image": {
-                            "content": image_base64
-                        },
-                        "features": [
-                            {"type": "TEXT_DETECTION", "maxResults": 10},
-                            {"type": "LABEL_DETECTION", "maxResults": 10},
-                            {"type": "SAFE_SEARCH_DETECTION", "maxResults": 1},
-                            {"type": "WEB_DETECTION", "maxResults": 10}
-                        ]
-                    }
-                ]
-            }
+            if response.status_code != 200:
+                return None, f"Google Cloud Vision API Error: {response.status_code}"
             
-            # Make API call
-            response = requests.post(
-                f"{self.base_url}?key={self.api_key}",
-                headers={'Content-Type': 'application/json'},
-                data=json.dumps(request_data),
-                timeout=30
-            )
+            responses = response.json().get('responses', [])
+            if len(responses) != len(images):
+                return None, f"Google Cloud Vision API Error: {len(responses)} responses for {len(images)} images"
+            return responses, None
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                st.error(f"Google Cloud Vision API Error: {response.status_code}")
-                return None
-                
+        except CircuitOpenError as e:
+            return None, e
         except Exception as e:
-            st.error(f"Google Cloud Vision API Exception: {str(e)}")
-            return None
+            return None, f"Google Cloud Vision API Exception: {str(e)}"
 
 class GoogleCloudNaturalLanguageService:
     """Google Cloud Natural Language API service"""
@@ -59,6 +203,7 @@ class GoogleCloudNaturalLanguageService:
     def __init__(self):
         self.api_key = Config.GEMINI_API_KEY
         self.base_url = "https://language.googleapis.com/v1/documents:analyzeSentiment"
+        self.breaker = get_breaker('natural_language')
     
     def analyze_sentiment(self, text):
         """Analyze sentiment using Google Cloud Natural Language API"""
@@ -71,18 +216,22 @@ class GoogleCloudNaturalLanguageService:
                 "encodingType": "UTF8"
             }
             
-            response = requests.post(
-                f"{self.base_url}?key={self.api_key}",
-                headers={'Content-Type': 'application/json'},
-                data=json.dumps(request_data),
-                timeout=30
-            )
+            with self.breaker.protect() as outcome, metrics.track('natural_language', 'analyze_sentiment') as call:
+                response = requests.post(
+                    f"{self.base_url}?key={self.api_key}",
+                    headers={'Content-Type': 'application/json'},
+                    data=json.dumps(request_data),
+                    timeout=30
+                )
+                call.status = outcome.status = response.status_code
             
             if response.status_code == 200:
                 return response.json()
             else:
                 return None
                 
+        except CircuitOpenError:
+            return None
         except Exception as e:
             st.error(f"Google Cloud Natural Language API Exception: {str(e)}")
             return None
@@ -93,6 +242,7 @@ class GoogleCloudTranslateService:
     def __init__(self):
         self.api_key = Config.GEMINI_API_KEY
         self.base_url = "https://translation.googleapis.com/language/translate/v2"
+        self.breaker = get_breaker('translate')
     
     def translate_text(self, text, target_language='en'):
         """Translate text using Google Cloud Translate API"""
@@ -103,12 +253,14 @@ class GoogleCloudTranslateService:
                 "format": "text"
             }
             
-            response = requests.post(
-                f"{self.base_url}?key={self.api_key}",
-                headers={'Content-Type': 'application/json'},
-                data=json.dumps(request_data),
-                timeout=30
-            )
+            with self.breaker.protect() as outcome, metrics.track('translate', 'translate') as call:
+                response = requests.post(
+                    f"{self.base_url}?key={self.api_key}",
+                    headers={'Content-Type': 'application/json'},
+                    data=json.dumps(request_data),
+                    timeout=30
+                )
+                call.status = outcome.status = response.status_code
             
             if response.status_code == 200:
                 result = response.json()
@@ -116,6 +268,8 @@ class GoogleCloudTranslateService:
             else:
                 return text  # Return original if translation fails
                 
+        except CircuitOpenError:
+            return text
         except Exception as e:
             st.error(f"Google Cloud Translate API Exception: {str(e)}")
             return text
@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from utils.metrics import registry as metrics
+
+# Hedge tokens saved up at most, so a quiet period cannot fund a burst of hedges
+MAX_HEDGE_TOKENS = 5.0
+
+
+class RequestHedger:
+    """Sends a second copy of a slow request and returns whichever copy succeeds first.
+
+    The hedge is sent once a request has run longer than the `percentile`
+    latency of recent successful requests for the same operation (but never
+    sooner than `min_delay`), once at least `min_samples` latencies are
+    known. Hedges are limited by a budget: every request earns `budget`
+    hedge tokens and a hedge spends one, so at most that fraction of
+    requests is sent twice. The losing copy is left to finish in the
+    background. Hedges sent and won are recorded in the metrics registry.
+
+    Each primary copy runs on a thread of its own, so concurrent callers
+    never queue behind one another and the hedge delay counts only time
+    spent on the request. `max_workers` bounds the hedge copies alone; no
+    hedge is sent while that many are still running.
+    """
+
+    def __init__(self, service, percentile=0.95, budget=0.05, min_delay=1.0, window=200, min_samples=20,
+                 max_workers=8):
+        self.service = service
+        self.percentile = percentile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.window = window
+        self.min_samples = min_samples
+        self._latencies = {}
+        self._tokens = MAX_HEDGE_TOKENS
+        self._lock = threading.Lock()
+        self._hedge_slots = threading.BoundedSemaphore(max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'{service}-hedge')
+
+    def hedge_delay(self, operation):
+        """Seconds to wait before hedging `operation`, or None until enough latencies are known"""
+        with self._lock:
+            latencies = sorted(self._latencies.get(operation, ()))
+        if len(latencies) < self.min_samples:
+            return None
+        return max(self.min_delay, latencies[min(len(latencies) - 1, int(self.percentile * len(latencies)))])
+
+    def _timed(self, operation, function, args):
+        start = time.monotonic()
+        result = function(*args)
+        with self._lock:
+            latencies = self._latencies.get(operation)
+            if latencies is None:
+                latencies = self._latencies[operation] = deque(maxlen=self.window)
+            latencies.append(time.monotonic() - start)
+        return result
+
+    def _start_primary(self, operation, function, args):
+        future = Future()
+
+        def run():
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(self._timed(operation, function, args))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f'{self.service}-primary', daemon=True).start()
+        return future
+
+    def _spend_token(self):
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def call(self, operation, function, *args):
+        """Result of `function(*args)`, hedged if it is slow; raises the first error if every copy fails"""
+        with self._lock:
+            self._tokens = min(MAX_HEDGE_TOKENS, self._tokens + self.budget)
+
+        delay = self.hedge_delay(operation)
+        if delay is None:
+            return self._timed(operation, function, args)
+
+        primary = self._start_primary(operation, function, args)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._hedge_slots.acquire(blocking=False):
+            return primary.result()
+        if not self._spend_token():
+            self._hedge_slots.release()
+            return primary.result()
+
+        hedge = self._pool.submit(self._timed, operation, function, args)
+        hedge.add_done_callback(lambda future: self._hedge_slots.release())
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    metrics.record_hedge(self.service, operation, won=future is hedge)
+                    return future.result()
+                error = error or future.exception()
+
+        metrics.record_hedge(self.service, operation, won=False)
+        raise error
@@ -0,0 +1,370 @@
+import io
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import types
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from PIL import Image, ExifTags
+
+from config import Config
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.gif', '.bmp')
+
+# EXIF Software values that mean the file went through an editor
+EDITING_SOFTWARE = ('photoshop', 'gimp', 'lightroom', 'affinity', 'pixelmator', 'snapseed', 'picsart', 'facetune',
+                    'canva', 'paint.net')
+
+# Error level analysis: JPEG re-save quality and block size (Deep Forensics looks at finer blocks for smaller edits)
+ELA_QUALITY = 90
+ELA_BLOCK = 16
+ELA_DEEP_BLOCK = 8
+
+# Images whose perceptual hashes differ in at most this many of 64 bits are treated as the same picture
+DUPLICATE_MAX_DISTANCE = 6
+
+# Manipulation score for each Vision SafeSearch spoof likelihood
+SPOOF_MANIPULATION_SCORES = {
+    'VERY_UNLIKELY': 10,
+    'UNLIKELY': 25,
+    'POSSIBLE': 50,
+    'LIKELY': 75,
+    'VERY_LIKELY': 90
+}
+
+EXIF_IFD = 0x8769
+EXIF_TAGS = {name: tag for tag, name in ExifTags.TAGS.items()}
+
+
+def expand_uploads(files, max_images=200, max_bytes=10 * 1024 * 1024):
+    """(images, skipped) for uploaded files: images as (name, bytes), ZIP archives expanded in place.
+
+    `files` have `.name` and `.getvalue()` (Streamlit UploadedFile).
+    `skipped` lists (name, reason) for what was left out: unsupported or
+    oversized members, broken archives and anything past `max_images`.
+    """
+    images = []
+    skipped = []
+
+    def add(name, data):
+        if len(images) >= max_images:
+            skipped.append((name, f"over the {max_images} image limit"))
+        elif len(data) > max_bytes:
+            skipped.append((name, f"larger than {max_bytes // (1024 * 1024)} MB"))
+        else:
+            images.append((name, data))
+
+    for uploaded in files:
+        if not uploaded.name.lower().endswith('.zip'):
+            add(uploaded.name, uploaded.getvalue())
+            continue
+
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(uploaded.getvalue()))
+        except zipfile.BadZipFile:
+            skipped.append((uploaded.name, "not a valid ZIP archive"))
+            continue
+
+        with archive:
+            for member in archive.infolist():
+                base = os.path.basename(member.filename)
+                if member.is_dir() or member.filename.startswith('__MACOSX/') or base.startswith('.'):
+                    continue
+                name = f"{uploaded.name}/{member.filename}"
+                if not base.lower().endswith(IMAGE_EXTENSIONS):
+                    skipped.append((name, "not an image"))
+                elif member.file_size > max_bytes:
+                    skipped.append((name, f"larger than {max_bytes // (1024 * 1024)} MB"))
+                else:
+                    # Read one byte past the limit in case the declared size is wrong
+                    with archive.open(member) as member_file:
+                        add(name, member_file.read(max_bytes + 1))
+
+    return images, skipped
+
+
+def image_metadata(image, data):
+    """Camera, date, location and software from EXIF, in the Image Analysis metadata shape"""
+    exif = image.getexif()
+    details = exif.get_ifd(EXIF_IFD) if exif else {}
+
+    device = ' '.join(str(exif.get(EXIF_TAGS[tag], '')).strip() for tag in ('Make', 'Model')).strip()
+    software = str(exif.get(EXIF_TAGS['Software'], '')).strip()
+    taken = details.get(EXIF_TAGS['DateTimeOriginal']) or exif.get(EXIF_TAGS['DateTime'])
+
+    return {
+        'device': device or 'Unknown Device',
+        'date_taken': str(taken) if taken else 'Not recorded',
+        'location': 'GPS coordinates available' if EXIF_TAGS['GPSInfo'] in exif else 'No location data',
+        'software': software or 'No editing software recorded',
+        'file_size': f"{len(data) / (1024 * 1024):.1f} MB",
+        'dimensions': f"{image.width} x {image.height}",
+        'modifications_detected': any(editor in software.lower() for editor in EDITING_SOFTWARE)
+    }
+
+
+def error_level_ratio(image, block=ELA_BLOCK):
+    """How much the most inconsistent blocks stand out after a JPEG re-save (below about 3 for an untouched photo).
+
+    Regions pasted in or re-edited after the last save recompress
+    differently from the rest, so their mean error is well above the
+    median block's. Runs at full resolution: resizing would blur the JPEG
+    block grid the comparison relies on.
+    """
+    rgb = image.convert('RGB')
+    buffer = io.BytesIO()
+    rgb.save(buffer, 'JPEG', quality=ELA_QUALITY)
+    buffer.seek(0)
+    resaved = np.asarray(Image.open(buffer).convert('RGB'), dtype=np.int16)
+    error = np.abs(np.asarray(rgb, dtype=np.int16) - resaved).mean(axis=2)
+
+    rows, columns = error.shape[0] // block, error.shape[1] // block
+    if rows == 0 or columns == 0:
+        return 1.0
+    blocks = error[:rows * block, :columns * block].reshape(rows, block, columns, block).mean(axis=(1, 3))
+    return float(np.percentile(blocks, 99) / (np.median(blocks) + 1.0))
+
+
+def perceptual_hash(image):
+    """64-bit difference hash: brightness gradients of a 9x8 thumbnail, robust to rescaling and re-compression"""
+    pixels = np.asarray(image.convert('L').resize((9, 8), Image.LANCZOS), dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int(''.join('1' if bit else '0' for bit in bits), 2)
+
+
+def local_forensics(name, data, depth="Standard Analysis"):
+    """CPU-bound forensics of one image: metadata, error level analysis and perceptual hash.
+
+    Runs in a worker process. Quick Scan skips error level analysis; Deep
+    Forensics runs it on finer blocks. Returns a result dict, with an
+    'error' key if the file could not be decoded.
+    """
+    started = time.perf_counter()
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+    except Exception as e:
+        return {'name': name, 'error': f"Could not read image: {e}"}
+
+    metadata = image_metadata(image, data)
+    findings = []
+    manipulation = 20
+
+    if metadata['modifications_detected']:
+        manipulation += 35
+        findings.append(f"Saved by editing software ({metadata['software']})")
+
+    ela_ratio = None
+    if depth != "Quick Scan":
+        if image.format == 'JPEG':
+            ela_ratio = error_level_ratio(image, ELA_DEEP_BLOCK if depth == "Deep Forensics" else ELA_BLOCK)
+            # Untouched photos stay below about 3; spliced regions push the ratio well above
+            manipulation += int(min(40, max(0.0, ela_ratio - 3.0) * 8))
+            if ela_ratio > 5:
+                findings.append(f"Inconsistent compression levels (ELA ratio {ela_ratio:.1f})")
+        else:
+            findings.append(f"Error level analysis not applicable to {image.format or 'this'} images")
+
+    manipulation = min(100, manipulation)
+    authenticity = max(0, min(100, 100 - manipulation + (10 if metadata['device'] != 'Unknown Device' else 0)))
+
+    return {
+        'name': name,
+        'format': image.format,
+        'manipulation_score': manipulation,
+        'authenticity_score': authenticity,
+        'metadata': metadata,
+        'text_content': "",
+        'reverse_search_results': [],
+        'technical_analysis': {
+            'ela_ratio': round(ela_ratio, 2) if ela_ratio is not None else None,
+            'perceptual_hash': f"{perceptual_hash(image):016x}",
+            'findings': findings,
+            'analysis_ms': round((time.perf_counter() - started) * 1000, 1)
+        }
+    }
+
+
+def apply_vision_annotations(results, annotations):
+    """Add the Vision annotations of an image to its local forensic results"""
+    if 'textAnnotations' in annotations or 'fullTextAnnotation' in annotations:
+        texts = annotations.get('textAnnotations') or []
+        results['text_content'] = texts[0]['description'].strip() if texts else "No readable text detected in image"
+
+    web = annotations.get('webDetection')
+    if web is not None:
+        results['reverse_search_results'] = [
+            page['url'] for page in web.get('pagesWithMatchingImages', [])[:10] if page.get('url')
+        ]
+
+    spoof = (annotations.get('safeSearchAnnotation') or {}).get('spoof')
+    if spoof in SPOOF_MANIPULATION_SCORES:
+        # Either signal is enough to raise the risk
+        results['manipulation_score'] = max(results['manipulation_score'], SPOOF_MANIPULATION_SCORES[spoof])
+        results['authenticity_score'] = min(results['authenticity_score'], 100 - SPOOF_MANIPULATION_SCORES[spoof])
+
+    labels = annotations.get('labelAnnotations')
+    if labels:
+        results['technical_analysis']['labels'] = [label['description'] for label in labels]
+
+
+def mark_duplicates(results):
+    """Point each image that looks like an earlier one in the list at that image ('duplicate_of')"""
+    hashes = []
+    for result in results:
+        if 'error' in result:
+            continue
+        image_hash = int(result['technical_analysis']['perceptual_hash'], 16)
+        for name, earlier in hashes:
+            if bin(image_hash ^ earlier).count('1') <= DUPLICATE_MAX_DISTANCE:
+                result['duplicate_of'] = name
+                break
+        hashes.append((result['name'], image_hash))
+
+
+class ImageTriage:
+    """Forensics of a set of uploaded images, running in the background.
+
+    Local forensics run one image per task on the process pool while
+    Vision annotates every image in batched calls on a thread. Pages poll
+    `statuses()` and `progress`; `results` is complete once `finished`.
+    """
+
+    def __init__(self, images, depth, features, pool, vision=None, vision_pool=None):
+        """`pool` is a ForensicsPool; `vision_pool` a thread pool for the Vision call, needed with `vision`"""
+        self.id = uuid.uuid4().hex[:12]
+        self.names = [name for name, _ in images]
+        self.results = [None] * len(images)
+        self.vision_error = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._annotations = None
+        self._vision_pending = bool(vision and features)
+
+        self._futures = [pool.submit(name, data, depth) for name, data in images]
+        if self._vision_pending:
+            vision_pool.submit(self._annotate, vision, [data for _, data in images], features)
+        for index, future in enumerate(self._futures):
+            future.add_done_callback(lambda future, index=index: self._local_done(index, future))
+
+    @property
+    def finished(self):
+        return self.finished_at is not None
+
+    @property
+    def progress(self):
+        """Fraction of images whose local forensics are done"""
+        return sum(future.done() for future in self._futures) / len(self._futures) if self._futures else 1.0
+
+    def statuses(self):
+        """State of each image: Queued, Analyzing, Done or Failed"""
+        statuses = []
+        for index, future in enumerate(self._futures):
+            result = self.results[index]
+            if result is not None:
+                statuses.append('Failed' if 'error' in result else 'Done')
+            elif future.running():
+                statuses.append('Analyzing')
+            else:
+                statuses.append('Queued')
+        return statuses
+
+    def _local_done(self, index, future):
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {'name': self.names[index], 'error': f"Forensics failed: {e}"}
+        with self._lock:
+            self.results[index] = result
+            self._maybe_finish()
+
+    def _annotate(self, vision, images, features):
+        try:
+            annotations = vision.analyze_images(images, features, show_errors=False)
+        except Exception as e:
+            annotations = [None] * len(images)
+            self.vision_error = str(e)
+        with self._lock:
+            self._annotations = annotations
+            self._vision_pending = False
+            self._maybe_finish()
+
+    def _maybe_finish(self):
+        # Called with the lock held, by whichever of the local tasks and the Vision call ends last
+        if self._vision_pending or any(result is None for result in self.results):
+            return
+        annotations = self._annotations or []
+        for result, annotation in zip(self.results, annotations):
+            if 'error' not in result and annotation and 'error' not in annotation:
+                apply_vision_annotations(result, annotation)
+        if annotations and all(annotation is None for annotation in annotations):
+            self.vision_error = self.vision_error or "Google Cloud Vision did not answer"
+        mark_duplicates(self.results)
+        self.finished_at = time.time()
+
+
+class ForensicsPool:
+    """Worker processes running local_forensics.
+
+    Workers are spawned rather than forked so they do not inherit the
+    app's threads and held locks. A spawned worker re-runs the parent's
+    __main__ on start-up, and in a Streamlit process that is the page
+    script: __main__ is swapped for an empty module while tasks are
+    submitted, which is when the pool starts workers.
+    """
+
+    def __init__(self, processes):
+        self._executor = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'))
+        self._lock = threading.Lock()
+
+    def submit(self, name, data, depth):
+        """Future of local_forensics(name, data, depth); raises BrokenProcessPool once a worker has died"""
+        with self._lock:
+            main = sys.modules['__main__']
+            placeholder = sys.modules['__main__'] = types.ModuleType('__main__')
+            try:
+                return self._executor.submit(local_forensics, name, data, depth)
+            finally:
+                # Leave alone a __main__ installed meanwhile by a script run starting on another thread
+                if sys.modules.get('__main__') is placeholder:
+                    sys.modules['__main__'] = main
+
+
+_pools = None
+_pools_lock = threading.Lock()
+
+
+def triage_pools():
+    """(ForensicsPool, thread pool for Vision calls) of this process, created on first use"""
+    global _pools
+
+    with _pools_lock:
+        if _pools is None:
+            _pools = (
+                ForensicsPool(Config.IMAGE_FORENSICS_PROCESSES),
+                ThreadPoolExecutor(max_workers=2, thread_name_prefix='image-triage')
+            )
+        return _pools
+
+
+def start_image_triage(images, depth, features, vision=None):
+    """Start background forensics of `images` ((name, bytes) pairs); returns the ImageTriage"""
+    global _pools
+
+    process_pool, vision_pool = triage_pools()
+    try:
+        return ImageTriage(images, depth, features, process_pool, vision, vision_pool)
+    except BrokenProcessPool:
+        # A worker died (e.g. killed decoding a huge image) and took the pool with it: start a new one
+        with _pools_lock:
+            if _pools is not None and _pools[0] is process_pool:
+                _pools = None
+        process_pool, vision_pool = triage_pools()
+        return ImageTriage(images, depth, features, process_pool, vision, vision_pool)
@@ -0,0 +1,57 @@
+import threading
+
+from config import Config
+from utils.ai_services import GeminiService, FactCheckService
+from utils.database import save_job_analysis
+from utils.forensics import ForensicAnalyzer
+from utils.news_services import NewsAggregator
+from utils.security import SecurityService
+from utils.tracing import create_exporter
+from utils.url_investigation import PageFetcher, URLInvestigator, create_page_cache
+
+_services = None
+_services_lock = threading.Lock()
+
+
+def services():
+    """Forensic analyzer and URL investigator of this process, built on first use"""
+    global _services
+
+    with _services_lock:
+        if _services is None:
+            trace_exporter = create_exporter(Config.TRACE_EXPORTER, Config.TRACE_FILE)
+            forensic_analyzer = ForensicAnalyzer(GeminiService(), FactCheckService(), SecurityService(),
+                                                 trace_exporter)
+            page_fetcher = PageFetcher(create_page_cache(), Config.URL_FETCH_TIMEOUT,
+                                       Config.URL_FETCH_MAX_BYTES, Config.URL_CACHE_TTL,
+                                       Config.URL_FETCH_ALLOW_PRIVATE)
+            _services = {
+                'forensic_analyzer': forensic_analyzer,
+                'url_investigator': URLInvestigator(NewsAggregator(), forensic_analyzer, page_fetcher,
+                                                    Config.URL_FETCH_WORKERS, trace_exporter)
+            }
+        return _services
+
+
+# Results are stored as the job finishes, whether or not the page that submitted it is still open;
+# 'analysis_id' is None if the page has to store them itself (see save_job_analysis)
+
+def text_analysis(text, language, level, context, origin, safety, user_type='public', on_progress=None):
+    results = services()['forensic_analyzer'].analyze(text, language, level, context, origin, safety,
+                                                      on_progress=on_progress)
+    return dict(results, analysis_id=save_job_analysis(text, results, user_type))
+
+
+def url_investigation(url, level="Quick Scan", user_type='public', on_progress=None):
+    investigation = services()['url_investigator'].investigate(url, level=level, on_progress=on_progress)
+    analysis_id = None
+    if investigation.get('analysis'):
+        analysis_id = save_job_analysis(investigation['text'], investigation['analysis'], user_type)
+    return dict(investigation, analysis_id=analysis_id)
+
+
+# Job kinds; payloads are the keyword arguments, so they must be JSON-serializable for the queue backend
+JOB_HANDLERS = {
+    'text_analysis': text_analysis,
+    'url_investigation': url_investigation
+}
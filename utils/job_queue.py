@@ -0,0 +1,145 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, submitted_at);
+"""
+
+
+class SQLiteJobQueue:
+    """Durable job queue in a SQLite file, shared by UI processes and worker processes.
+
+    A worker claims the oldest queued job under a lease of `lease` seconds,
+    which progress reports extend. A job whose worker died (lease expired)
+    is handed out again, up to `max_attempts` claims, then marked failed.
+    Claims run in an IMMEDIATE transaction, so each job goes to exactly one
+    worker however many processes poll the file. Progress and outcomes are
+    only recorded for the worker holding the job's current lease, so a
+    worker whose lease expired cannot overwrite the job's next attempt.
+    """
+
+    def __init__(self, path, lease=120.0, max_attempts=3):
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def enqueue(self, kind, payload):
+        """Queue a job with a JSON-serializable payload; returns its ID"""
+        job_id = uuid.uuid4().hex[:12]
+        self._connection().execute(
+            "INSERT INTO jobs (id, kind, payload, status, stage, submitted_at) VALUES (?, ?, ?, 'queued', 'Queued', ?)",
+            (job_id, kind, json.dumps(payload), time.time())
+        )
+        return job_id
+
+    def claim(self, worker):
+        """Lease the oldest runnable job to `worker`; returns (id, kind, payload) or None"""
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Jobs of dead workers that used up their attempts fail instead of being retried forever
+            connection.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Worker stopped responding', finished_at = ? "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            row = connection.execute(
+                "SELECT id, kind, payload FROM jobs WHERE status = 'queued' "
+                "OR (status = 'running' AND lease_until < ?) ORDER BY submitted_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE jobs SET status = 'running', stage = 'Starting', worker = ?, lease_until = ?, "
+                    "attempts = attempts + 1, started_at = ? WHERE id = ?",
+                    (worker, now + self.lease, now, row['id'])
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return (row['id'], row['kind'], json.loads(row['payload'])) if row is not None else None
+
+    def report(self, job_id, worker, stage, progress):
+        """Record progress of a job leased to `worker` and extend its lease; returns whether the lease is still held"""
+        cursor = self._connection().execute(
+            "UPDATE jobs SET stage = ?, progress = MAX(progress, ?), lease_until = ? "
+            "WHERE id = ? AND status = 'running' AND worker = ?",
+            (stage, min(1.0, progress), time.time() + self.lease, job_id, worker)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id, worker, result):
+        """Record the result of a job leased to `worker`; returns False if its lease was lost"""
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = 'done', stage = 'Complete', progress = 1, result = ?, finished_at = ? "
+            "WHERE id = ? AND status = 'running' AND worker = ?",
+            (json.dumps(result, default=str), time.time(), job_id, worker)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id, worker, error):
+        """Record the failure of a job leased to `worker`; returns False if its lease was lost"""
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? "
+            "WHERE id = ? AND status = 'running' AND worker = ?",
+            (error, time.time(), job_id, worker)
+        )
+        return cursor.rowcount == 1
+
+    def get(self, job_id):
+        """The job's row as a dict (result decoded), or None if unknown"""
+        row = self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] is not None else None
+        return job
+
+    def counts(self):
+        """Number of jobs per status"""
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def prune(self, max_age):
+        """Delete jobs that finished more than `max_age` seconds ago; returns how many"""
+        cursor = self._connection().execute(
+            "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (time.time() - max_age,)
+        )
+        return cursor.rowcount
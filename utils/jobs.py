@@ -0,0 +1,157 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from utils.job_handlers import JOB_HANDLERS
+from utils.job_queue import SQLiteJobQueue
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class Job:
+    """State of one background job, updated by the worker thread and polled by pages"""
+
+    __slots__ = ('id', 'kind', 'status', 'stage', 'progress', 'result', 'error',
+                 'submitted_at', 'started_at', 'finished_at')
+
+    def __init__(self, kind):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.status = QUEUED
+        self.stage = 'Queued'
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @classmethod
+    def from_row(cls, row):
+        """Job from a SQLiteJobQueue row"""
+        job = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(job, name, row[name])
+        return job
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+    def report(self, stage, progress):
+        """Progress callback handed to the job function"""
+        self.stage = stage
+        self.progress = max(self.progress, min(1.0, progress))
+
+
+class JobManager:
+    """Runs jobs on a background thread pool so page scripts never block on network I/O.
+
+    A job runs the JOB_HANDLERS entry for its kind with the submitted
+    payload plus an `on_progress(stage, fraction)` keyword callback. Jobs
+    are kept by ID for `retention` seconds after they finish, so a page can
+    poll a job, be left and come back to its result.
+    """
+
+    def __init__(self, max_workers=4, retention=3600.0):
+        self.retention = retention
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-job')
+
+    def submit(self, kind, **payload):
+        """Start a job of `kind` with the handler's keyword arguments; returns the job ID"""
+        handler = JOB_HANDLERS[kind]
+        job = Job(kind)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job, handler, payload)
+        return job.id
+
+    def get(self, job_id):
+        """The Job with this ID, or None if it is unknown or expired"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, handler, payload):
+        job.status = RUNNING
+        job.stage = 'Starting'
+        job.started_at = time.time()
+        try:
+            job.result = handler(on_progress=job.report, **payload)
+        except Exception as e:
+            job.error = str(e)
+            job.finished_at = time.time()
+            job.status = FAILED
+        else:
+            job.progress = 1.0
+            job.stage = 'Complete'
+            job.finished_at = time.time()
+            job.status = DONE
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def counts(self):
+        """Number of jobs per status"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for job in jobs:
+            counts[job.status] += 1
+        return counts
+
+
+class QueueJobManager:
+    """JobManager interface over the durable SQLite queue, drained by job_worker.py processes.
+
+    Any number of UI replicas can submit to the same queue file and any
+    number of worker processes can drain it.
+    """
+
+    def __init__(self, queue, retention=3600.0):
+        self.queue = queue
+        self.retention = retention
+        self._pruned_at = 0.0
+
+    def submit(self, kind, **payload):
+        """Queue a job of `kind` with the handler's keyword arguments; returns the job ID"""
+        if kind not in JOB_HANDLERS:
+            raise KeyError(kind)
+        if time.monotonic() - self._pruned_at > 60:
+            self._pruned_at = time.monotonic()
+            self.queue.prune(self.retention)
+        return self.queue.enqueue(kind, payload)
+
+    def get(self, job_id):
+        """The Job with this ID, or None if it is unknown or expired"""
+        row = self.queue.get(job_id)
+        return Job.from_row(row) if row is not None else None
+
+    def counts(self):
+        """Number of jobs per status"""
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update(self.queue.counts())
+        return counts
+
+
+def create_job_manager():
+    """In-process thread pool, or the shared SQLite queue when JOB_BACKEND is "sqlite\""""
+    if Config.JOB_BACKEND == 'sqlite':
+        queue = SQLiteJobQueue(Config.JOB_DB_PATH, Config.JOB_LEASE_SECONDS, Config.JOB_MAX_ATTEMPTS)
+        return QueueJobManager(queue, Config.JOB_RETENTION_SECONDS)
+    return JobManager(Config.ANALYSIS_WORKERS, Config.JOB_RETENTION_SECONDS)
+
+
+# Shared by every session in the process
+analysis_jobs = create_job_manager()
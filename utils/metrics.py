@@ -0,0 +1,338 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_PREFIX = "truthlens"
+
+
+class SeriesStats:
+    """Counters for one (service, operation) series"""
+
+    __slots__ = (
+        'count', 'errors', 'latency_sum', 'buckets', 'status_codes', 'retries',
+        'prompt_tokens', 'completion_tokens', 'cache_hits', 'cache_misses', 'hedges', 'hedge_wins'
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.status_codes = {}
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def merge(self, other):
+        """Add another series' counters into this one"""
+        self.count += other.count
+        self.errors += other.errors
+        self.latency_sum += other.latency_sum
+        for index, value in enumerate(other.buckets):
+            self.buckets[index] += value
+        for status, value in list(other.status_codes.items()):
+            self.status_codes[status] = self.status_codes.get(status, 0) + value
+        self.retries += other.retries
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cache_hits += other.cache_hits
+        self.cache_misses += other.cache_misses
+        self.hedges += other.hedges
+        self.hedge_wins += other.hedge_wins
+
+    def percentile(self, quantile):
+        """Estimate a latency quantile (seconds) by interpolating within its bucket"""
+        if not self.count:
+            return 0.0
+
+        rank = quantile * self.count
+        seen = 0
+        lower = 0.0
+        for index, bucket_count in enumerate(self.buckets):
+            if index < len(LATENCY_BUCKETS):
+                upper = LATENCY_BUCKETS[index]
+            else:
+                # Overflow bucket has no upper bound; report its lower edge
+                return lower
+            if bucket_count and seen + bucket_count >= rank:
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+            lower = upper
+        return lower
+
+
+class CallTimer:
+    """Outcome details filled in by the caller inside MetricsRegistry.track()"""
+
+    __slots__ = ('status', 'error', 'retries', 'prompt_tokens', 'completion_tokens')
+
+    def __init__(self):
+        self.status = None
+        self.error = False
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+
+class MetricsRegistry:
+    """In-process registry of external call metrics.
+
+    Each thread writes only to its own shard, so recording never takes a
+    lock. Readers merge the shards into a snapshot; shards of finished
+    threads are folded into a retired total so the shard list stays small.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._shards_lock = threading.Lock()  # shard registration and compaction only
+
+    def _series(self, service, operation):
+        """This thread's counters for a series"""
+        shard = getattr(self._local, 'series', None)
+        if shard is None:
+            shard = self._local.series = {}
+            with self._shards_lock:
+                self._shards.append((threading.current_thread(), shard))
+
+        key = (service, operation)
+        stats = shard.get(key)
+        if stats is None:
+            stats = shard[key] = SeriesStats()
+        return stats
+
+    def observe(self, service, operation, latency, status=None, error=False, retries=0,
+                prompt_tokens=0, completion_tokens=0):
+        """Record one completed external call"""
+        stats = self._series(service, operation)
+
+        index = 0
+        while index < len(LATENCY_BUCKETS) and latency > LATENCY_BUCKETS[index]:
+            index += 1
+
+        stats.count += 1
+        stats.latency_sum += latency
+        stats.buckets[index] += 1
+        if error or (status is not None and status >= 400):
+            stats.errors += 1
+
+        status_label = str(status) if status is not None else 'error'
+        stats.status_codes[status_label] = stats.status_codes.get(status_label, 0) + 1
+        stats.retries += retries
+        stats.prompt_tokens += prompt_tokens
+        stats.completion_tokens += completion_tokens
+
+    def record_cache(self, service, operation, hit):
+        """Record a cache lookup"""
+        stats = self._series(service, operation)
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+
+    def record_hedge(self, service, operation, won):
+        """Record a hedged (duplicate) request and whether it beat the original"""
+        stats = self._series(service, operation)
+        stats.hedges += 1
+        if won:
+            stats.hedge_wins += 1
+
+    @contextmanager
+    def track(self, service, operation):
+        """Time the enclosed call; set status, retries and token counts on the yielded CallTimer"""
+        call = CallTimer()
+        start = time.perf_counter()
+        try:
+            yield call
+        except BaseException:
+            call.error = True
+            raise
+        finally:
+            self.observe(service, operation, time.perf_counter() - start, status=call.status,
+                         error=call.error, retries=call.retries,
+                         prompt_tokens=call.prompt_tokens, completion_tokens=call.completion_tokens)
+
+    def snapshot(self):
+        """Merged counters per (service, operation)"""
+        with self._shards_lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    self._merge_into(self._retired, shard)
+            self._shards = live
+            merged = {}
+            self._merge_into(merged, self._retired)
+
+        for thread, shard in live:
+            self._merge_into(merged, shard)
+        return merged
+
+    def _merge_into(self, target, shard):
+        for key, stats in list(shard.items()):
+            if key not in target:
+                target[key] = SeriesStats()
+            target[key].merge(stats)
+
+    def summary(self):
+        """One row per series with call counts, error rate and latency percentiles"""
+        return [
+            self._summary_row(service, operation, stats)
+            for (service, operation), stats in sorted(self.snapshot().items())
+        ]
+
+    def totals(self):
+        """Summary row merged across every external call series"""
+        total = SeriesStats()
+        for stats in self.snapshot().values():
+            if stats.count:
+                total.merge(stats)
+        return self._summary_row('all', 'all', total)
+
+    def _summary_row(self, service, operation, stats):
+        lookups = stats.cache_hits + stats.cache_misses
+        return {
+            'service': service,
+            'operation': operation,
+            'calls': stats.count,
+            'errors': stats.errors,
+            'error_rate': stats.errors / stats.count * 100 if stats.count else 0.0,
+            'mean': stats.latency_sum / stats.count if stats.count else 0.0,
+            'p50': stats.percentile(0.50),
+            'p95': stats.percentile(0.95),
+            'p99': stats.percentile(0.99),
+            'retries': stats.retries,
+            'prompt_tokens': stats.prompt_tokens,
+            'completion_tokens': stats.completion_tokens,
+            'cache_hits': stats.cache_hits,
+            'cache_hit_rate': stats.cache_hits / lookups * 100 if lookups else None,
+            'hedges': stats.hedges,
+            'hedge_wins': stats.hedge_wins,
+            'status_codes': dict(stats.status_codes)
+        }
+
+    def prometheus_text(self):
+        """Render all series in the Prometheus text exposition format"""
+        snapshot = sorted(self.snapshot().items())
+        duration = f"{METRIC_PREFIX}_external_call_duration_seconds"
+        lines = [
+            f"# HELP {duration} Latency of external API calls",
+            f"# TYPE {duration} histogram"
+        ]
+
+        for (service, operation), stats in snapshot:
+            if not stats.count:
+                continue
+            labels = f'service="{service}",operation="{operation}"'
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS + ('+Inf',), stats.buckets):
+                cumulative += bucket_count
+                lines.append(f'{duration}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{duration}_sum{{{labels}}} {stats.latency_sum}")
+            lines.append(f"{duration}_count{{{labels}}} {stats.count}")
+
+        # (name, help, applies to series, label/value pairs per series)
+        counters = [
+            ('external_call_responses_total', "External API responses by status code",
+             lambda stats: stats.count,
+             lambda stats: [(f'status="{status}"', value) for status, value in sorted(stats.status_codes.items())]),
+            ('external_call_errors_total', "Failed external API calls",
+             lambda stats: stats.count,
+             lambda stats: [(None, stats.errors)]),
+            ('external_call_retries_total', "Retried external API attempts",
+             lambda stats: stats.count,
+             lambda stats: [(None, stats.retries)]),
+            ('external_call_tokens_total', "Model tokens consumed",
+             lambda stats: stats.prompt_tokens or stats.completion_tokens,
+             lambda stats: [('kind="prompt"', stats.prompt_tokens), ('kind="completion"', stats.completion_tokens)]),
+            ('cache_requests_total', "Cache lookups by result",
+             lambda stats: stats.cache_hits or stats.cache_misses,
+             lambda stats: [('result="hit"', stats.cache_hits), ('result="miss"', stats.cache_misses)]),
+            ('external_call_hedges_total', "Hedged duplicate requests by whether they beat the original",
+             lambda stats: stats.hedges,
+             lambda stats: [('result="won"', stats.hedge_wins), ('result="lost"', stats.hedges - stats.hedge_wins)])
+        ]
+
+        for name, help_text, applies, values in counters:
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for (service, operation), stats in snapshot:
+                if not applies(stats):
+                    continue
+                for extra, value in values(stats):
+                    labels = f'service="{service}",operation="{operation}"'
+                    if extra:
+                        labels = f"{labels},{extra}"
+                    lines.append(f"{metric}{{{labels}}} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """Drop all recorded metrics"""
+        with self._shards_lock:
+            self._retired = {}
+            for thread, shard in self._shards:
+                shard.clear()
+
+
+# Shared by every session in the process
+registry = MetricsRegistry()
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the registry at /metrics for Prometheus scraping"""
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+
+        body = registry.prometheus_text().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+logger = logging.getLogger(__name__)
+
+_metrics_server = None
+_metrics_server_attempted = False
+_metrics_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=9464):
+    """Start the Prometheus endpoint in a background thread; tried once per process, None if it failed"""
+    global _metrics_server, _metrics_server_attempted
+
+    with _metrics_server_lock:
+        if _metrics_server_attempted:
+            return _metrics_server
+        _metrics_server_attempted = True
+
+        try:
+            _metrics_server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+        except OSError as e:
+            logger.error("Error starting metrics server on port %s: %s", port, e)
+            return None
+
+        server_thread = threading.Thread(target=_metrics_server.serve_forever, daemon=True)
+        server_thread.start()
+        logger.info("Metrics server running on http://0.0.0.0:%s/metrics", port)
+        return _metrics_server
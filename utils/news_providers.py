@@ -0,0 +1,313 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+from config import Config
+from utils.metrics import registry as metrics
+from utils.news_store import url_hash
+
+# Cool-down (seconds) after a rate limit, and the cap for failure backoff
+RATE_LIMIT_COOLDOWN = 60.0
+MAX_FAILURE_COOLDOWN = 300.0
+# Consecutive failures before a provider is backed off
+FAILURE_THRESHOLD = 3
+
+
+class ProviderError(Exception):
+    """A news provider answered with an error status"""
+
+    def __init__(self, provider, status):
+        super().__init__(f"{provider} returned HTTP {status}")
+        self.status = status
+
+
+class NoProviderAnswered(Exception):
+    """Every news provider failed or timed out"""
+
+
+class NewsAPIProvider:
+    """newsapi.org client returning articles in the common (NewsAPI) shape"""
+
+    name = 'newsapi'
+
+    def __init__(self, api_key, base_url, timeout=15):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def _get(self, operation, path, params):
+        params['apiKey'] = self.api_key
+        with metrics.track(self.name, operation) as call:
+            response = requests.get(f"{self.base_url}/{path}", params=params, timeout=self.timeout)
+            call.status = response.status_code
+        if response.status_code != 200:
+            raise ProviderError(self.name, response.status_code)
+        return [dict(article, provider=self.name) for article in response.json().get('articles', [])]
+
+    def top_headlines(self, country='us', category=None, page_size=10):
+        params = {'country': country, 'pageSize': page_size}
+        if category:
+            params['category'] = category
+        return self._get('top_headlines', 'top-headlines', params)
+
+    def search(self, query, language='en', page_size=10):
+        params = {'q': query, 'language': language, 'sortBy': 'relevancy', 'pageSize': page_size}
+        return self._get('everything', 'everything', params)
+
+
+class NewsDataProvider:
+    """newsdata.io client, normalized to the NewsAPI article shape"""
+
+    name = 'newsdata'
+
+    def __init__(self, api_key, base_url, timeout=15):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def _latest(self, operation, params, page_size):
+        params['apikey'] = self.api_key
+        params['size'] = page_size
+        with metrics.track(self.name, operation) as call:
+            response = requests.get(f"{self.base_url}/latest", params=params, timeout=self.timeout)
+            call.status = response.status_code
+        if response.status_code != 200:
+            raise ProviderError(self.name, response.status_code)
+        return [self._normalize(result) for result in response.json().get('results', [])][:page_size]
+
+    def _normalize(self, result):
+        pub_date = result.get('pubDate')
+        return {
+            'source': {'id': None, 'name': result.get('source_id')},
+            'title': result.get('title'),
+            'description': result.get('description'),
+            'url': result.get('link'),
+            # pubDate is UTC as "YYYY-MM-DD HH:MM:SS"
+            'publishedAt': f"{pub_date.replace(' ', 'T')}Z" if pub_date else None,
+            'provider': self.name
+        }
+
+    def top_headlines(self, country='us', category=None, page_size=10):
+        params = {'country': country, 'language': 'en'}
+        if category:
+            params['category'] = category
+        return self._latest('latest', params, page_size)
+
+    def search(self, query, language='en', page_size=10):
+        return self._latest('search', {'q': query, 'language': language}, page_size)
+
+
+class ProviderHealth:
+    """Rolling health of one provider: latency EWMA, failures and back-off"""
+
+    __slots__ = ('name', 'latency', 'successes', 'failures', 'consecutive_failures',
+                 'last_status', 'last_error', 'cooldown_until')
+
+    def __init__(self, name):
+        self.name = name
+        self.latency = None
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_status = None
+        self.last_error = None
+        self.cooldown_until = 0.0
+
+    def record_success(self, latency):
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.last_status = 200
+
+    def record_failure(self, error):
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_status = getattr(error, 'status', None)
+        self.last_error = str(error)
+        if self.last_status == 429:
+            self.cooldown_until = time.monotonic() + RATE_LIMIT_COOLDOWN
+        elif self.consecutive_failures >= FAILURE_THRESHOLD:
+            backoff = 15.0 * 2 ** (self.consecutive_failures - FAILURE_THRESHOLD)
+            self.cooldown_until = time.monotonic() + min(MAX_FAILURE_COOLDOWN, backoff)
+
+    def available(self, now):
+        return now >= self.cooldown_until
+
+    def rank(self, now, default_latency):
+        """Sort key: available providers first, then by expected latency"""
+        return (not self.available(now), (self.latency or default_latency) * (1 + self.consecutive_failures))
+
+    def to_dict(self):
+        remaining = self.cooldown_until - time.monotonic()
+        return {
+            'provider': self.name,
+            'status': 'cooling down' if remaining > 0 else 'degraded' if self.consecutive_failures else 'healthy',
+            'latency_ms': round(self.latency * 1000, 1) if self.latency is not None else None,
+            'successes': self.successes,
+            'failures': self.failures,
+            'last_status': self.last_status,
+            'last_error': self.last_error,
+            'cooldown_s': round(max(0.0, remaining), 1)
+        }
+
+
+class MultiProviderNewsClient:
+    """Queries several news providers concurrently and merges their articles.
+
+    `fan_out` sends a request to every available provider and merges the
+    results, deduplicated by URL hash; once one provider has answered, the
+    others get `grace` more seconds. `hedged` asks the fastest healthy
+    provider first and only starts the next one if no answer arrives within
+    `hedge_delay`, or as soon as a provider fails. Providers that are rate
+    limited or keep failing are backed off and tried last.
+    """
+
+    def __init__(self, providers, timeout=15.0, hedge_delay=0.6, grace=0.3, max_workers=8):
+        self.providers = list(providers)
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self.grace = grace
+        self._health = {provider.name: ProviderHealth(provider.name) for provider in self.providers}
+        self._health_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='news-provider')
+
+    def _call(self, provider, operation, args):
+        """Run one provider call, recording its health; returns (ok, articles_or_error)"""
+        start = time.monotonic()
+        try:
+            articles = getattr(provider, operation)(*args)
+        except Exception as e:
+            with self._health_lock:
+                self._health[provider.name].record_failure(e)
+            return False, e
+        with self._health_lock:
+            self._health[provider.name].record_success(time.monotonic() - start)
+        return True, articles
+
+    def _ranked(self):
+        now = time.monotonic()
+        with self._health_lock:
+            return sorted(self.providers, key=lambda provider: self._health[provider.name].rank(now, self.hedge_delay))
+
+    def fan_out(self, operation, *args):
+        """Merged, deduplicated articles from every provider that answers in time.
+
+        Raises NoProviderAnswered when none does.
+        """
+        ranked = self._ranked()
+        now = time.monotonic()
+        with self._health_lock:
+            providers = [provider for provider in ranked if self._health[provider.name].available(now)]
+        providers = providers or ranked  # all backed off: try them anyway
+
+        with metrics.track('news', operation) as call:
+            futures = {self._pool.submit(self._call, provider, operation, args): provider for provider in providers}
+            deadline = time.monotonic() + self.timeout
+            results = {}
+            pending = set(futures)
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    ok, articles = future.result()
+                    if ok:
+                        results[futures[future].name] = articles
+                        deadline = min(deadline, time.monotonic() + self.grace)
+            call.status = 200 if results else 503
+
+        if not results:
+            raise NoProviderAnswered(f"No news provider answered {operation}")
+        return self._merge(results[provider.name] for provider in providers if provider.name in results)
+
+    def hedged(self, operation, *args):
+        """Articles from the first provider to answer successfully, hedging slow ones.
+
+        Raises NoProviderAnswered when none does.
+        """
+        providers = self._ranked()
+        deadline = time.monotonic() + self.timeout
+
+        with metrics.track('news', operation) as call:
+            pending = set()
+            launched = 0
+            next_launch = time.monotonic()
+            while True:
+                now = time.monotonic()
+                if launched < len(providers) and now >= next_launch:
+                    pending.add(self._pool.submit(self._call, providers[launched], operation, args))
+                    launched += 1
+                    next_launch = now + self.hedge_delay
+                if not pending or now >= deadline:
+                    break
+
+                wake = deadline if launched == len(providers) else min(deadline, next_launch)
+                done, pending = wait(pending, timeout=max(0.0, wake - now), return_when=FIRST_COMPLETED)
+                for future in done:
+                    ok, articles = future.result()
+                    if ok:
+                        call.status = 200
+                        call.retries = launched - 1
+                        return self._merge([articles])
+                if done:
+                    next_launch = time.monotonic()  # a provider failed: hedge immediately
+
+            call.status = 503
+            call.retries = max(0, launched - 1)
+        raise NoProviderAnswered(f"No news provider answered {operation}")
+
+    def _merge(self, result_lists):
+        seen = set()
+        merged = []
+        for articles in result_lists:
+            for article in articles:
+                if not article.get('url') or not article.get('title'):
+                    continue
+                key = url_hash(article['url'])
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(article)
+        return merged
+
+    def top_headlines(self, country='us', category=None):
+        return self.fan_out('top_headlines', country, category)
+
+    def search(self, query, language='en', mode='fanout'):
+        if mode == 'hedged':
+            return self.hedged('search', query, language)
+        return self.fan_out('search', query, language)
+
+    def health(self):
+        """Health summary row per provider"""
+        with self._health_lock:
+            return [self._health[provider.name].to_dict() for provider in self.providers]
+
+
+_news_client = None
+_news_client_lock = threading.Lock()
+
+
+def get_news_client():
+    """Process-wide client over NewsAPI and NewsData, so provider health is shared by every session"""
+    global _news_client
+
+    with _news_client_lock:
+        if _news_client is None:
+            _news_client = create_news_client()
+        return _news_client
+
+
+def create_news_client():
+    """Client over NewsAPI and NewsData using the configured keys and base URLs"""
+    return MultiProviderNewsClient(
+        [
+            NewsAPIProvider(Config.NEWSAPI_KEY, Config.NEWSAPI_BASE_URL, Config.NEWS_REQUEST_TIMEOUT),
+            NewsDataProvider(Config.NEWSDATA_KEY, Config.NEWSDATA_BASE_URL, Config.NEWS_REQUEST_TIMEOUT)
+        ],
+        timeout=Config.NEWS_REQUEST_TIMEOUT,
+        hedge_delay=Config.NEWS_HEDGE_DELAY,
+        grace=Config.NEWS_FANOUT_GRACE
+    )
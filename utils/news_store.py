@@ -0,0 +1,264 @@
+import hashlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from config import Config
+from utils.trends import TrendEngine
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS headlines (
+    url_hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    source TEXT,
+    provider TEXT NOT NULL,
+    country TEXT,
+    category TEXT,
+    published_at TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS headlines_published ON headlines (published_at DESC);
+CREATE INDEX IF NOT EXISTS headlines_feed ON headlines (country, category, published_at DESC);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+ARTICLE_COLUMNS = "url, title, description, source, provider, published_at"
+
+
+def url_hash(url):
+    """Dedupe key for an article URL (scheme, host case and trailing slash ignored)"""
+    normalized = url.strip().split('://', 1)[-1]
+    host, _, path = normalized.partition('/')
+    normalized = f"{host.lower()}/{path.rstrip('/')}"
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+class HeadlineStore:
+    """SQLite table of ingested headlines, deduplicated by URL hash.
+
+    Each thread gets its own connection; WAL mode lets page renders read
+    while the ingestion worker writes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def add_articles(self, articles, country=None, category=None):
+        """Insert new articles and refresh ones already stored; returns the articles that were new"""
+        now = time.time()
+        rows = []
+        for article in articles:
+            url = article.get('url')
+            title = article.get('title')
+            if not url or not title or title == '[Removed]':
+                continue
+            rows.append((article, (
+                url_hash(url), url, title, article.get('description'),
+                (article.get('source') or {}).get('name'), article.get('provider', 'unknown'), country, category,
+                article.get('publishedAt'), now, now
+            )))
+
+        added = []
+        connection = self._connection()
+        with connection:
+            for article, row in rows:
+                cursor = connection.execute(
+                    "INSERT OR IGNORE INTO headlines (url_hash, url, title, description, source, provider, "
+                    "country, category, published_at, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    row
+                )
+                if cursor.rowcount:
+                    added.append(article)
+            connection.executemany(
+                "UPDATE headlines SET last_seen = ? WHERE url_hash = ?",
+                [(now, row[0]) for _, row in rows]
+            )
+        return added
+
+    def latest(self, limit=10, country=None, category=None):
+        """Most recently published headlines, in the NewsAPI article shape"""
+        query = f"SELECT {ARTICLE_COLUMNS} FROM headlines"
+        conditions, params = [], []
+        if country:
+            conditions.append("country = ?")
+            params.append(country)
+        if category:
+            conditions.append("category = ?")
+            params.append(category)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY published_at DESC LIMIT ?"
+        params.append(limit)
+
+        return [self._article(row) for row in self._connection().execute(query, params)]
+
+    def _article(self, row):
+        return {
+            'source': {'id': None, 'name': row['source']},
+            'title': row['title'],
+            'description': row['description'],
+            'url': row['url'],
+            'publishedAt': row['published_at'],
+            'provider': row['provider']
+        }
+
+    def titles_since(self, since):
+        """(title, first_seen) of headlines first stored after `since` (epoch seconds), oldest first"""
+        return self._connection().execute(
+            "SELECT title, first_seen FROM headlines WHERE first_seen > ? ORDER BY first_seen", (since,)
+        ).fetchall()
+
+    def count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM headlines").fetchone()[0]
+
+    def last_ingested_at(self):
+        """Time of the most recent ingestion as a datetime, or None if nothing was stored yet"""
+        last_seen = self._connection().execute("SELECT MAX(last_seen) FROM headlines").fetchone()[0]
+        return datetime.fromtimestamp(last_seen) if last_seen else None
+
+    def acquire_lease(self, name, owner, ttl):
+        """Take or renew the lease `name` for `ttl` seconds; False while another owner holds it"""
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+                (name, owner, now + ttl, now)
+            )
+        return cursor.rowcount == 1
+
+    def prune(self, max_age_days):
+        """Drop headlines not seen by any poll for `max_age_days`; returns how many"""
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute("DELETE FROM headlines WHERE last_seen < ?",
+                                        (time.time() - max_age_days * 86400,))
+        return cursor.rowcount
+
+
+class NewsIngestionWorker:
+    """Background thread that polls the news providers into a HeadlineStore on a fixed schedule.
+
+    Every app instance runs one, but only the holder of the store's
+    ingestion lease polls, so N instances do not spend N times the API
+    quota; the others take over once its lease lapses. Titles the store
+    gained since `trends_since` (epoch seconds) are counted by `trends`,
+    if given, whichever instance stored them.
+    """
+
+    LEASE_NAME = 'news-ingestion'
+
+    def __init__(self, news_aggregator, store, interval=300, country='us', categories=(None,), retention_days=7,
+                 trends=None, trends_since=None):
+        self.news_aggregator = news_aggregator
+        self.store = store
+        self.trends = trends
+        self.trends_since = trends_since if trends_since is not None else time.time()
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.interval = interval
+        self.country = country
+        self.categories = categories
+        self.retention_days = retention_days
+        self.last_run = None
+        self.last_added = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll_once(self):
+        """Fetch every feed once; returns the number of new headlines stored"""
+        added = 0
+        for category in self.categories:
+            articles = self.news_aggregator.fetch_headlines(self.country, category)
+            added += len(self.store.add_articles(articles, self.country, category))
+
+        self.store.prune(self.retention_days)
+        self.last_run = datetime.now()
+        self.last_added = added
+        return added
+
+    def refresh_trends(self):
+        """Count the titles stored since the last refresh"""
+        if self.trends is None:
+            return
+        for title, first_seen in self.store.titles_since(self.trends_since):
+            self.trends.add(title, first_seen)
+            self.trends_since = first_seen
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                # The lease outlives a missed poll, so a slow round does not hand ingestion over
+                if self.store.acquire_lease(self.LEASE_NAME, self.owner, 2 * self.interval):
+                    self.poll_once()
+                self.refresh_trends()
+            except Exception as e:
+                print(f"News ingestion failed: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start polling in a daemon thread; returns self"""
+        self._thread = threading.Thread(target=self._run, name='news-ingestion', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+def load_headline_trends(store, window_hours, buckets):
+    """(trend engine over headline titles warmed with the last two windows, first_seen of the last title counted)"""
+    trends = TrendEngine(window_hours * 3600, buckets, width=4096)
+    loaded_until = time.time() - 2 * window_hours * 3600
+    for title, first_seen in store.titles_since(loaded_until):
+        trends.add(title, first_seen)
+        loaded_until = first_seen
+    return trends, loaded_until
+
+
+# Shared by every session in the process
+headline_store = HeadlineStore(Config.NEWS_DB_PATH)
+headline_trends, _headline_trends_since = load_headline_trends(
+    headline_store, Config.NEWS_TREND_WINDOW_HOURS, Config.TREND_BUCKETS
+)
+
+_ingestion_worker = None
+_ingestion_worker_lock = threading.Lock()
+
+
+def start_news_ingestion(news_aggregator):
+    """Start the news ingestion worker (once per process; one instance at a time polls)"""
+    global _ingestion_worker
+
+    with _ingestion_worker_lock:
+        if _ingestion_worker is None:
+            _ingestion_worker = NewsIngestionWorker(
+                news_aggregator, headline_store, Config.NEWS_POLL_INTERVAL, Config.NEWS_COUNTRY,
+                Config.NEWS_CATEGORIES, Config.NEWS_RETENTION_DAYS, headline_trends, _headline_trends_since
+            ).start()
+        return _ingestion_worker
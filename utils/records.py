@@ -0,0 +1,177 @@
+from datetime import datetime, timedelta
+
+# Timestamps are stored as integer microseconds since the (naive, local) epoch,
+# so they round-trip exactly with the naive datetimes used everywhere else
+EPOCH = datetime(1970, 1, 1)
+DAY_MICROS = 86400 * 1000000
+
+THREAT_LEVELS = ('LOW', 'MEDIUM', 'HIGH')
+THREAT_CODES = {level: code for code, level in enumerate(THREAT_LEVELS)}
+
+RECORD_TYPES = ('text', 'image')
+RECORD_TYPE_CODES = {kind: code for code, kind in enumerate(RECORD_TYPES)}
+
+BASE_USER_TYPES = ('public', 'authority')
+
+PREVIEW_LENGTH = 100
+
+
+def to_micros(value):
+    """Convert a datetime or ISO timestamp string to epoch microseconds"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(micros):
+    """Convert epoch microseconds back to a naive datetime"""
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def day_of(micros):
+    """Day number (days since epoch) of an epoch-microsecond timestamp"""
+    return micros // DAY_MICROS
+
+
+class InternTable:
+    """Maps repeated strings (tactics, user types) to small integer ids"""
+
+    def __init__(self, values=()):
+        self.values = []
+        self.ids = {}
+        for value in values:
+            self.intern(value)
+
+    def intern(self, value):
+        """Get the id for a value, assigning a new one if unseen"""
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def lookup(self, value_id):
+        """Get the value for an id"""
+        return self.values[value_id]
+
+
+# Shared per process; ids only need to be stable for the lifetime of the cache
+TACTICS = InternTable(['None Detected'])
+USER_TYPES = InternTable(BASE_USER_TYPES)
+SPAN_NAMES = InternTable()
+
+
+def compact_trace(trace):
+    """Pack a Trace.to_dict() summary into tuples with interned span names and integer microseconds"""
+    if not trace:
+        return None
+    return (
+        trace['trace_id'],
+        SPAN_NAMES.intern(trace['name']),
+        round(trace['duration_ms'] * 1000),
+        tuple(
+            (SPAN_NAMES.intern(span['name']), span['parent'], round(span['start_ms'] * 1000),
+             round(span['duration_ms'] * 1000), span['status'] == 'OK')
+            for span in trace['spans']
+        )
+    )
+
+
+def expand_trace(packed):
+    """Inverse of compact_trace"""
+    trace_id, name, duration, spans = packed
+    return {
+        'trace_id': trace_id,
+        'name': SPAN_NAMES.lookup(name),
+        'duration_ms': duration / 1000,
+        'spans': [
+            {
+                'name': SPAN_NAMES.lookup(span_name),
+                'parent': parent,
+                'start_ms': start / 1000,
+                'duration_ms': span_duration / 1000,
+                'status': 'OK' if ok else 'ERROR'
+            }
+            for span_name, parent, start, span_duration, ok in spans
+        ]
+    }
+
+
+class AnalysisRecord:
+    """Compact in-process representation of a stored analysis.
+
+    Uses __slots__, an epoch-int timestamp, enum-coded threat level and record
+    type, and interned tactic/user-type ids. The content is kept once and the
+    preview is derived from it. Use to_dict() to materialize the dict shape the
+    pages expect.
+    """
+
+    __slots__ = (
+        'id', 'timestamp', 'content', 'risk_score', 'score', 'threat',
+        'tactics', 'user_type', 'kind', 'trace'
+    )
+
+    def __init__(self, id, timestamp, content, risk_score, score, threat, tactics, user_type, kind, trace=None):
+        self.id = id
+        self.timestamp = timestamp
+        self.content = content
+        self.risk_score = risk_score
+        self.score = score  # credibility_score for text, authenticity_score for images
+        self.threat = threat
+        self.tactics = tactics
+        self.user_type = user_type
+        self.kind = kind
+        self.trace = trace  # compact_trace() tuple of per-stage timings, if recorded
+
+    @classmethod
+    def from_dict(cls, record):
+        """Build a compact record from an analysis dict"""
+        kind = RECORD_TYPE_CODES[record.get('type', 'text')]
+        score_key = 'authenticity_score' if kind == RECORD_TYPE_CODES['image'] else 'credibility_score'
+
+        return cls(
+            id=record['id'],
+            timestamp=to_micros(record['timestamp']),
+            content=record.get('full_content') or record['content_preview'],
+            risk_score=record['risk_score'],
+            score=record.get(score_key),
+            threat=THREAT_CODES[record['threat_level']],
+            tactics=tuple(TACTICS.intern(tactic) for tactic in record.get('manipulation_tactics', ())),
+            user_type=USER_TYPES.intern(record.get('user_type', 'public')),
+            kind=kind,
+            trace=compact_trace(record.get('trace'))
+        )
+
+    @property
+    def threat_level(self):
+        return THREAT_LEVELS[self.threat]
+
+    @property
+    def content_preview(self):
+        if len(self.content) > PREVIEW_LENGTH:
+            return self.content[:PREVIEW_LENGTH] + "..."
+        return self.content
+
+    def to_dict(self):
+        """Materialize the dict shape returned by FirebaseService queries"""
+        record = {
+            'id': self.id,
+            'content_preview': self.content_preview,
+            'risk_score': self.risk_score,
+            'threat_level': self.threat_level,
+            'timestamp': from_micros(self.timestamp).isoformat(),
+            'user_type': USER_TYPES.lookup(self.user_type)
+        }
+
+        if RECORD_TYPES[self.kind] == 'image':
+            record['type'] = 'image'
+            record['authenticity_score'] = self.score
+        else:
+            record['full_content'] = self.content
+            record['credibility_score'] = self.score
+            record['manipulation_tactics'] = [TACTICS.lookup(tactic) for tactic in self.tactics]
+
+        if self.trace is not None:
+            record['trace'] = expand_trace(self.trace)
+
+        return record
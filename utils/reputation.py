@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from config import Config
+
+VERDICTS = ('allow', 'suspicious', 'block')
+
+# Verdicts that make a URL count as suspicious in text checks
+FLAGGED_VERDICTS = ('suspicious', 'block')
+
+
+def normalize_host(authority):
+    """Lowercase host name from a URL authority ("user@Host:port" -> "host")"""
+    host = authority.rpartition('@')[2]
+    if host.startswith('['):
+        return host[1:host.find(']')].lower()  # IPv6 literal
+    return host.partition(':')[0].rstrip('.').lower()
+
+
+def host_of(url):
+    """Host name of a URL, or '' when it has none"""
+    try:
+        return normalize_host(urlsplit(url.strip()).netloc)
+    except ValueError:
+        return ''
+
+
+class DomainReputation:
+    """Domain verdicts loaded from a local blocklist/allowlist file.
+
+    Each non-comment line of the file is "domain verdict [note]", where the
+    verdict is allow, suspicious or block. An entry covers the domain and
+    all of its subdomains, and the most specific entry wins, so a host is
+    resolved with one dict lookup per label suffix (a hashed suffix set)
+    rather than a scan of the list. The file is re-read when its mtime
+    changes, checked at most every `reload_interval` seconds.
+    """
+
+    def __init__(self, path, reload_interval=5.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._entries = {}
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()  # reloads only; lookups read the current dict
+        self.reload()
+
+    def reload(self):
+        """Re-read the file now; keeps the current entries if it cannot be read"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.path.getmtime(self.path)
+                with open(self.path, encoding='utf-8') as reputation_file:
+                    entries = self._parse(reputation_file)
+            except OSError as e:
+                if self._mtime is not None:
+                    print(f"Error reloading domain reputation file: {e}")
+                return False
+
+            self._entries = entries
+            self._mtime = mtime
+            return True
+
+    def _parse(self, lines):
+        entries = {}
+        for line_number, line in enumerate(lines, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            parts = line.split(None, 2)
+            if len(parts) < 2 or parts[1] not in VERDICTS:
+                print(f"Skipping invalid domain reputation entry on line {line_number}: {line}")
+                continue
+            entries[normalize_host(parts[0])] = (parts[1], parts[2] if len(parts) > 2 else '')
+        return entries
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.reload()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, host):
+        """(verdict, matched_domain, note) for a host, or None when no entry covers it"""
+        self._maybe_reload()
+        entries = self._entries
+        if not host or not entries:
+            return None
+
+        # Most specific suffix first: a.b.example.com, b.example.com, example.com, com
+        start = 0
+        while True:
+            entry = entries.get(host[start:])
+            if entry is not None:
+                return entry[0], host[start:], entry[1]
+            start = host.find('.', start) + 1
+            if not start:
+                return None
+
+    def check_url(self, url):
+        """Reputation of a URL's host as a dict with host, verdict, matched domain and note"""
+        host = host_of(url)
+        match = self.lookup(host)
+        if match is None:
+            return {'host': host, 'verdict': 'unknown', 'matched': None, 'note': ''}
+        verdict, matched, note = match
+        return {'host': host, 'verdict': verdict, 'matched': matched, 'note': note}
+
+    def is_flagged(self, host):
+        """Whether a host is on the blocklist or marked suspicious"""
+        match = self.lookup(host)
+        return match is not None and match[0] in FLAGGED_VERDICTS
+
+
+# Shared by every session in the process
+domain_reputation = DomainReputation(Config.DOMAIN_REPUTATION_FILE, Config.DOMAIN_REPUTATION_RELOAD_SECONDS)
@@ -4,6 +4,15 @@ import hmac
 import re
 from datetime import datetime
 from config import Config
+from utils.text_features import extract_features, extract_features_batch
+
+# Input scanning patterns, compiled once. None of them can backtrack
+# super-linearly: tags are only matched up to the last '>' in the text (so
+# every '<' scanned has a closing '>'), and event handlers are only tried
+# at word starts.
+INPUT_TAG_PATTERN = re.compile(r'<[^>]+>')
+EVENT_HANDLER_PATTERN = re.compile(r'\bon\w+\s*=')
+SCRIPT_OPEN_PATTERN = re.compile(r'<script\b')
 
 class SecurityService:
     """Security and authentication service"""
@@ -141,12 +150,21 @@ class SecurityService:
     
     def analyze_text_structure(self, content):
         """Analyze text structure for suspicious patterns"""
+        return self._structure_analysis(extract_features(content))
+    
+    def analyze_text_structure_batch(self, contents):
+        """Analyze the structure of several texts with one feature-extraction pass"""
+        return [self._structure_analysis(features) for features in extract_features_batch(contents)]
+    
+    def _structure_analysis(self, features):
+        """Structure flags and risk score from extracted text features"""
+        long_enough = features['length'] >= 10
         analysis = {
-            'excessive_caps': self._check_excessive_caps(content),
-            'excessive_punctuation': self._check_excessive_punctuation(content),
-            'suspicious_urls': self._check_suspicious_urls(content),
-            'emotional_language': self._check_emotional_language(content),
-            'readability_score': self._calculate_readability(content)
+            'excessive_caps': long_enough and features['caps_ratio'] > 0.3,  # More than 30% caps
+            'excessive_punctuation': features['punctuation_runs'] > 3,
+            'suspicious_urls': features['suspicious_url'],
+            'emotional_language': features['emotional_words'],
+            'readability_score': self._calculate_readability(features) if long_enough else 50
         }
         
         # Calculate overall structure score
@@ -163,61 +181,13 @@ class SecurityService:
         analysis['structure_risk_score'] = min(100, structure_score)
         return analysis
     
-    def _check_excessive_caps(self, content):
-        """Check for excessive capital letters"""
-        if len(content) < 10:
-            return False
-        caps_count = sum(1 for c in content if c.isupper())
-        caps_ratio = caps_count / len(content)
-        return caps_ratio > 0.3  # More than 30% caps
-    
-    def _check_excessive_punctuation(self, content):
-        """Check for excessive punctuation"""
-        punctuation_count = len(re.findall(r'[!?]{2,}', content))
-        return punctuation_count > 3
-    
-    def _check_suspicious_urls(self, content):
-        """Check for suspicious URLs"""
-        # Simple URL detection
-        urls = re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', content)
-        
-        suspicious_domains = [
-            'bit.ly', 'tinyurl.com', 'short.link', 'click.here',
-            'suspicious-news.com', 'fake-facts.org'
-        ]
-        
-        for url in urls:
-            for domain in suspicious_domains:
-                if domain in url:
-                    return True
-        return False
-    
-    def _check_emotional_language(self, content):
-        """Count emotional language usage"""
-        emotional_words = [
-            'shocking', 'outrageous', 'disgusting', 'terrifying', 'amazing',
-            'incredible', 'unbelievable', 'devastating', 'heartbreaking', 'infuriating'
-        ]
-        
-        content_lower = content.lower()
-        count = 0
-        for word in emotional_words:
-            count += content_lower.count(word)
-        
-        return count
-    
-    def _calculate_readability(self, content):
+    def _calculate_readability(self, features):
         """Simple readability score (0-100, higher is more readable)"""
-        if len(content) < 10:
-            return 50
-        
-        sentences = len(re.findall(r'[.!?]+', content))
-        words = len(content.split())
-        
+        sentences = features['sentence_count']
         if sentences == 0:
             return 30  # No proper sentence structure
         
-        avg_words_per_sentence = words / sentences
+        avg_words_per_sentence = features['word_count'] / sentences
         
         # Simple readability metric
         if avg_words_per_sentence > 25:
@@ -256,6 +226,17 @@ class SecurityService:
             return []
         return list(reversed(st.session_state.security_logs[-limit:]))
     
+    def iter_security_logs(self, chunk_size=500, event_type=None):
+        """Iterate over all security logs in chunks, oldest first"""
+        logs = st.session_state.get('security_logs', [])
+        
+        for offset in range(0, len(logs), chunk_size):
+            chunk = logs[offset:offset + chunk_size]
+            if event_type:
+                chunk = [log for log in chunk if log['event_type'] == event_type]
+            if chunk:
+                yield chunk
+    
     def validate_input(self, text, max_length=10000):
         """Validate user input"""
         if not text or not text.strip():
@@ -264,16 +245,8 @@ class SecurityService:
         if len(text) > max_length:
             return False, f"Input too long. Maximum {max_length} characters allowed"
         
-        # Check for potentially malicious patterns
-        malicious_patterns = [
-            r'<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>',  # Script tags
-            r'javascript:',  # JavaScript URLs
-            r'on\w+\s*=',  # Event handlers
-        ]
-        
-        for pattern in malicious_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return False, "Input contains potentially malicious content"
+        if self._is_malicious(text):
+            return False, "Input contains potentially malicious content"
         
         return True, "Valid input"
     
@@ -282,13 +255,37 @@ class SecurityService:
         if not text:
             return ""
         
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        # Remove HTML tags; a tag can only end at or before the last '>'
+        tag_limit = text.rfind('>') + 1
+        text = INPUT_TAG_PATTERN.sub('', text[:tag_limit]) + text[tag_limit:]
         
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        return ' '.join(text.split())
+    
+    def scan_input(self, text, max_length=10000):
+        """Validate and sanitize user input; returns (is_valid, message, sanitized_text).
+        
+        Runs validate_input and then sanitize_input: two linear passes,
+        each a few C-level str/regex scans, not a single pass over the text.
+        """
+        is_valid, message = self.validate_input(text, max_length)
+        return is_valid, message, self.sanitize_input(text) if is_valid else None
+    
+    def _is_malicious(self, text):
+        """Check for a closed <script> block, javascript: URLs or inline event handlers.
+        
+        Each check is a single linear scan over the lowercased text.
+        """
+        lowered = text.lower()
+        
+        script_open = SCRIPT_OPEN_PATTERN.search(lowered)
+        if script_open is not None and lowered.find('</script>', script_open.end()) != -1:
+            return True
+        
+        if 'javascript:' in lowered:
+            return True
         
-        return text
+        return '=' in lowered and EVENT_HANDLER_PATTERN.search(lowered) is not None
     
     def test_connection(self):
         """Test security service"""
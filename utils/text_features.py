@@ -0,0 +1,131 @@
+import re
+import numpy as np
+from utils.reputation import domain_reputation, normalize_host
+
+EMOTIONAL_WORDS = (
+    'shocking', 'outrageous', 'disgusting', 'terrifying', 'amazing',
+    'incredible', 'unbelievable', 'devastating', 'heartbreaking', 'infuriating'
+)
+
+# Authority (host, optional user info and port) of each http(s) URL in a text;
+# the lookahead lets a URL glued onto the end of another still be found
+URL_AUTHORITY_PATTERN = re.compile(r'http(?=s?://([^\s/?#\\<>"\']+))')
+
+# Texts are joined with this separator for batch extraction; it is whitespace,
+# so it ends any run or word without adding a character of its own kind
+SEPARATOR = '\n'
+
+# Per-character class bits
+UPPER = 1
+SPACE = 2
+SENTENCE_END = 4  # . ! ?
+EMPHASIS = 8  # ! ?
+
+LATIN1 = 256
+
+
+def _char_flags(char):
+    return ((UPPER if char.isupper() else 0) | (SPACE if char.isspace() else 0) |
+            (SENTENCE_END if char in '.!?' else 0) | (EMPHASIS if char in '!?' else 0))
+
+
+# Class bits of every Latin-1 character, as a bytes.translate table and an array
+FLAG_TABLE = bytes(_char_flags(chr(code)) for code in range(LATIN1))
+FLAG_ARRAY = np.frombuffer(FLAG_TABLE, dtype=np.uint8)
+
+
+def _classify(text):
+    """Class bits for every character of `text` as a uint8 array"""
+    try:
+        # Latin-1 text (the common case) is classified entirely in C
+        return np.frombuffer(text.encode('latin-1').translate(FLAG_TABLE), dtype=np.uint8)
+    except UnicodeEncodeError:
+        pass
+
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    wide = codes >= LATIN1
+    flags = FLAG_ARRAY[np.where(wide, 0, codes)]
+    wide_codes = codes[wide]
+    distinct, inverse = np.unique(wide_codes, return_inverse=True)
+    flags[wide] = np.array([_char_flags(chr(code)) for code in distinct], dtype=np.uint8)[inverse]
+    return flags
+
+
+def _run_starts(mask):
+    """Mask of positions that start a run of True values"""
+    starts = mask.copy()
+    starts[1:] &= ~mask[:-1]
+    return starts
+
+
+def extract_features_batch(contents, reputation=domain_reputation):
+    """Structural features for several texts in one vectorized pass.
+
+    The texts are joined into one buffer and every character is mapped to
+    its class bits (caps, whitespace, sentence and emphasis punctuation);
+    run starts over those masks are summed per text with reduceat. Only
+    the substring searches run per text, with each URL host checked
+    against the domain `reputation` index.
+    """
+    contents = list(contents)
+    if not contents:
+        return []
+
+    flags = _classify(SEPARATOR.join(contents))
+
+    lengths = [len(content) for content in contents]
+    offsets = np.cumsum([0] + [length + 1 for length in lengths[:-1]])
+    # reduceat needs in-range offsets; empty texts are handled below
+    offsets = np.minimum(offsets, max(len(flags) - 1, 0))
+
+    def per_text(mask):
+        if not len(mask):
+            return [0] * len(contents)
+        return np.add.reduceat(mask, offsets, dtype=np.int64).tolist()
+
+    emphasis = (flags & EMPHASIS) != 0
+    # Runs of '!'/'?' of length two or more, i.e. the matches of [!?]{2,}
+    emphasis_runs = _run_starts(emphasis)
+    emphasis_runs[:-1] &= emphasis[1:]
+    emphasis_runs[-1:] = False
+
+    caps = per_text((flags & UPPER) != 0)
+    words = per_text(_run_starts((flags & SPACE) == 0))
+    sentences = per_text(_run_starts((flags & SENTENCE_END) != 0))
+    punctuation_runs = per_text(emphasis_runs)
+
+    features = []
+    for index, content in enumerate(contents):
+        length = lengths[index]
+        if not length:
+            features.append(_features(0, 0, 0, 0, 0, 0, False))
+            continue
+
+        content_lower = content.lower()
+        emotional_words = sum(content_lower.count(word) for word in EMOTIONAL_WORDS)
+        suspicious_url = '://' in content and any(
+            reputation.is_flagged(normalize_host(authority))
+            for authority in URL_AUTHORITY_PATTERN.findall(content)
+        )
+        features.append(_features(length, caps[index], punctuation_runs[index],
+                                  sentences[index], words[index], emotional_words, suspicious_url))
+
+    return features
+
+
+def extract_features(content, reputation=domain_reputation):
+    """Structural features of a single text"""
+    return extract_features_batch([content], reputation)[0]
+
+
+def _features(length, caps, punctuation_runs, sentences, words, emotional_words, suspicious_url):
+    return {
+        'length': length,
+        'caps_count': caps,
+        'caps_ratio': caps / length if length else 0.0,
+        'punctuation_runs': punctuation_runs,
+        'sentence_count': sentences,
+        'word_count': words,
+        'emotional_words': emotional_words,
+        'suspicious_url': suspicious_url
+    }
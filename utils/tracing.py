@@ -0,0 +1,169 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    from opentelemetry import trace as otel_trace
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+
+class Span:
+    """One timed stage of a trace"""
+
+    __slots__ = ('span_id', 'parent_id', 'name', 'start_ns', 'end_ns', 'status', 'attributes')
+
+    def __init__(self, span_id, parent_id, name, attributes):
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = 'OK'
+        self.attributes = attributes
+
+    @property
+    def duration_ms(self):
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+class Trace:
+    """Nested spans for one pipeline run.
+
+    Spans are opened with `span()` and nest by lexical scope. `to_dict()`
+    gives the summary attached to results; `to_otlp()` gives the
+    OpenTelemetry (OTLP/JSON) shape written by the exporters.
+    """
+
+    def __init__(self, name, exporter=None):
+        self.trace_id = os.urandom(16).hex()
+        self.name = name
+        self.exporter = exporter
+        self.spans = []
+        self._stack = []
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """Time a stage as a child of the innermost open span"""
+        parent_id = self._stack[-1].span_id if self._stack else None
+        span = Span(os.urandom(8).hex(), parent_id, name, attributes)
+        self.spans.append(span)
+        self._stack.append(span)
+
+        otel_context = _otel_span(name, attributes) if OTEL_AVAILABLE else None
+        try:
+            if otel_context is None:
+                yield span
+            else:
+                with otel_context:
+                    yield span
+        except BaseException as e:
+            span.status = 'ERROR'
+            span.attributes['error'] = str(e)
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            self._stack.pop()
+
+    def finish(self):
+        """Hand the completed spans to the exporter"""
+        if self.exporter:
+            try:
+                self.exporter.export(self)
+            except Exception as e:
+                print(f"Trace export failed: {e}")
+
+    def to_dict(self):
+        """Compact summary with per-span offsets and durations in milliseconds"""
+        if not self.spans:
+            return {'trace_id': self.trace_id, 'name': self.name, 'duration_ms': 0.0, 'spans': []}
+
+        origin = self.spans[0].start_ns
+        index = {span.span_id: position for position, span in enumerate(self.spans)}
+        return {
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'duration_ms': round(self.spans[0].duration_ms, 3),
+            'spans': [
+                {
+                    'name': span.name,
+                    'parent': index.get(span.parent_id),
+                    'start_ms': round((span.start_ns - origin) / 1e6, 3),
+                    'duration_ms': round(span.duration_ms, 3),
+                    'status': span.status
+                }
+                for span in self.spans
+            ]
+        }
+
+    def to_otlp(self):
+        """Spans in the OTLP/JSON resourceSpans layout"""
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': 'truthlens'}}]},
+                'scopeSpans': [{
+                    'scope': {'name': 'truthlens.tracing'},
+                    'spans': [
+                        {
+                            'traceId': self.trace_id,
+                            'spanId': span.span_id,
+                            'parentSpanId': span.parent_id or '',
+                            'name': span.name,
+                            'startTimeUnixNano': str(span.start_ns),
+                            'endTimeUnixNano': str(span.end_ns or time.time_ns()),
+                            'attributes': [
+                                {'key': key, 'value': {'stringValue': str(value)}}
+                                for key, value in span.attributes.items()
+                            ],
+                            'status': {'code': 'STATUS_CODE_ERROR' if span.status == 'ERROR' else 'STATUS_CODE_OK'}
+                        }
+                        for span in self.spans
+                    ]
+                }]
+            }]
+        }
+
+
+def _otel_span(name, attributes):
+    """Mirror a span into the OpenTelemetry SDK when one is installed"""
+    tracer = otel_trace.get_tracer("truthlens")
+    return tracer.start_as_current_span(
+        name, attributes={key: str(value) for key, value in attributes.items()}
+    )
+
+
+class ConsoleSpanExporter:
+    """Writes each finished trace to stdout as one OTLP/JSON line"""
+
+    def export(self, trace):
+        sys.stdout.write(json.dumps(trace.to_otlp()) + '\n')
+
+
+class FileSpanExporter:
+    """Appends each finished trace to a JSONL file in OTLP/JSON form"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace):
+        line = json.dumps(trace.to_otlp()) + '\n'
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as output:
+                output.write(line)
+
+
+def create_exporter(kind, path=None):
+    """Exporter for a TRACE_EXPORTER setting: 'console', 'file' or 'none'"""
+    if kind == 'console':
+        return ConsoleSpanExporter()
+    if kind == 'file':
+        return FileSpanExporter(path or 'traces.jsonl')
+    return None
@@ -0,0 +1,216 @@
+import re
+import threading
+import time
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9'\-]+")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers him his how i if in into is it its itself just me more most my
+new no nor not now of off on once only or other our out over own same she should so some such
+than that the their them then there these they this those through to too under until up very
+was we were what when where which while who whom why will with would you your
+says said say report reports breaking news update live latest today week year just via one two
+don't can't won't it's they're you're share deleted before
+""".split())
+
+# Hash seeds, one per sketch row
+SKETCH_SEEDS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x85EBCA77C2B2AE63],
+                        dtype=np.uint64)
+MIX_MULTIPLIERS = (np.uint64(0xBF58476D1CE4E5B9), np.uint64(0x94D049BB133111EB))
+
+
+def extract_terms(text):
+    """Topic terms of a text: content words and adjacent content-word pairs"""
+    words = [word.strip("'-") for word in TOKEN_PATTERN.findall(text.lower())]
+    terms = []
+    previous = None
+    for word in words:
+        if len(word) < 3 or word in STOPWORDS:
+            previous = None
+            continue
+        terms.append(word)
+        if previous is not None:
+            terms.append(f"{previous} {word}")
+        previous = word
+    return terms
+
+
+class TrendEngine:
+    """Sliding-window term counts with growth against the previous window.
+
+    Time is split into buckets of `bucket_seconds`; the current window is
+    the last `window_buckets` buckets and the previous window the same
+    span before it. Each bucket holds a count-min sketch (plus a sketch of
+    summed risk scores), so memory is fixed however many distinct terms
+    arrive. Running sums of the current and previous windows are updated
+    as items are added and as buckets age out, so reading trends never
+    rescans past data. Only the `max_candidates` heaviest terms are kept
+    by name for ranking.
+    """
+
+    def __init__(self, window_seconds=86400, window_buckets=24, width=2048, max_candidates=200):
+        self.bucket_seconds = window_seconds / window_buckets
+        self.window_buckets = window_buckets
+        self.width = width
+        self.max_candidates = max_candidates
+
+        depth = len(SKETCH_SEEDS)
+        ring = 2 * window_buckets
+        self._counts = np.zeros((ring, depth, width), dtype=np.int32)
+        self._risk = np.zeros((ring, depth, width), dtype=np.float32)
+        self._current = np.zeros((depth, width), dtype=np.int64)
+        self._previous = np.zeros((depth, width), dtype=np.int64)
+        self._current_risk = np.zeros((depth, width), dtype=np.float64)
+        self._rows = np.arange(depth)
+        self._head = None  # number of the newest bucket
+        self._candidates = {}
+        self._lock = threading.Lock()  # the news engine is fed by the ingestion thread
+
+    def _columns(self, terms):
+        """Sketch column of each term in every row, as a (terms x depth) array.
+
+        The term hash is mixed with a different seed per row (splitmix64
+        finalizer), so the rows hash independently.
+        """
+        hashes = np.array([hash(term) for term in terms], dtype=np.int64).view(np.uint64)
+        mixed = hashes[:, None] ^ SKETCH_SEEDS
+        mixed ^= mixed >> np.uint64(30)
+        mixed *= MIX_MULTIPLIERS[0]
+        mixed ^= mixed >> np.uint64(27)
+        mixed *= MIX_MULTIPLIERS[1]
+        mixed ^= mixed >> np.uint64(31)
+        return (mixed % np.uint64(self.width)).astype(np.int64)
+
+    def _advance(self, head):
+        """Move the newest bucket forward to `head`, ageing older buckets between windows"""
+        if self._head is None or head - self._head >= 2 * self.window_buckets:
+            self._counts[:] = 0
+            self._risk[:] = 0
+            self._current[:] = 0
+            self._previous[:] = 0
+            self._current_risk[:] = 0
+            self._head = head
+            return
+
+        ring = 2 * self.window_buckets
+        for bucket in range(self._head + 1, head + 1):
+            # The bucket reusing this slot leaves the previous window...
+            slot = bucket % ring
+            self._previous -= self._counts[slot]
+            self._counts[slot] = 0
+            self._risk[slot] = 0
+            # ...and the oldest current bucket moves into the previous window
+            aged = (bucket - self.window_buckets) % ring
+            self._current -= self._counts[aged]
+            self._current_risk -= self._risk[aged]
+            self._previous += self._counts[aged]
+        self._head = head
+
+    def add(self, text, timestamp=None, risk=None):
+        """Count the terms of one text seen at `timestamp` (epoch seconds, default now)"""
+        terms = extract_terms(text)
+        if not terms:
+            return
+
+        bucket = int((timestamp if timestamp is not None else time.time()) // self.bucket_seconds)
+        columns = self._columns(terms)
+        rows = np.broadcast_to(self._rows, columns.shape)
+
+        with self._lock:
+            if self._head is None or bucket > self._head:
+                self._advance(bucket)
+            if bucket <= self._head - 2 * self.window_buckets:
+                return  # older than both windows
+
+            slot = bucket % (2 * self.window_buckets)
+            in_current = bucket > self._head - self.window_buckets
+            np.add.at(self._counts[slot], (rows, columns), 1)
+            np.add.at(self._current if in_current else self._previous, (rows, columns), 1)
+            if risk is not None:
+                np.add.at(self._risk[slot], (rows, columns), risk)
+                if in_current:
+                    np.add.at(self._current_risk, (rows, columns), risk)
+
+            for term in terms:
+                self._candidates[term] = None
+            if len(self._candidates) > 2 * self.max_candidates:
+                self._prune_candidates()
+
+    def _estimate(self, sketch, columns):
+        """Count-min estimate per term: the smallest counter across rows"""
+        return sketch[self._rows, columns].min(axis=1)
+
+    def _prune_candidates(self):
+        terms = list(self._candidates)
+        estimates = self._estimate(self._current, self._columns(terms))
+        keep = np.argsort(estimates)[::-1][:self.max_candidates]
+        self._candidates = {terms[index]: None for index in keep}
+
+    def top(self, limit=10, min_count=2, now=None):
+        """Top terms of the current window with counts, growth (percent, None if new) and mean risk"""
+        bucket = int((now if now is not None else time.time()) // self.bucket_seconds)
+        with self._lock:
+            if self._head is not None and bucket > self._head:
+                self._advance(bucket)
+            if not self._candidates:
+                return []
+
+            terms = list(self._candidates)
+            columns = self._columns(terms)
+            current = self._estimate(self._current, columns)
+            previous = self._estimate(self._previous, columns)
+            risk = self._estimate(self._current_risk, columns)
+        counts = dict(zip(terms, current.tolist()))
+
+        # A phrase that accounts for at least half of its words' mentions replaces them
+        suppressed = set()
+        for term, count in counts.items():
+            if ' ' in term and count >= min_count:
+                words = term.split(' ')
+                if count * 2 >= max(counts.get(word, 0) for word in words):
+                    suppressed.update(words)
+
+        trends = []
+        for index in np.argsort(current, kind='stable')[::-1]:
+            term = terms[index]
+            count = int(current[index])
+            if count < min_count:
+                break
+            if term in suppressed:
+                continue
+            earlier = int(previous[index])
+            trends.append({
+                'term': term,
+                'count': count,
+                'previous': earlier,
+                # None for a term absent from the previous window, where a percentage means nothing
+                'growth': (count - earlier) / earlier * 100 if earlier else None,
+                'mean_risk': float(risk[index]) / count
+            })
+            if len(trends) == limit:
+                break
+        return trends
+
+    def memory_bytes(self):
+        return (self._counts.nbytes + self._risk.nbytes + self._current.nbytes + self._previous.nbytes
+                + self._current_risk.nbytes)
+
+
+def risk_level(score):
+    return 'HIGH' if score > 70 else 'MEDIUM' if score > 40 else 'LOW'
+
+
+def as_topics(trends, with_risk=False):
+    """Trends in the page shape: Title Case topic, count and signed growth or "new" (plus risk level)"""
+    topics = []
+    for trend in trends:
+        growth = "new" if trend['growth'] is None else f"{trend['growth']:+.0f}%"
+        topic = {'topic': trend['term'].title(), 'count': trend['count'], 'growth': growth}
+        if with_risk:
+            topic['risk'] = risk_level(trend['mean_risk'])
+        topics.append(topic)
+    return topics
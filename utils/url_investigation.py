@@ -0,0 +1,438 @@
+import hashlib
+import ipaddress
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+
+from config import Config
+from utils.metrics import registry as metrics
+from utils.reputation import host_of
+from utils.tracing import Trace
+
+FETCHABLE_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+# Elements that never hold article text
+BOILERPLATE_TAGS = ['script', 'style', 'noscript', 'template', 'svg', 'nav', 'header', 'footer', 'aside', 'form']
+TEXT_BLOCK_TAGS = ['h1', 'h2', 'h3', 'p', 'li', 'blockquote']
+MIN_BLOCK_LENGTH = 25
+
+# Text handed to the forensic pipeline is capped like user input
+MAX_ANALYSIS_CHARS = 10000
+
+
+class FetchError(Exception):
+    """A page could not be fetched within the fetch limits"""
+
+
+class CachedPage:
+    """A fetched page plus the analyses already run on its current content"""
+
+    __slots__ = ('url', 'final_url', 'etag', 'last_modified', 'title', 'text', 'truncated',
+                 'content_hash', 'fetched_at', 'analyses', 'cross_references')
+
+    def __init__(self, url, final_url, etag, last_modified, title, text, truncated):
+        self.url = url
+        self.final_url = final_url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.title = title
+        self.text = text
+        self.truncated = truncated
+        self.content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+        self.fetched_at = time.time()
+        self.analyses = {}
+        self.cross_references = None
+
+    def to_dict(self):
+        page = {name: getattr(self, name) for name in self.__slots__}
+        # Analyses are keyed by (language, level, safety) tuples, which JSON cannot use as keys
+        page['analyses'] = [[list(key), analysis] for key, analysis in self.analyses.items()]
+        return page
+
+    @classmethod
+    def from_dict(cls, data):
+        page = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(page, name, data[name])
+        page.analyses = {tuple(key): analysis for key, analysis in data['analyses']}
+        return page
+
+
+class PageCache:
+    """LRU cache of fetched pages keyed by URL, shared across sessions"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            page = self._pages.get(url)
+            if page is not None:
+                self._pages.move_to_end(url)
+            return page
+
+    def put(self, page):
+        with self._lock:
+            self._pages[page.url] = page
+            self._pages.move_to_end(page.url)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+
+    def __len__(self):
+        return len(self._pages)
+
+
+class SQLitePageCache:
+    """PageCache in a SQLite file, shared by every app instance and job worker.
+
+    Pages are stored as JSON and evicted least recently used first, keeping
+    `max_entries`. A page read from the cache is a copy, so changes to it
+    are only shared once it is put back.
+    """
+
+    def __init__(self, path, max_entries=256):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, page TEXT NOT NULL, used_at REAL NOT NULL)"
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, url):
+        connection = self._connection()
+        row = connection.execute("SELECT page FROM pages WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        connection.execute("UPDATE pages SET used_at = ? WHERE url = ?", (time.time(), url))
+        return CachedPage.from_dict(json.loads(row[0]))
+
+    def put(self, page):
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO pages (url, page, used_at) VALUES (?, ?, ?)",
+            (page.url, json.dumps(page.to_dict(), default=str), time.time())
+        )
+        connection.execute(
+            "DELETE FROM pages WHERE url NOT IN (SELECT url FROM pages ORDER BY used_at DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+
+def create_page_cache():
+    """Page cache of this process, or the one shared through a file when URL_CACHE_BACKEND is "sqlite\""""
+    if Config.URL_CACHE_BACKEND == 'sqlite':
+        return SQLitePageCache(Config.URL_CACHE_DB_PATH, Config.URL_CACHE_SIZE)
+    return PageCache(Config.URL_CACHE_SIZE)
+
+
+def extract_article(html):
+    """(title, main text) of an HTML page, skipping navigation and other boilerplate"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    title = ''
+    og_title = soup.find('meta', attrs={'property': 'og:title'})
+    if og_title and og_title.get('content'):
+        title = og_title['content'].strip()
+    elif soup.title and soup.title.string:
+        title = soup.title.string.strip()
+
+    for element in soup(BOILERPLATE_TAGS):
+        element.decompose()
+
+    main = soup.find('article') or soup.find('main') or soup.body or soup
+    blocks = [block.get_text(' ', strip=True) for block in main.find_all(TEXT_BLOCK_TAGS)]
+    text = '\n'.join(block for block in blocks if len(block) >= MIN_BLOCK_LENGTH)
+    if not text:
+        text = main.get_text(' ', strip=True)
+
+    return title, text
+
+
+def check_public_host(host):
+    """Raise FetchError unless every address of `host` is a public one"""
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except socket.gaierror as e:
+        raise FetchError(f"Could not resolve {host}: {e}")
+
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%')[0])
+        if not ip.is_global:
+            raise FetchError(f"{host} resolves to a non-public address ({address})")
+
+
+class PageFetcher:
+    """Fetches pages with size, time and redirect limits, revalidating cached copies by ETag.
+
+    A cached page younger than `ttl` seconds is served without a request;
+    an older one is revalidated with If-None-Match / If-Modified-Since, so
+    an unchanged page costs one 304 response.
+    """
+
+    def __init__(self, cache=None, timeout=10.0, max_bytes=2_000_000, ttl=600.0, allow_private=False):
+        self.cache = cache if cache is not None else PageCache()
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.allow_private = allow_private
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = f"{Config.APP_NAME}/{Config.VERSION} (URL investigation)"
+
+    def fetch(self, url):
+        """(CachedPage, cache_state) where cache_state is 'fresh', 'revalidated' or None"""
+        cached = self.cache.get(url)
+        if cached is not None and time.time() - cached.fetched_at < self.ttl:
+            metrics.record_cache('web', 'page', True)
+            return cached, 'fresh'
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+
+        deadline = time.monotonic() + self.timeout
+        with metrics.track('web', 'fetch') as call:
+            response, final_url = self._request(url, headers, deadline)
+            call.status = response.status_code
+            try:
+                if response.status_code == 304 and cached is not None:
+                    cached.fetched_at = time.time()
+                    self.cache.put(cached)
+                    metrics.record_cache('web', 'page', True)
+                    return cached, 'revalidated'
+
+                if response.status_code != 200:
+                    raise FetchError(f"Page returned HTTP {response.status_code}")
+
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                if content_type and content_type not in FETCHABLE_TYPES:
+                    raise FetchError(f"Unsupported content type: {content_type}")
+
+                body, truncated = self._read_body(response, deadline)
+            finally:
+                response.close()
+
+        if content_type == 'text/plain':
+            title, text = '', body.decode(response.encoding or 'utf-8', errors='replace')
+        else:
+            title, text = extract_article(body)
+
+        page = CachedPage(url, final_url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                          title, text, truncated)
+        # Analyses and cross-references of the previous copy still apply when the content did not change
+        if cached is not None and cached.content_hash == page.content_hash:
+            page.analyses = cached.analyses
+            page.cross_references = cached.cross_references
+        self.cache.put(page)
+        metrics.record_cache('web', 'page', False)
+        return page, None
+
+    def _request(self, url, headers, deadline):
+        """GET following redirects by hand, so every hop is checked; returns (response, final_url)"""
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            if parts.scheme not in ('http', 'https') or not parts.hostname:
+                raise FetchError(f"Not an http(s) URL: {url}")
+            if not self.allow_private:
+                check_public_host(parts.hostname)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise FetchError("Timed out fetching the page")
+
+            response = self.session.get(url, headers=headers, stream=True, allow_redirects=False,
+                                        timeout=(min(remaining, 5.0), remaining))
+            if response.status_code not in REDIRECT_STATUSES or 'Location' not in response.headers:
+                return response, url
+
+            response.close()
+            url = urljoin(url, response.headers['Location'])
+
+        raise FetchError(f"More than {MAX_REDIRECTS} redirects")
+
+    def _read_body(self, response, deadline):
+        """Up to max_bytes of the body within the deadline; returns (bytes, truncated)"""
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=65536):
+            if time.monotonic() > deadline:
+                raise FetchError("Timed out reading the page")
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                return b''.join(chunks)[:self.max_bytes], True
+        return b''.join(chunks), False
+
+
+def cross_reference_queries(title, text):
+    """Search queries for coverage of the same story elsewhere"""
+    queries = []
+    if title:
+        # Drop a " - Site Name" / " | Site Name" suffix
+        for separator in (' | ', ' - ', ' — '):
+            if separator in title:
+                title = title.rsplit(separator, 1)[0]
+        queries.append(title[:200])
+
+    first_sentence = text.split('.', 1)[0].strip()
+    if 20 <= len(first_sentence) <= 200 and first_sentence not in queries:
+        queries.append(first_sentence)
+
+    return queries
+
+
+class URLInvestigator:
+    """URL investigation: fetch the page, run the forensic pipeline on its text and cross-reference it.
+
+    Cross-reference searches run on a bounded thread pool while the page
+    text is being analyzed. Analyses and cross-references are cached on
+    the page, so an unchanged page investigated again is neither
+    re-analyzed nor re-searched. Cross-references are only cached once
+    every search has answered, and analyses only when no service was
+    degraded.
+    """
+
+    def __init__(self, news_aggregator, forensic_analyzer, fetcher=None, max_workers=4, trace_exporter=None):
+        self.news_aggregator = news_aggregator
+        self.forensic_analyzer = forensic_analyzer
+        self.fetcher = fetcher or PageFetcher()
+        self.trace_exporter = trace_exporter
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='url-investigation')
+
+    def investigate(self, url, language="en", level="Quick Scan", safety=True, on_progress=None):
+        """Investigation result for a URL; carries an 'error' key if the page could not be used.
+
+        `on_progress(stage, fraction)` is called as each stage starts.
+        """
+        trace = Trace('url_investigation', self.trace_exporter)
+        report = on_progress or (lambda stage, fraction: None)
+
+        try:
+            with trace.span('url_investigation', url=url, level=level) as root:
+                report('Checking source reputation', 0.0)
+                with trace.span('source_reputation'):
+                    result = self.news_aggregator.verify_article(url)
+                if 'error' in result:
+                    root.status = 'ERROR'
+                    root.set_attribute('error', result['error'])
+                    return result
+
+                report('Fetching page', 0.1)
+                try:
+                    with trace.span('fetch_page') as span:
+                        page, cache_state = self.fetcher.fetch(url)
+                        span.set_attribute('cache', cache_state or 'miss')
+                except (FetchError, requests.RequestException) as e:
+                    result['error'] = f"Could not fetch the page: {e}"
+                    root.status = 'ERROR'
+                    root.set_attribute('error', result['error'])
+                    return result
+
+                if not page.text.strip():
+                    result['error'] = "No readable text found on the page"
+                    root.status = 'ERROR'
+                    root.set_attribute('error', result['error'])
+                    return result
+
+                text = page.text[:MAX_ANALYSIS_CHARS]
+                searches = []
+                if page.cross_references is None:
+                    searches = [
+                        self._pool.submit(self.news_aggregator.search_news, query, language, strict=True)
+                        for query in cross_reference_queries(page.title, text)
+                    ]
+
+                analysis_key = (language, level, safety)
+                analysis = page.analyses.get(analysis_key)
+                with trace.span('forensic_analysis', cached=analysis is not None):
+                    if analysis is None:
+                        # The text analysis takes 0.2-0.9 of the investigation's progress
+                        analysis = self.forensic_analyzer.analyze(
+                            text, language, level, True, level == "Deep Analysis", safety,
+                            on_progress=lambda stage, fraction: report(stage, 0.2 + 0.7 * fraction)
+                        )
+                        # A local-only analysis (Gemini or Fact Check unavailable) is redone once they recover
+                        if not analysis.get('degraded_services'):
+                            page.analyses[analysis_key] = analysis
+                            self.fetcher.cache.put(page)
+
+                report('Cross-referencing coverage', 0.9)
+                with trace.span('cross_references', searches=len(searches)) as span:
+                    articles = page.cross_references
+                    if articles is None:
+                        done, _ = wait(searches, timeout=self.fetcher.timeout)
+                        answered = [future for future in done if future.exception() is None]
+                        articles = self._merge_articles(
+                            [future.result() for future in answered], exclude_host=host_of(page.final_url)
+                        )
+                        if len(answered) == len(searches):
+                            page.cross_references = articles
+                            self.fetcher.cache.put(page)
+                        else:
+                            # Coverage from failed or timed-out searches is not cached, so the next run searches again
+                            span.set_attribute('failed_searches', len(searches) - len(answered))
+
+            result.update({
+                'final_url': page.final_url,
+                'title': page.title,
+                'text': text,
+                'truncated': page.truncated or len(page.text) > MAX_ANALYSIS_CHARS,
+                'cache': cache_state,
+                'analysis': analysis,
+                'cross_references': len(articles),
+                'cross_reference_articles': articles,
+                'investigation_trace': trace.to_dict()
+            })
+            result['credibility_score'] = self._combined_credibility(result['credibility_score'], analysis, len(articles))
+            return result
+        finally:
+            # Failed investigations are exported too, once the root span has closed
+            trace.finish()
+
+    def _merge_articles(self, result_lists, exclude_host):
+        """Search results deduplicated by URL, excluding the investigated site itself"""
+        seen = set()
+        articles = []
+        for found in result_lists:
+            for article in found:
+                article_url = article.get('url')
+                if not article_url or article_url in seen or host_of(article_url) == exclude_host:
+                    continue
+                seen.add(article_url)
+                articles.append(article)
+        return articles
+
+    def _combined_credibility(self, source_score, analysis, cross_references):
+        """Source reputation and content credibility weighted 40/60, plus up to 10 for independent coverage"""
+        content_score = analysis.get('credibility_score', 50)
+        return min(100, round(0.4 * source_score + 0.6 * content_score) + min(10, 2 * cross_references))